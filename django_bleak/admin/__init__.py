@@ -1,10 +1,21 @@
 
-from .scanner import (BleScanDeviceAdmin, BleScanEventAdmin,
-                      BleScanFilterAdmin, BleScanResultAdmin)
+from .bucket import BleScanBucketAdmin
+from .rollup import BleScanRollupAdmin
+from .scanner import (BleDeviceLatestAdmin, BlePresenceAdmin,
+                      BleScanDecodedAdmin, BleScanDeviceAdmin,
+                      BleScanEventAdmin, BleScanFilterAdmin,
+                      BleScanResultAdmin)
+from .supervisor import BleScanCommandAdmin
 
 __all__ = [
     'BleScanFilterAdmin',
     'BleScanEventAdmin',
     'BleScanDeviceAdmin',
     'BleScanResultAdmin',
+    'BleScanDecodedAdmin',
+    'BlePresenceAdmin',
+    'BleDeviceLatestAdmin',
+    'BleScanRollupAdmin',
+    'BleScanBucketAdmin',
+    'BleScanCommandAdmin',
 ]
@@ -0,0 +1,22 @@
+
+from rangefilter.filters import DateTimeRangeFilterBuilder
+
+from django.contrib import admin
+from django_bleak import models
+
+
+@admin.register(models.BleScanBucket)
+class BleScanBucketAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'device_id', 'count', 'first_id')
+    list_display_links = ('bucket', )
+    list_filter = (('bucket', DateTimeRangeFilterBuilder()), )
+    # packed data is not shown.
+    exclude = ('data', )
+    list_per_page = 100
+    list_max_show_all = 1000
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
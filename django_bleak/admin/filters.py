@@ -0,0 +1,78 @@
+
+import uuid
+
+from netaddr import AddrFormatError
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from django_bleak.models.scanner import format_mac_addr
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Filter by a typed value.
+
+    Unlike the default filters of a field, choices are not loaded
+    by SELECT DISTINCT, which scans all rows of a large table.
+    """
+
+    template = 'admin/django_bleak/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        # one dummy choice to be shown.
+        return ((),)
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['selected'] = not self.value()
+        # keep other filters on submit.
+        all_choice['query_parts'] = [
+            (k, v) for k, v in changelist.get_filters_params().items() if k != self.parameter_name and v]
+        yield all_choice
+
+    def to_python(self, value: str):
+        return value
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        try:
+            value = self.to_python(value.strip())
+        except (ValueError, ValidationError) as e:
+            raise IncorrectLookupParameters(e) from e
+        return queryset.filter(**{self.parameter_name: value})
+
+
+class DeviceFilter(InputFilter):
+    title = _('mac address')
+    parameter_name = 'device'
+
+    def to_python(self, value: str):
+        try:
+            return format_mac_addr(value)
+        except (AddrFormatError, TypeError) as e:
+            raise ValueError(f'invalid mac address: {value}') from e
+
+
+class EventFilter(InputFilter):
+    title = _('scan event')
+    parameter_name = 'event'
+
+
+class CompanyCodeFilter(InputFilter):
+    title = _('company code')
+    parameter_name = 'company_code'
+
+    def to_python(self, value: str):
+        # decimal or hex, ex. 76 or 0x004c
+        return int(value, 0)
+
+
+class ServiceUuidFilter(InputFilter):
+    title = _('service uuid')
+    parameter_name = 'service_uuid'
+
+    def to_python(self, value: str):
+        return uuid.UUID(value)
@@ -0,0 +1,129 @@
+
+import datetime
+import typing as typ
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# older results than the cursor, ex. ?cursor=2023-01-01T00:00:00+00:00,123
+CURSOR_VAR = 'cursor'
+
+
+def estimate_count(connection: BaseDatabaseWrapper, table: str) -> typ.Optional[int]:
+    """get row count of table from statistics of the database without scanning it
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        table (str): table name
+
+    Returns:
+        typ.Optional[int]: estimated row count. None if the database has no statistics.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # sum of partitions if partitioned. reltuples is -1 if never analyzed.
+            cursor.execute('SELECT SUM(GREATEST(c.reltuples, 0)) FROM pg_class c '
+                           'WHERE c.oid = to_regclass(%s) OR c.oid IN '
+                           '(SELECT i.inhrelid FROM pg_inherits i WHERE i.inhparent = to_regclass(%s))',
+                           [table, table])
+        elif connection.vendor == 'mysql':
+            cursor.execute('SELECT table_rows FROM information_schema.tables '
+                           'WHERE table_schema = DATABASE() AND table_name = %s', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or not row[0]:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting a large table cheaply.
+
+    An unfiltered queryset is counted by statistics of the database
+    if it has more than ESTIMATE_THRESHOLD rows, and a filtered queryset
+    is counted up to MAX_COUNT rows, instead of COUNT(*) of all rows.
+    """
+
+    ESTIMATE_THRESHOLD = 100000
+    MAX_COUNT = 100000
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # count is from statistics
+        self.estimated = False
+        # count is MAX_COUNT, but more rows exist
+        self.capped = False
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimated = estimate_count(connections[queryset.db], queryset.model._meta.db_table)
+            if estimated is not None and estimated > self.ESTIMATE_THRESHOLD:
+                self.estimated = True
+                return estimated
+        count = queryset[:self.MAX_COUNT + 1].count()
+        if count > self.MAX_COUNT:
+            self.capped = True
+            return self.MAX_COUNT
+        return count
+
+
+class KeysetChangeList(ChangeList):
+    """ChangeList paged by a cursor of (received_at, id) instead of OFFSET.
+
+    Results are always ordered by newest, and the next page is the results
+    older than the last one, so any page is read by the index without
+    skipping the rows of previous pages.
+    """
+
+    keyset_ordering = ('-received_at', '-id')
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = self.parse_cursor(request.GET.get(CURSOR_VAR))
+        super().__init__(request, *args, **kwargs)
+
+    @staticmethod
+    def parse_cursor(value: typ.Optional[str]) -> typ.Optional[typ.Tuple[datetime.datetime, int]]:
+        if not value:
+            return None
+        at, _, pk = value.rpartition(',')
+        try:
+            return datetime.datetime.fromisoformat(at), int(pk)
+        except ValueError as e:
+            raise IncorrectLookupParameters(e) from e
+
+    @staticmethod
+    def format_cursor(obj) -> str:
+        return f'{obj.received_at.isoformat()},{obj.id}'
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_ordering(self, request, queryset):
+        # the cursor is valid only in this order.
+        return list(self.keyset_ordering)
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        if self.cursor is not None:
+            at, pk = self.cursor
+            queryset = queryset.filter(Q(received_at__lt=at) | Q(received_at=at, id__lt=pk))
+        return queryset
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.result_list = list(self.result_list)
+        self.next_url = None
+        if self.multi_page and len(self.result_list) == self.list_per_page:
+            self.next_url = self.get_query_string({CURSOR_VAR: self.format_cursor(self.result_list[-1])},
+                                                  [PAGE_VAR])
+        self.first_url = self.get_query_string(remove=[CURSOR_VAR, PAGE_VAR])
@@ -0,0 +1,21 @@
+
+from rangefilter.filters import DateTimeRangeFilterBuilder
+
+from django.contrib import admin
+from django_bleak import models
+
+
+@admin.register(models.BleScanRollup)
+class BleScanRollupAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'period', 'device_id', 'company_code', 'service_uuid',
+                    'count', 'rssi_min', 'rssi_avg', 'rssi_max')
+    list_display_links = ('bucket', )
+    list_filter = (('bucket', DateTimeRangeFilterBuilder()), 'period')
+    list_per_page = 100
+    list_max_show_all = 1000
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
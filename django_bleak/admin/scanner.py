@@ -1,15 +1,16 @@
 # Register your models here.
-import glob
 import logging
-import subprocess
-import time
 
-import psutil
 from rangefilter.filters import DateTimeRangeFilterBuilder
 
 from django.contrib import admin, messages
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from django_bleak import models
+from django_bleak.admin.filters import (CompanyCodeFilter, DeviceFilter,
+                                        EventFilter, ServiceUuidFilter)
+from django_bleak.admin.pagination import (EstimatedCountPaginator,
+                                           KeysetChangeList)
 
 logger = logging.getLogger('ble_scanner')
 
@@ -18,56 +19,54 @@ logger = logging.getLogger('ble_scanner')
 class BleScanFilterAdmin(admin.ModelAdmin):
     list_display = ('id', 'note', 'is_enabled')
     list_editable = ('note', 'is_enabled',)
+    filter_horizontal = ('events',)
     list_per_page = 100
     list_max_show_all = 1000
 
 
 @admin.register(models.BleScanEvent)
 class BleScanEventAdmin(admin.ModelAdmin):
-    list_display = ('name', 'is_enabled', 'scan_mode', 'pid', 'create_time', 'interval')
+    list_display = ('name', 'is_enabled', 'status', 'scan_mode', 'adapter', 'pid', 'create_time', 'interval',
+                    'last_heartbeat', 'processed', 'queue_depth')
     list_per_page = 100
     list_max_show_all = 1000
     actions = ('run_scan_event', 'stop_scan_event')
 
+    def status(self, obj):
+        # processes are probed only for scan events without a fresh heartbeat.
+        return obj.status.value
+    status.short_description = _('status')
+
     def run_scan_event(self, request, queryset):
-        if models.BleScanEvent.objects.filter(is_enabled=True).exists():
-            messages.error(request, _('running event already exists. you need to stop all event.'))
-        elif queryset.count() != 1:
-            messages.error(request, _('please select one scan event.'))
+        names, running = [], []
+        for obj in queryset:
+            # other scan events may be running.
+            (running if obj.is_running else names).append(obj.name)
+        if running:
+            messages.warning(request, _('already running: %(names)s') % {'names': ', '.join(running)})
+        if not names:
+            messages.error(request, _('please select scan events not running.'))
         else:
-            try:
-                qs = queryset.first()
-                mode = models.BleScanEvent.ModeChoices
-                managepy = glob.glob('**/manage.py', recursive=True)
-                if managepy:
-                    subprocess.Popen([
-                        'python',
-                        managepy[0],
-                        {mode.SEQUENTIAL: 'ble_scanner',
-                            mode.INTERVAL: 'ble_scanner_interval'}[qs.scan_mode],
-                        qs.name
-                    ])
-                    cnt = 0
-                    while not models.BleScanEvent.objects.filter(name=qs.name).first().is_running and cnt < 10:
-                        time.sleep(1)
-                        cnt += 1
-            except BaseException:
-                logger.exception('ble_scanner error')
-                messages.error(request, _('execution failed.'))
+            # ble_supervisor runs them, some scan events in one process.
+            models.BleScanCommand.objects.enqueue(models.BleScanCommand.Action.START, names)
+            messages.info(request, _('requested to run selected scan events.'))
+            self.check_supervisor(request)
     run_scan_event.short_description = _('run selected scan event')
 
     def stop_scan_event(self, request, queryset):
-        for q in queryset:
-            try:
-                q.pid and psutil.Process(q.pid).kill()
-            except psutil.NoSuchProcess:
-                pass
-            queryset.update(is_enabled=False,
-                            pid=None,
-                            create_time=None)
+        names = list(queryset.values_list('name', flat=True))
+        models.BleScanCommand.objects.enqueue(models.BleScanCommand.Action.STOP, names)
+        # scanners stop by themselves in BleScanEvent.interval seconds, even if not supervised.
+        queryset.update(is_enabled=False)
+        models.BleScanVersion.bump(models.BleScanVersion.SCANNER)
+        self.check_supervisor(request)
 
     stop_scan_event.short_description = _('stop selected scan event')
 
+    def check_supervisor(self, request):
+        if models.BleScanCommand.objects.is_stale():
+            messages.warning(request, _('ble_supervisor does not seem to be running.'))
+
 
 @admin.register(models.BleScanDevice)
 class BleScanDeviceAdmin(admin.ModelAdmin):
@@ -82,7 +81,70 @@ class BleScanDeviceAdmin(admin.ModelAdmin):
 class BleScanResultAdmin(admin.ModelAdmin):
     list_display = ('received_at', 'device', 'tx_power', 'rssi', 'company_code', 'service_uuid')
     list_display_links = ('received_at', )
-    list_filter = (('received_at', DateTimeRangeFilterBuilder()), 'device', 'company_code', 'service_uuid')
+    list_filter = (('received_at', DateTimeRangeFilterBuilder()), DeviceFilter, CompanyCodeFilter, ServiceUuidFilter)
+    list_select_related = ('device', )
+    list_per_page = 100
+    list_max_show_all = 1000
+    # the table can be very large. see KeysetChangeList.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    sortable_by = ()
+    ordering = KeysetChangeList.keyset_ordering
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, models.BleScanResult.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        # BleScanDecoded has no foreign key constraint, so it is not deleted by cascade.
+        with transaction.atomic():
+            models.BleScanDecoded.objects.delete_results(queryset)
+            queryset.delete()
+
+
+@admin.register(models.BleScanDecoded)
+class BleScanDecodedAdmin(admin.ModelAdmin):
+    list_display = ('result_id', 'format', 'name', 'value', 'text')
+    list_display_links = ('result_id', )
+    list_filter = ('format', 'name')
+    list_per_page = 100
+    list_max_show_all = 1000
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.BlePresence)
+class BlePresenceAdmin(admin.ModelAdmin):
+    list_display = ('entered_at', 'left_at', 'device', 'event', 'rssi', 'count')
+    list_display_links = ('entered_at', )
+    list_filter = (('entered_at', DateTimeRangeFilterBuilder()), EventFilter, DeviceFilter)
+    list_per_page = 100
+    list_max_show_all = 1000
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(models.BleDeviceLatest)
+class BleDeviceLatestAdmin(admin.ModelAdmin):
+    list_display = ('device', 'received_at', 'local_name', 'company_code', 'service_uuid', 'tx_power', 'rssi')
+    list_display_links = ('device', )
+    list_filter = (('received_at', DateTimeRangeFilterBuilder()), )
     list_per_page = 100
     list_max_show_all = 1000
 
@@ -0,0 +1,18 @@
+
+from django.contrib import admin
+from django_bleak import models
+
+
+@admin.register(models.BleScanCommand)
+class BleScanCommandAdmin(admin.ModelAdmin):
+    list_display = ('id', 'action', 'events', 'created_at', 'processed_at', 'error')
+    list_display_links = ('id', )
+    list_filter = ('action', )
+    list_per_page = 100
+    list_max_show_all = 1000
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
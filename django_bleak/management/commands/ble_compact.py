@@ -0,0 +1,28 @@
+
+import datetime
+import logging
+
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+from django.utils import timezone
+from django_bleak.models import BleScanBucket
+from django_bleak.models.bucket import BucketQueryset
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Command(BaseCommand):
+    help = 'pack BleScanResult older than days into BleScanBucket per device and minute.'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('--days', help='results older than this days are compacted.', type=float, required=True)
+        parser.add_argument('--chunk-size', help='max ids compacted at once.',
+                            type=int, default=BucketQueryset.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--max-chunks', help='max chunks compacted. default is unlimited.',
+                            type=int, default=None)
+
+    def handle(self, days: float, chunk_size: int, max_chunks: int, *args, **options):
+        before = timezone.now() - datetime.timedelta(days=days)
+        compacted = BleScanBucket.objects.compact(before, chunk_size, max_chunks)
+        logger.info(f'compacted {compacted} results received before {before}.')
+        self.stdout.write(f'compacted {compacted} results received before {before}.')
@@ -0,0 +1,78 @@
+
+import logging
+import os
+import sys
+
+from django.core.management import BaseCommand, CommandError
+from django.core.management.base import CommandParser
+from django.utils.dateparse import parse_datetime
+from django_bleak.models import BleScanResult
+from django_bleak.models.scanner import ResultQueryset
+from django_bleak.utils.export import FIELDS, WRITERS
+
+logger = logging.getLogger('ble_scanner')
+
+
+def datetime_type(value: str):
+    dt = parse_datetime(value)
+    if dt is None or dt.tzinfo is None:
+        raise ValueError(f'{value} is not aware iso format datetime.')
+    return dt
+
+
+class Command(BaseCommand):
+    help = 'export BleScanResult to csv, json lines or parquet with constant memory.'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('output', help='output file. "-" is stdout except parquet.', type=str)
+        parser.add_argument('--format', help='output format.', choices=list(WRITERS), default='csv')
+        parser.add_argument('--start', help='received at or after, ex. 2023-01-01T00:00:00+09:00',
+                            type=datetime_type, default=None)
+        parser.add_argument('--end', help='received before, ex. 2023-02-01T00:00:00+09:00',
+                            type=datetime_type, default=None)
+        parser.add_argument('--device', help='mac address. can be repeated.', action='append', default=None)
+        parser.add_argument('--after-id', help='resume after this id. csv and jsonl are appended, and parquet needs a new file.',
+                            type=int, default=0)
+        parser.add_argument('--chunk-size', help='max results fetched at once.',
+                            type=int, default=ResultQueryset.DEFAULT_CHUNK_SIZE)
+
+    def handle(self, output, format, start, end, device, after_id, chunk_size, *args, **options):
+        binary = format == 'parquet'
+        # only resuming by --after-id appends, not narrowing by --start.
+        append = after_id > 0
+        if binary and append and output != '-' and os.path.exists(output):
+            raise CommandError(f'parquet can not be appended. give a new file instead of {output}.')
+        results = BleScanResult.objects.all()
+        # narrow time range by primary key not to scan received_at, if ids are in received order.
+        if start is not None:
+            after_id = max(after_id, results.start_id(start) - 1)
+            results = results.filter(received_at__gte=start)
+        if end is not None:
+            results = results.filter(id__lt=BleScanResult.objects.cutoff_id(end), received_at__lt=end)
+        if device:
+            results = results.filter(device__in=device)
+
+        if output == '-':
+            if binary:
+                raise CommandError('parquet can not be written to stdout.')
+            fp = sys.stdout
+        else:
+            fp = open(output, ('a' if append else 'w') + ('b' if binary else ''),
+                      **({} if binary else {'encoding': 'utf-8', 'newline': ''}))
+        try:
+            try:
+                writer = WRITERS[format](fp, FIELDS)
+            except ImportError as e:
+                raise CommandError(str(e))
+            count, last_id = 0, after_id
+            for rows in results.stream(after_id, chunk_size, FIELDS):
+                writer.write(rows)
+                count += len(rows)
+                last_id = rows[-1]['id']
+                logger.info(f'exported {count} results. last id is {last_id}.')
+            writer.close()
+        finally:
+            if fp is not sys.stdout:
+                fp.close()
+        # stdout may be the output.
+        self.stderr.write(f'exported {count} results. last id is {last_id}.')
@@ -0,0 +1,63 @@
+
+import datetime
+import logging
+import os
+from itertools import islice
+
+from django.core.management import BaseCommand, CommandError
+from django.core.management.base import CommandParser
+from django_bleak.models import BleScanFilter
+from django_bleak.utils.capture import read_capture
+from django_bleak.utils.decoders import registry
+from django_bleak.utils.rssi import RssiSmoother
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Command(BaseCommand):
+    help = 'import capture files recorded by ble_scanner --record into BleScanResult through filters.'
+
+    DEFAULT_BATCH_SIZE = 5000
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('files', help='capture files. imported in this order.', type=str, nargs='+')
+        parser.add_argument('--event', help='use filters of this scan event. default is all enabled filters.',
+                            type=str, default=None)
+        parser.add_argument('--batch-size', help='max advertising data saved at once.',
+                            type=int, default=self.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--decode', help='save fields of known payload formats to BleScanDecoded.', action='store_true')
+        parser.add_argument('--smooth-rssi', help='save rssi smoothed by EMA with this alpha to rssi_smoothed. 0 is disabled.',
+                            type=float, default=0.0)
+        parser.add_argument('--latest', help='save the last advertising data of each device to BleDeviceLatest '
+                            'unless saved one is newer.', action='store_true')
+
+    def handle(self, *args, **options):
+        files = options['files']
+        batch_size = options['batch_size']
+        for path in files:
+            if not os.path.isfile(path):
+                raise CommandError(f'{path} does not exist.')
+        filters = BleScanFilter.objects.filter(is_enabled=True)
+        if options['event'] is not None:
+            filters = filters.for_event(options['event'])
+        filters = filters.order_by('id')
+        # evaluate and compile filters once for all batches.
+        filters.matcher
+
+        smoother = RssiSmoother(options['smooth_rssi']) if options['smooth_rssi'] else None
+
+        read = saved = 0
+        for path in files:
+            records = read_capture(path)
+            while True:
+                batch = list(islice(records, batch_size))
+                if not batch:
+                    break
+                received_at = [datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+                               for timestamp, _ in batch]
+                saved += len(filters.create_data([data for _, data in batch], received_at=received_at,
+                                                 decoders=registry if options['decode'] else None,
+                                                 smoother=smoother, latest=options['latest']))
+                read += len(batch)
+            logger.info(f'imported {path}. -> read {read} saved {saved}')
+        self.stdout.write(f'imported {saved} results from {read} advertising data.')
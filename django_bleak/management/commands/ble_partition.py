@@ -0,0 +1,52 @@
+
+import logging
+
+from django.core.management import BaseCommand
+from django.core.management.base import CommandError, CommandParser
+from django.db import connections, models, transaction
+from django.utils import timezone
+from django_bleak.models import BleScanResult
+from django_bleak.utils import partition
+from django_bleak.utils.partition import next_month
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Command(BaseCommand):
+    help = 'convert BleScanResult table to monthly partitions of received_at on PostgreSQL.'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('--partitions', help='months of partitions created from this month, as ble_retention --partitions.',
+                            type=int, default=3)
+        parser.add_argument('--dry-run', help='print DDL without executing.', action='store_true')
+
+    def handle(self, *args, **options):
+        results = BleScanResult.objects.all()
+        connection = connections[results.db]
+        if connection.vendor != 'postgresql' and not options['dry_run']:
+            raise CommandError(f'partitioning is supported only on PostgreSQL, not {connection.vendor}.')
+        table = BleScanResult._meta.db_table
+        if partition.is_partitioned(connection, table):
+            raise CommandError(f'{table} is already partitioned.')
+
+        now = timezone.now()
+        bounds = results.aggregate(lo=models.Min('received_at'), hi=models.Max('received_at'))
+        # same months as ble_retention creates.
+        ahead = now
+        for _ in range(options['partitions'] - 1):
+            ahead = next_month(ahead)
+        start = min(bounds['lo'] or now, now)
+        end = max(bounds['hi'] or now, ahead)
+        statements = partition.convert_sql(connection, BleScanResult, start, end)
+        if options['dry_run']:
+            for sql in statements:
+                self.stdout.write(f'{sql};')
+            return
+
+        # the table is locked by renaming it until the transaction ends.
+        with transaction.atomic(using=results.db), connection.cursor() as cursor:
+            for sql in statements:
+                logger.debug(sql)
+                cursor.execute(sql)
+        logger.info(f'{table} is partitioned from {start} to {end}.')
+        self.stdout.write(f'{table} is partitioned from {start} to {end}.')
@@ -0,0 +1,73 @@
+
+import datetime
+import logging
+import typing as typ
+
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+from django.db import connections
+from django.utils import timezone
+from django_bleak.models import BleScanBucket, BleScanDecoded, BleScanResult
+from django_bleak.models.scanner import ResultQueryset, format_mac_addr
+from django_bleak.utils import partition
+from django_bleak.utils.export import FIELDS, JsonLinesWriter
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Command(BaseCommand):
+    help = 'delete or archive BleScanResult older than retention days in chunks.'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('--days', help='retention days.', type=float, required=True)
+        parser.add_argument('--chunk-size', help='max ids deleted at once.',
+                            type=int, default=ResultQueryset.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--archive', help='append deleted results to JSON Lines file.', type=str, default=None)
+        parser.add_argument('--partitions', help='months of partitions created ahead on partitioned PostgreSQL table.',
+                            type=int, default=3)
+
+    def archive(self, writer: JsonLinesWriter):
+        def write(chunk: ResultQueryset):
+            for rows in chunk.stream(fields=FIELDS):
+                writer.write(rows)
+        return write
+
+    def archive_buckets(self, writer: JsonLinesWriter):
+        def write(results: typ.List[BleScanResult]):
+            writer.write([{f: format_mac_addr(r.device_id) if f == 'device_id' else getattr(r, f) for f in FIELDS}
+                          for r in results])
+        return write
+
+    def handle(self, days: float, chunk_size: int, archive: str, partitions: int, *args, **options):
+        now = timezone.now()
+        before = now - datetime.timedelta(days=days)
+        results = BleScanResult.objects.all()
+        connection = connections[results.db]
+        table = BleScanResult._meta.db_table
+        partitioned = partition.is_partitioned(connection, table)
+        if partitioned:
+            created = partition.create_partitions(connection, table, now, partitions)
+            logger.info(f'partitions -> {created}')
+            if archive is None:
+                # no need to delete rows one by one.
+                dropped = partition.drop_partitions(connection, table, before)
+                logger.info(f'dropped partitions -> {dropped}')
+
+        if archive is None:
+            deleted = results.prune(before, chunk_size)
+            deleted += BleScanBucket.objects.prune(before)
+        else:
+            with open(archive, 'a', encoding='utf-8') as fp:
+                writer = JsonLinesWriter(fp)
+                # buckets are older than results.
+                deleted = BleScanBucket.objects.prune(before, archive=self.archive_buckets(writer))
+                deleted += results.prune(before, chunk_size, archive=self.archive(writer))
+        if partitioned and archive is not None:
+            dropped = partition.drop_partitions(connection, table, before)
+            logger.info(f'dropped partitions -> {dropped}')
+        if partitioned:
+            # decoded fields of dropped partitions.
+            orphans = BleScanDecoded.objects.prune_orphans()
+            logger.info(f'deleted {orphans} decoded fields of dropped partitions.')
+        logger.info(f'deleted {deleted} results received before {before}.')
+        self.stdout.write(f'deleted {deleted} results received before {before}.')
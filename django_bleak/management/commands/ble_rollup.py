@@ -0,0 +1,24 @@
+
+import logging
+
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+from django_bleak.models import BleScanRollup
+from django_bleak.models.rollup import RollupQueryset
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Command(BaseCommand):
+    help = 'aggregate BleScanResult saved since last run into BleScanRollup.'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('--chunk-size', help='max results aggregated at once.',
+                            type=int, default=RollupQueryset.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--max-chunks', help='max chunks aggregated. default is unlimited.',
+                            type=int, default=None)
+
+    def handle(self, chunk_size: int, max_chunks: int, *args, **options):
+        processed = BleScanRollup.objects.update_rollups(chunk_size, max_chunks)
+        logger.info(f'rolled up {processed} results.')
+        self.stdout.write(f'rolled up {processed} results.')
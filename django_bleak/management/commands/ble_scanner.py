@@ -1,59 +1,340 @@
 
 import asyncio
+import datetime
 import logging
 import time
+import typing as typ
 
 import bleak as blk
 import psutil
 from asgiref.sync import sync_to_async
 
 from django.core.management import BaseCommand
-from django.core.management.base import CommandParser
-from django_bleak.models import BleScanEvent, BleScanFilter
+from django.core.management.base import CommandError, CommandParser
+from django.db import DatabaseError, close_old_connections
+from django.utils import timezone
+from django_bleak.models import (BlePresence, BleScanEvent, BleScanFilter,
+                                 BleScanResult, BleScanRollup, BleScanVersion)
+from django_bleak.models.scanner import (BleScanData, CustomQueryset,
+                                         device_cache)
+from django_bleak.utils import AdvertisementBuffer, BatchWriter, Deduplicator
+from django_bleak.utils.backend import load_backend
+from django_bleak.utils.capture import CaptureWriter
+from django_bleak.utils.decoders import DecoderRegistry, registry
+from django_bleak.utils.metrics import MetricsSink, load_sink, metrics
+from django_bleak.utils.presence import PresenceTracker
+from django_bleak.utils.rssi import RssiSmoother
 
 logger = logging.getLogger('ble_scanner')
 
+# seconds between probes of the event loop lag
+LAG_PERIOD = 0.1
+LOOP_LAG = metrics.histogram('loop_lag_seconds', 'delay of the event loop.')
+MAINTAIN_SECONDS = metrics.histogram('maintain_seconds', 'seconds of presence, rollup and retention per interval.')
 
-class Command(BaseCommand):
+
+class Session:
+    """scan loop of one scan event
+
+    It scans with the adapter and filters of its scan event, and hands
+    advertising data to the command, which buffers and saves data of all sessions.
+    """
 
     filters = BleScanFilter.objects.filter(is_enabled=True).order_by('id')
+    scanner_class = blk.BleakScanner
+    adapter: str = None
+    dedup: Deduplicator = None
+    version: int = None
+    decoders: DecoderRegistry = None
+    presence: PresenceTracker = None
+    smoother: RssiSmoother = None
+    save_latest: bool = False
+
+    def __init__(self, name: str, command: 'Command'):
+        self.name = name
+        self.command = command
+        # advertising data saved or recorded for this scan event, sent by the heartbeat.
+        self.processed = 0
 
     async def callback(self, dev: blk.BLEDevice, adv: blk.AdvertisementData):
-        ret = await sync_to_async(self.filters.create_data)([(dev, adv)])
-        if len(ret):
+        self.command.receive(self, (dev, adv))
+
+    def write(self, data_list):
+        ret = self.filters.create_data(data_list, dedup=self.dedup, decoders=self.decoders,
+                                       presence=self.presence, smoother=self.smoother, latest=self.save_latest)
+        self.processed += len(data_list)
+        # formatting every result is not free at high rates.
+        if len(ret) and logger.isEnabledFor(logging.DEBUG):
             logger.debug(f'create -> {ret}')
 
+    def report(self):
+        if self.dedup is not None:
+            stored, suppressed = self.dedup.report()
+            logger.info(f'{self.name} dedup stored={stored} suppressed={suppressed}')
+        if self.presence is not None:
+            logger.info(f'{self.name} presence present={len(self.presence)}')
+
+    def open_presence(self, timeout: float):
+        # presences left open by a stopped process are closed.
+        closed = BlePresence.objects.close_open(self.name)
+        if closed:
+            logger.info(f'closed {closed} presences left open.')
+        self.presence = PresenceTracker(timeout, event=self.name)
+
+    def close_presence(self):
+        if self.presence is not None:
+            BlePresence.objects.save_transitions(self.presence.leave_all(), self.presence.event)
+
+    def load_filters(self) -> CustomQueryset:
+        filters = BleScanFilter.objects.filter(is_enabled=True).for_event(self.name).order_by('id')
+        # evaluate and compile filters here, not in create_data.
+        filters.matcher
+        return filters
+
+    async def reload(self, event: BleScanEvent = None) -> BleScanEvent:
+        """reload scan event and filters only if BleScanVersion is changed
+
+        Args:
+            event (BleScanEvent, optional): current scan event. None is force reload.
+
+        Returns:
+            BleScanEvent: scan event
+        """
+        try:
+            version = await sync_to_async(BleScanVersion.get_version)(BleScanVersion.SCANNER)
+        except DatabaseError:
+            if event is None:
+                raise
+            # reloaded on the next interval.
+            logger.exception('database error. keep the current scan event.')
+            await sync_to_async(close_old_connections)()
+            return event
+        if event is not None and version == self.version:
+            return event
+        event = await sync_to_async(BleScanEvent.objects.get)(name=self.name)
+        self.filters = await sync_to_async(self.load_filters)()
+        # cached devices may be deleted.
+        device_cache.clear()
+        self.version = version
+        logger.info(f'reloaded version {version}. -> {len(self.filters.matcher)} filters')
+        return event
+
+    def scanner_kwargs(self) -> dict:
+        return {'adapter': self.adapter} if self.adapter else {}
+
     async def scan_task(self, async_event: asyncio.Event):
-        async with blk.BleakScanner(self.callback):
+        async with self.scanner_class(self.callback, **self.scanner_kwargs()):
             logger.info('scan_task wait until set async event.')
             await async_event.wait()
         logger.info('scan_task finish.')
 
-    async def monitor_task(self, async_event: asyncio.Event, name: str, interval: float):
-        event = await sync_to_async(BleScanEvent.objects.get)(name=name)
+    async def monitor_task(self, async_event: asyncio.Event):
+        event = await self.reload()
         try:
             while event.interval > 0.0:
                 logger.debug(f'{event}')
-                time.sleep(event.interval)
+                try:
+                    # callbacks keep running while waiting.
+                    await asyncio.wait_for(async_event.wait(), event.interval)
+                    logger.info('async event is set.')
+                    break
+                except asyncio.TimeoutError:
+                    pass
+                self.command.report(self)
+                await sync_to_async(self.command.keep_alive)(self)
                 if not event.is_enabled:
                     logger.info('is_enabled switched to false.')
                     break
-                event = await sync_to_async(BleScanEvent.objects.get)(name=name)
-                self.filters = await sync_to_async(BleScanFilter.objects.filter)(is_enabled=True)
+                event = await self.reload(event)
         finally:
             async_event.set()
             logger.info('set async event.')
             logger.info('monitor_task finish.')
 
+    def configure(self, **options):
+        if options.get('dedup_window'):
+            self.dedup = Deduplicator(options['dedup_window'], options.get('dedup_rssi'))
+        if options.get('smooth_rssi'):
+            self.smoother = RssiSmoother(options['smooth_rssi'])
+        if options.get('decode'):
+            self.decoders = registry
+        self.save_latest = options.get('latest', False)
+
+
+class Command(BaseCommand):
+
+    session_class: typ.Type[Session] = Session
+    sessions: typ.List[Session] = []
+    scanner_class = blk.BleakScanner
+    adapter: str = None
+    buffer: AdvertisementBuffer = None
+    retention: datetime.timedelta = None
+    rollup: bool = False
+    recorder: CaptureWriter = None
+    writer: BatchWriter = None
+    metrics_sink: MetricsSink = None
+
+    def receive(self, session: Session, data: BleScanData):
+        # recording mode appends all advertising data to the capture file without filtering.
+        if self.recorder is not None:
+            self.recorder.write(time.time(), data)
+            session.processed += 1
+        else:
+            self.buffer.put((session, data))
+
+    async def flush(self, data_list):
+        # the event loop does not wait for the database with the writer thread.
+        if self.writer is not None:
+            await self.writer.submit(data_list)
+        else:
+            await sync_to_async(self.write)(data_list)
+
+    def write(self, data_list):
+        # one buffer keeps data of all sessions in received order.
+        groups: typ.Dict[Session, list] = {}
+        for session, data in data_list:
+            groups.setdefault(session, []).append(data)
+        for session, group in groups.items():
+            session.write(group)
+
+    def report(self, session: Session):
+        session.report()
+        # the buffer and the writer are shared, and reported with the first session only.
+        if session is not self.sessions[0]:
+            return
+        if self.recorder is not None:
+            self.recorder.flush()
+            logger.info(f'recorded {self.recorder.written} advertising data. -> {self.recorder.path}')
+        if self.writer is not None:
+            r = self.writer.report()
+            logger.info(f'writer depth={r.depth} pending={r.pending} written={r.written} failed={r.failed} '
+                        f'latency={r.latency_mean * 1000:.1f}ms max={r.latency_max * 1000:.1f}ms '
+                        f'write={r.write_mean * 1000:.1f}ms')
+        if self.metrics_sink is not None:
+            self.metrics_sink.report()
+
+    def register_metrics(self):
+        # counters kept by the buffer and the writer are read when collected.
+        buffer = self.buffer
+        metrics.func('adverts_received_total', 'advertising data received.', lambda: buffer.received, 'counter')
+        metrics.func('adverts_dropped_total', 'advertising data dropped by the full buffer.', lambda: buffer.dropped, 'counter')
+        metrics.func('adverts_failed_total', 'advertising data discarded by failed flush.', lambda: buffer.failed, 'counter')
+        metrics.func('buffer_length', 'advertising data buffered.', lambda: len(buffer))
+        writer = self.writer
+        if writer is not None:
+            metrics.func('writer_depth', 'batches waiting for the writer thread.', lambda: writer.depth)
+            metrics.func('writer_pending', 'advertising data waiting for the writer thread.', lambda: writer.pending)
+        metrics.func('presence_present', 'devices present.',
+                     lambda: sum(len(session.presence or ()) for session in self.sessions))
+
+    async def lag_task(self, async_event: asyncio.Event):
+        while not async_event.is_set():
+            started = time.monotonic()
+            await asyncio.sleep(LAG_PERIOD)
+            LOOP_LAG.observe(max(0.0, time.monotonic() - started - LAG_PERIOD))
+
+    def maintain(self, session: Session):
+        started = time.perf_counter()
+        if session.presence is not None:
+            left = BlePresence.objects.save_transitions(session.presence.expire(time.time()), session.name)
+            if left:
+                logger.info(f'{len(left)} devices left.')
+        # rollup and retention are done once per interval by the first session.
+        if session is self.sessions[0]:
+            self.maintain_results()
+        if metrics.enabled:
+            MAINTAIN_SECONDS.observe(time.perf_counter() - started)
+
+    def maintain_results(self):
+        # one chunk per call not to block saving results.
+        if self.rollup:
+            processed = BleScanRollup.objects.update_rollups(max_chunks=1)
+            if processed:
+                logger.info(f'rolled up {processed} results.')
+        if self.retention is not None:
+            deleted = BleScanResult.objects.prune(timezone.now() - self.retention, max_chunks=1)
+            if deleted:
+                logger.info(f'pruned {deleted} results.')
+
+    def heartbeat(self, session: Session):
+        # status of the scan event is derived from the heartbeat age.
+        # processed is counted per session, and the queue is shared by all sessions.
+        queue_depth = len(self.buffer) if self.buffer is not None else 0
+        if self.writer is not None:
+            queue_depth += self.writer.pending
+        BleScanEvent.objects.heartbeat(session.name, session.processed, queue_depth)
+
+    def keep_alive(self, session: Session):
+        """maintain and send the heartbeat every interval
+
+        Database errors, ex. a table locked by the writer thread, are retried on the next interval.
+        A missed heartbeat is shown as STALLED instead of stopping the scanner.
+
+        Args:
+            session (Session): session of the scan event
+        """
+        for task in (lambda: self.maintain(session), lambda: self.heartbeat(session)):
+            try:
+                task()
+            except DatabaseError:
+                logger.exception('database error. retry on the next interval.')
+                close_old_connections()
+
+    def create_session(self, name: str, adapter: str = None, session_class: typ.Type[Session] = None,
+                       **options) -> Session:
+        session = (session_class or self.session_class)(name, self)
+        session.scanner_class = self.scanner_class
+        session.adapter = adapter
+        session.configure(**options)
+        return session
+
     def add_arguments(self, parser: CommandParser):
         parser.add_argument('event', help='scan event name.', type=str)
+        self.add_scan_arguments(parser)
+
+    def add_scan_arguments(self, parser: CommandParser):
         parser.add_argument('--debug', help='debug flag.', action='store_true')
+        parser.add_argument('--batch-size', help='max advertising data saved at once.',
+                            type=int, default=AdvertisementBuffer.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--batch-wait', help='max seconds advertising data is buffered.',
+                            type=float, default=AdvertisementBuffer.DEFAULT_BATCH_WAIT)
+        parser.add_argument('--buffer-size', help='max advertising data buffered.',
+                            type=int, default=AdvertisementBuffer.DEFAULT_CAPACITY)
+        parser.add_argument('--drop-policy', help='dropped data when buffer is full.',
+                            choices=[p.value for p in AdvertisementBuffer.DropPolicy],
+                            default=AdvertisementBuffer.DropPolicy.OLDEST.value)
+        parser.add_argument('--writer', help='thread saves results in a dedicated thread, executor in the asgiref executor.',
+                            choices=['thread', 'executor'], default='thread')
+        parser.add_argument('--writer-max-pending', help='max batches handed to the writer thread and not saved yet.',
+                            type=int, default=BatchWriter.DEFAULT_MAX_PENDING)
+        parser.add_argument('--dedup-window', help='seconds repeated advertising data is suppressed. 0 is disabled.',
+                            type=float, default=0.0)
+        parser.add_argument('--dedup-rssi', help='rssi change[dBm] saved even if advertising data is repeated.',
+                            type=float, default=None)
+        parser.add_argument('--retention-days', help='delete results older than this days while scanning.',
+                            type=float, default=None)
+        parser.add_argument('--rollup', help='update BleScanRollup while scanning.', action='store_true')
+        parser.add_argument('--presence-timeout', help='seconds a device is present after last seen. 0 is disabled.',
+                            type=float, default=0.0)
+        parser.add_argument('--smooth-rssi', help='save rssi smoothed by EMA with this alpha to rssi_smoothed. 0 is disabled.',
+                            type=float, default=0.0)
+        parser.add_argument('--decode', help='save fields of known payload formats to BleScanDecoded.', action='store_true')
+        parser.add_argument('--latest', help='save the last advertising data of each device to BleDeviceLatest.',
+                            action='store_true')
+        parser.add_argument('--record', help='append advertising data to this capture file instead of saving results.',
+                            type=str, default=None)
+        parser.add_argument('--record-max-bytes', help='rotate the capture file when it exceeds this size.',
+                            type=int, default=CaptureWriter.DEFAULT_MAX_BYTES)
+        parser.add_argument('--backend', help='scanner backend. bleak, synthetic[:key=value,...] or replay:path=FILE[,...].',
+                            type=str, default=None)
+        parser.add_argument('--metrics', help='metrics sink. log or prometheus[:addr=127.0.0.1,port=9464].',
+                            type=str, default=None)
 
     def get_scan_event(self, event):
         # get scan event. if does not exists it, create.
         scan_event, _ = BleScanEvent.objects.get_or_create(name=event)
         logger.info(f'{scan_event} -> {scan_event.status}')
-        if scan_event.status in (BleScanEvent.Status.RUNNING, BleScanEvent.Status.ZOMBIE):
+        if scan_event.is_running:
             psutil.Process(scan_event.pid).kill()
             logger.info(f'{scan_event.pid} killed')
         # update scan event.
@@ -61,32 +342,101 @@ class Command(BaseCommand):
         scan_event.is_enabled = True
         scan_event.pid = proc.pid
         scan_event.create_time = proc.create_time()
+        scan_event.last_heartbeat = timezone.now()
+        scan_event.processed = 0
+        scan_event.queue_depth = 0
         scan_event.save()
         logger.info(f'updated scan event. -> {scan_event}')
         return scan_event
 
-    def main(self, event, interval, *args, **options):
+    def release_scan_event(self, event):
+        scan_event = BleScanEvent.objects.filter(name=event).first()
+        if scan_event:
+            scan_event.is_enabled = False
+            scan_event.pid = None
+            scan_event.create_time = None
+            scan_event.last_heartbeat = None
+            scan_event.queue_depth = 0
+            scan_event.save()
+            logger.info(f'updated scan event. -> {scan_event}')
+
+    def configure(self, **options):
+        self.buffer = AdvertisementBuffer(
+            self.flush,
+            batch_size=options.get('batch_size', AdvertisementBuffer.DEFAULT_BATCH_SIZE),
+            batch_wait=options.get('batch_wait', AdvertisementBuffer.DEFAULT_BATCH_WAIT),
+            capacity=options.get('buffer_size', AdvertisementBuffer.DEFAULT_CAPACITY),
+            drop_policy=options.get('drop_policy', AdvertisementBuffer.DropPolicy.OLDEST))
+        if options.get('writer', 'thread') == 'thread':
+            self.writer = BatchWriter(self.write,
+                                      max_pending=options.get('writer_max_pending', BatchWriter.DEFAULT_MAX_PENDING))
+        if options.get('retention_days'):
+            self.retention = datetime.timedelta(days=options['retention_days'])
+        self.rollup = options.get('rollup', False)
+        if options.get('backend'):
+            self.scanner_class = load_backend(options['backend'])
+        if options.get('record'):
+            self.recorder = CaptureWriter(options['record'],
+                                          max_bytes=options.get('record_max_bytes', CaptureWriter.DEFAULT_MAX_BYTES))
+        if options.get('metrics'):
+            self.metrics_sink = load_sink(options['metrics'])
+            self.register_metrics()
+
+    async def run(self, event, interval, **options):
+        """scan until the scan event is stopped
+
+        Args:
+            event (str): scan event name
+            interval (float): monitoring interval
+        """
+        async_event = asyncio.Event()
+        self.configure(**options)
+        session = self.create_session(event, self.adapter, **options)
+        self.sessions = [session]
+        if options.get('presence_timeout'):
+            await sync_to_async(session.open_presence)(options['presence_timeout'])
+        tasks = [session.scan_task(async_event),
+                 session.monitor_task(async_event),
+                 self.buffer.run(async_event)]
+        if self.metrics_sink is not None:
+            self.metrics_sink.start()
+            tasks.append(self.lag_task(async_event))
+        if self.writer is not None:
+            self.writer.start()
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            if self.writer is not None:
+                await self.writer.stop()
+            await sync_to_async(session.close_presence)()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.metrics_sink is not None:
+                self.metrics_sink.stop()
+
+    def main(self, event, interval, *args, **options) -> bool:
+        """scan and release the scan event
+
+        Returns:
+            bool: False if scanning failed
+        """
         logger.info('start ble_scanner')
         try:
             # do task.
-            async_event = asyncio.Event()
             loop = asyncio.get_event_loop()
-            futures = asyncio.gather(self.scan_task(async_event),
-                                     self.monitor_task(async_event, event, interval))
-            loop.run_until_complete(futures)
+            loop.run_until_complete(self.run(event, interval, **options))
             logger.info('loop finish.')
+            return True
         except BaseException:
             logger.exception('internal error.')
+            return False
         finally:
-            scan_event = BleScanEvent.objects.filter(name=event).first()
-            if scan_event:
-                scan_event.is_enabled = False
-                scan_event.pid = None
-                scan_event.create_time = None
-                scan_event.save()
-                logger.info(f'updated scan event. -> {scan_event}')
+            self.release_scan_event(event)
             logger.info('end ble_scanner')
 
     def handle(self, event, *args, **options):
         scan_event = self.get_scan_event(event)
-        self.main(scan_event.name, scan_event.interval, *args, **options)
+        self.adapter = scan_event.adapter
+        if not self.main(scan_event.name, scan_event.interval, *args, **options):
+            # exit status tells ble_supervisor to restart.
+            raise CommandError('scanning failed.')
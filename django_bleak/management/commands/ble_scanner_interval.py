@@ -1,39 +1,100 @@
 
 import asyncio
 import logging
+import typing as typ
 
 import bleak as blk
 from asgiref.sync import sync_to_async
 
+from django.core.management.base import CommandParser
 from django_bleak.management.commands.ble_scanner import Command as BleCommand
-from django_bleak.models import BleScanEvent, BleScanFilter
+from django_bleak.management.commands.ble_scanner import Session
+from django_bleak.models.scanner import BleScanData
 
 logger = logging.getLogger('ble_scanner')
 
 
-class Command(BleCommand):
+class IntervalSession(Session):
+    """scan loop of one scan event in interval mode
+
+    It saves the last advertising data of each device per interval.
+    """
+
+    # keep one scanner running instead of discover() per interval.
+    continuous: bool = False
+    # last advertising data of each device in this interval, only if continuous.
+    latest: typ.Dict[str, BleScanData] = None
 
     async def callback(self, dev: blk.BLEDevice, adv: blk.AdvertisementData):
-        pass
+        if self.latest is not None:
+            self.latest[dev.address] = (dev, adv)
 
     async def scan_task(self, async_event: asyncio.Event):
-        logger.info('pass scan_task. instead doing in monitor_task.')
+        if self.continuous:
+            await super().scan_task(async_event)
+        else:
+            logger.info('pass scan_task. instead doing in monitor_task.')
+
+    def snapshot(self) -> typ.List[BleScanData]:
+        """take the last advertising data of each device, and start the next interval
+
+        Returns:
+            typ.List[BleScanData]: advertising data in first seen order of devices
+        """
+        latest, self.latest = self.latest, {}
+        return list(latest.values())
+
+    async def scan(self, interval: float, async_event: asyncio.Event) -> typ.Optional[typ.Iterable[BleScanData]]:
+        """scan for interval seconds
+
+        Returns:
+            typ.Optional[typ.Iterable[BleScanData]]: last advertising data of each device. None if async event is set.
+        """
+        if not self.continuous:
+            scan_res = await self.scanner_class.discover(timeout=interval, return_adv=True,
+                                                         **self.scanner_kwargs())
+            return scan_res.values()
+        try:
+            # callbacks keep running while waiting.
+            await asyncio.wait_for(async_event.wait(), interval)
+            logger.info('async event is set.')
+            return None
+        except asyncio.TimeoutError:
+            return self.snapshot()
 
-    async def monitor_task(self, async_event: asyncio.Event, name: str, interval: float):
-        event = await sync_to_async(BleScanEvent.objects.get)(name=name)
+    async def monitor_task(self, async_event: asyncio.Event):
+        event = await self.reload()
         try:
             while event.interval > 0.0:
                 logger.debug(f'{event}')
                 if not event.is_enabled:
                     logger.info('is_enabled switched to false.')
                     break
-                scan_res = await blk.BleakScanner.discover(timeout=event.interval, return_adv=True)
-                ret = await sync_to_async(self.filters.create_data)(scan_res.values())
-                if len(ret):
-                    logger.debug(f'create -> {ret}')
-                event = await sync_to_async(BleScanEvent.objects.get)(name=name)
-                self.filters = await sync_to_async(BleScanFilter.objects.filter)(is_enabled=True)
+                scan_res = await self.scan(event.interval, async_event)
+                if scan_res is None:
+                    break
+                for data in scan_res:
+                    self.command.receive(self, data)
+                self.command.report(self)
+                await sync_to_async(self.command.keep_alive)(self)
+                event = await self.reload(event)
         finally:
             async_event.set()
             logger.info('set async event.')
             logger.info('monitor_task finish.')
+
+    def configure(self, **options):
+        super().configure(**options)
+        self.continuous = options.get('continuous', False)
+        if self.continuous:
+            self.latest = {}
+
+
+class Command(BleCommand):
+
+    session_class = IntervalSession
+
+    def add_arguments(self, parser: CommandParser):
+        super().add_arguments(parser)
+        parser.add_argument('--continuous', help='keep scanning and save the last data of each device per interval.',
+                            action='store_true')
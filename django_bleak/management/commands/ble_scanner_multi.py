@@ -0,0 +1,97 @@
+
+import asyncio
+import logging
+import typing as typ
+
+from asgiref.sync import sync_to_async
+
+from django.core.management.base import CommandError, CommandParser
+from django_bleak.management.commands.ble_scanner import Command as BleCommand
+from django_bleak.management.commands.ble_scanner import Session
+from django_bleak.management.commands.ble_scanner_interval import \
+    IntervalSession
+from django_bleak.models import BleScanEvent
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Command(BleCommand):
+    help = 'scan some scan events at once in one process.'
+
+    def create_session(self, scan_event: BleScanEvent, **options) -> Session:
+        if scan_event.scan_mode == BleScanEvent.ModeChoices.SEQUENTIAL:
+            return super().create_session(scan_event.name, scan_event.adapter, **options)
+        # interval mode keeps scanning like ble_scanner_interval --continuous.
+        return super().create_session(scan_event.name, scan_event.adapter, session_class=IntervalSession,
+                                      **{**options, 'continuous': True})
+
+    async def session_task(self, session: Session):
+        async_event = asyncio.Event()
+        monitor = asyncio.ensure_future(session.monitor_task(async_event))
+        try:
+            await session.scan_task(async_event)
+        except Exception:
+            # other sessions keep scanning.
+            logger.exception(f'{session.name} scan_task error.')
+            async_event.set()
+        await monitor
+        await sync_to_async(self.release_scan_event)(session.name)
+        logger.info(f'{session.name} session finish.')
+
+    async def run(self, scan_events: typ.List[BleScanEvent], **options):
+        """scan until all scan events are stopped
+
+        Args:
+            scan_events (typ.List[BleScanEvent]): scan events
+        """
+        async_event = asyncio.Event()
+        self.configure(**options)
+        # dedup and rssi smoothing are per session, because rssi of a device differs by adapter.
+        self.sessions = [self.create_session(scan_event, **options) for scan_event in scan_events]
+        if options.get('presence_timeout'):
+            for session in self.sessions:
+                await sync_to_async(session.open_presence)(options['presence_timeout'])
+        tasks = [self.buffer.run(async_event)]
+        if self.metrics_sink is not None:
+            self.metrics_sink.start()
+            tasks.append(self.lag_task(async_event))
+        if self.writer is not None:
+            self.writer.start()
+        background = asyncio.ensure_future(asyncio.gather(*tasks))
+        try:
+            await asyncio.gather(*[self.session_task(session) for session in self.sessions])
+        finally:
+            async_event.set()
+            await background
+            if self.writer is not None:
+                await self.writer.stop()
+            for session in self.sessions:
+                await sync_to_async(session.close_presence)()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.metrics_sink is not None:
+                self.metrics_sink.stop()
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('events', help='scan event names.', type=str, nargs='+')
+        self.add_scan_arguments(parser)
+
+    def main(self, scan_events: typ.List[BleScanEvent], *args, **options) -> bool:
+        logger.info('start ble_scanner_multi')
+        try:
+            loop = asyncio.get_event_loop()
+            loop.run_until_complete(self.run(scan_events, **options))
+            logger.info('loop finish.')
+            return True
+        except BaseException:
+            logger.exception('internal error.')
+            return False
+        finally:
+            for scan_event in scan_events:
+                self.release_scan_event(scan_event.name)
+            logger.info('end ble_scanner_multi')
+
+    def handle(self, events, *args, **options):
+        scan_events = [self.get_scan_event(event) for event in dict.fromkeys(events)]
+        if not self.main(scan_events, *args, **options):
+            raise CommandError('scanning failed.')
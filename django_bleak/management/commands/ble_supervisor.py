@@ -0,0 +1,238 @@
+
+import logging
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+import typing as typ
+
+from django.core.management import BaseCommand
+from django.core.management.base import CommandParser
+from django_bleak.models import BleScanCommand, BleScanEvent, BleScanVersion
+
+logger = logging.getLogger('ble_scanner')
+
+
+class Managed:
+    """scanner process of some scan events owned by ble_supervisor"""
+
+    def __init__(self, events: typ.List[str]):
+        self.events = events
+        self.proc: typ.Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        # seconds waited before the next restart
+        self.backoff = 0.0
+        self.restarts = 0
+        # monotonic time to (re)start, None if running
+        self.next_start: typ.Optional[float] = None
+        # monotonic time to terminate, None if not stopping
+        self.stop_deadline: typ.Optional[float] = None
+        self.terminated = False
+        # monotonic time to kill a stalled scanner, None if not stalled
+        self.kill_at: typ.Optional[float] = None
+
+    def __str__(self):
+        pid = self.proc and self.proc.pid
+        return f'{",".join(self.events)}: pid={pid or "-"} restarts={self.restarts}'
+
+
+def scanner_command(events: typ.List[str]) -> str:
+    """get command scanning events
+
+    Args:
+        events (typ.List[str]): scan event names
+
+    Returns:
+        str: command name
+    """
+    if len(events) != 1:
+        # some scan events are scanned in one process.
+        return 'ble_scanner_multi'
+    mode = BleScanEvent.objects.filter(name=events[0]).values_list('scan_mode', flat=True).first()
+    if mode == BleScanEvent.ModeChoices.SEQUENTIAL:
+        return 'ble_scanner'
+    return 'ble_scanner_interval'
+
+
+class Command(BaseCommand):
+    help = 'start and stop scanners requested by BleScanCommand, and restart failed or stalled scanners.'
+
+    poll: float = 1.0
+    stop_timeout: float = 10.0
+    backoff_min: float = 1.0
+    backoff_max: float = 60.0
+    backoff_reset: float = 60.0
+    # seconds after start a scanner is not checked for heartbeats
+    startup_grace: float = 30.0
+    manage_py: str = None
+    scanner_args: typ.List[str] = []
+    stopping: bool = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.managed: typ.List[Managed] = []
+
+    def owner(self, event: str) -> typ.Optional[Managed]:
+        return next((m for m in self.managed if event in m.events), None)
+
+    def start(self, events: typ.List[str], now: float):
+        events = [e for e in dict.fromkeys(events) if self.owner(e) is None]
+        if not events:
+            raise ValueError('scan events are already supervised.')
+        m = Managed(events)
+        self.managed.append(m)
+        self.spawn(m, now)
+
+    def stop(self, events: typ.List[str], now: float):
+        # scanners stop by themselves in BleScanEvent.interval seconds.
+        BleScanEvent.objects.filter(name__in=events, is_enabled=True).update(is_enabled=False)
+        BleScanVersion.bump(BleScanVersion.SCANNER)
+        for m in list(self.managed):
+            if not set(events) & set(m.events):
+                continue
+            # ble_scanner_multi keeps scanning other events.
+            m.events = [e for e in m.events if e not in events]
+            if m.events:
+                continue
+            if m.proc is None:
+                self.managed.remove(m)
+            elif m.stop_deadline is None:
+                m.stop_deadline = now + self.stop_timeout
+
+    def spawn(self, m: Managed, now: float):
+        args = [sys.executable, self.manage_py, scanner_command(m.events), *m.events, *self.scanner_args]
+        try:
+            m.proc = subprocess.Popen(args)
+        except OSError:
+            logger.exception(f'failed to run {args}.')
+            self.retry(m, now)
+            return
+        m.started_at = now
+        m.next_start = None
+        logger.info(f'started {m}')
+
+    def retry(self, m: Managed, now: float):
+        if now - m.started_at >= self.backoff_reset:
+            # it was running long enough.
+            m.backoff = 0.0
+        m.backoff = min(max(m.backoff * 2, self.backoff_min), self.backoff_max)
+        m.next_start = now + m.backoff
+        m.restarts += 1
+        logger.warning(f'restart {m} in {m.backoff:.1f}sec.')
+
+    def release(self, pid: int):
+        # a killed scanner can not release its scan events.
+        BleScanEvent.objects.filter(pid=pid).update(is_enabled=False, pid=None, create_time=None, last_heartbeat=None)
+        BleScanVersion.bump(BleScanVersion.SCANNER)
+
+    def supervise(self, m: Managed, now: float):
+        if m.proc is None:
+            if m.next_start is not None and now >= m.next_start:
+                self.spawn(m, now)
+            return
+        code = m.proc.poll()
+        if code is None:
+            if m.kill_at is not None and now >= m.kill_at:
+                logger.warning(f'kill {m}, not terminated in {self.stop_timeout}sec.')
+                m.proc.kill()
+            if m.stop_deadline is not None and now >= m.stop_deadline:
+                if m.terminated:
+                    m.proc.kill()
+                else:
+                    logger.warning(f'terminate {m}, not stopped in {self.stop_timeout}sec.')
+                    m.proc.terminate()
+                    m.terminated = True
+                    m.stop_deadline = now + self.stop_timeout
+            return
+        pid = m.proc.pid
+        m.proc = None
+        m.kill_at = None
+        if code < 0:
+            # killed by a signal.
+            self.release(pid)
+        if code == 0 or m.stop_deadline is not None:
+            # stopped by is_enabled or the stop command.
+            logger.info(f'{",".join(m.events) or "scanner"} finished. pid={pid} code={code}')
+            self.managed.remove(m)
+        else:
+            logger.warning(f'{m} failed. pid={pid} code={code}')
+            self.retry(m, now)
+
+    def restart_stalled(self, now: float):
+        """terminate scanners not sending heartbeats. they are restarted as failed.
+
+        Args:
+            now (float): monotonic time
+        """
+        running = {e: m for m in self.managed for e in m.events
+                   if m.proc is not None and m.stop_deadline is None and m.kill_at is None
+                   and now - m.started_at >= self.startup_grace}
+        if not running:
+            return
+        for event in BleScanEvent.objects.filter(name__in=running).stalled():
+            m = running[event.name]
+            if m.kill_at is None:
+                logger.warning(f'terminate {m}, no heartbeat of {event.name} since {event.last_heartbeat}.')
+                m.proc.terminate()
+                m.kill_at = now + self.stop_timeout
+
+    def tick(self, now: float):
+        """process queued commands, and restart or reap scanners
+
+        Args:
+            now (float): monotonic time
+        """
+        for command in BleScanCommand.objects.pending():
+            logger.info(f'command {command}')
+            try:
+                getattr(self, command.action)(command.events, now)
+            except Exception as e:
+                logger.exception(f'command {command} failed.')
+                command.finish(str(e))
+            else:
+                command.finish()
+        self.restart_stalled(now)
+        for m in list(self.managed):
+            self.supervise(m, now)
+
+    def shutdown(self):
+        logger.info(f'stop {len(self.managed)} scanners.')
+        self.stop([e for m in self.managed for e in m.events], time.monotonic())
+        # processes waiting for restart are removed by stop().
+        while self.managed:
+            time.sleep(self.poll)
+            for m in list(self.managed):
+                self.supervise(m, time.monotonic())
+
+    def on_signal(self, signum, frame):
+        self.stopping = True
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('--poll', help='seconds BleScanCommand is polled.', type=float, default=self.poll)
+        parser.add_argument('--stop-timeout', help='seconds a scanner is waited to stop before it is terminated.',
+                            type=float, default=self.stop_timeout)
+        parser.add_argument('--backoff-max', help='max seconds a failed scanner is waited before restart.',
+                            type=float, default=self.backoff_max)
+        parser.add_argument('--scanner-args', help='options of scanner commands, ex. "--batch-size 500 --writer thread".',
+                            type=str, default='')
+
+    def handle(self, *args, **options):
+        self.poll = options.get('poll', self.poll)
+        self.stop_timeout = options.get('stop_timeout', self.stop_timeout)
+        self.backoff_max = options.get('backoff_max', self.backoff_max)
+        self.scanner_args = shlex.split(options.get('scanner_args') or '')
+        # scanners are run by the same manage.py.
+        self.manage_py = os.path.abspath(sys.argv[0])
+        signal.signal(signal.SIGTERM, self.on_signal)
+        logger.info('start ble_supervisor')
+        try:
+            while not self.stopping:
+                self.tick(time.monotonic())
+                time.sleep(self.poll)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+            logger.info('end ble_supervisor')
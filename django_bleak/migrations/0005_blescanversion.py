@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0004_alter_blescanfilter_company_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BleScanVersion',
+            fields=[
+                ('name', models.CharField(max_length=32, primary_key=True, serialize=False, verbose_name='version name')),
+                ('version', models.BigIntegerField(default=0, verbose_name='version')),
+            ],
+            options={
+                'verbose_name': 'ble scan version',
+                'verbose_name_plural': 'ble scan versions',
+                'db_table': 'django_bleak_blescanversion',
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0005_blescanversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BleScanRollup',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('period', models.CharField(choices=[('min', 'Minute'), ('hour', 'Hour')], max_length=4, verbose_name='period')),
+                ('bucket', models.DateTimeField(verbose_name='bucket start datetime')),
+                ('company_code', models.IntegerField(blank=True, default=None, null=True, verbose_name='company code')),
+                ('service_uuid', models.UUIDField(blank=True, default=None, null=True, verbose_name='service uuid')),
+                ('count', models.IntegerField(verbose_name='count')),
+                ('rssi_min', models.FloatField(verbose_name='rssi min[dBm]')),
+                ('rssi_max', models.FloatField(verbose_name='rssi max[dBm]')),
+                ('rssi_sum', models.FloatField(verbose_name='rssi sum[dBm]')),
+                ('last_received_at', models.DateTimeField(verbose_name='last received datetime')),
+                ('last_payload', models.BinaryField(blank=True, default=None, max_length=256, null=True, verbose_name='last payload')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='django_bleak.blescandevice', verbose_name='relational device')),
+            ],
+            options={
+                'verbose_name': 'ble scan rollup',
+                'verbose_name_plural': 'ble scan rollups',
+                'db_table': 'django_bleak_blescanrollup',
+                'indexes': [models.Index(fields=['device', 'period', 'bucket'], name='bsru_dev_per_buc_idx')],
+            },
+        ),
+    ]
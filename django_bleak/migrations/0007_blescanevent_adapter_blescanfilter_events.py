@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0006_blescanrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blescanevent',
+            name='adapter',
+            field=models.CharField(blank=True, default=None, help_text='hci0. null means default adapter.', max_length=32, null=True, verbose_name='bluetooth adapter'),
+        ),
+        migrations.AddField(
+            model_name='blescanfilter',
+            name='events',
+            field=models.ManyToManyField(blank=True, help_text='empty means all scan events.', related_name='filters', to='django_bleak.blescanevent', verbose_name='scan events'),
+        ),
+    ]
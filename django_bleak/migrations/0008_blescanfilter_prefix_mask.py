@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:36
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0007_blescanevent_adapter_blescanfilter_events'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blescanfilter',
+            name='manufacturer_mask',
+            field=models.CharField(blank=True, default=None, help_text='hex string as long as prefix. null compares all bits. ex. FF00', max_length=64, null=True, validators=[django.core.validators.RegexValidator('^([0-9a-fA-F]{2})*$', 'hex string of bytes is required.')], verbose_name='mask of manufacturer_data prefix'),
+        ),
+        migrations.AddField(
+            model_name='blescanfilter',
+            name='manufacturer_prefix',
+            field=models.CharField(blank=True, default=None, help_text='hex string. ex. 0215 for iBeacon', max_length=64, null=True, validators=[django.core.validators.RegexValidator('^([0-9a-fA-F]{2})*$', 'hex string of bytes is required.')], verbose_name='prefix of manufacturer_data'),
+        ),
+        migrations.AddField(
+            model_name='blescanfilter',
+            name='service_mask',
+            field=models.CharField(blank=True, default=None, help_text='hex string as long as prefix. null compares all bits. ex. F0', max_length=64, null=True, validators=[django.core.validators.RegexValidator('^([0-9a-fA-F]{2})*$', 'hex string of bytes is required.')], verbose_name='mask of service_data prefix'),
+        ),
+        migrations.AddField(
+            model_name='blescanfilter',
+            name='service_prefix',
+            field=models.CharField(blank=True, default=None, help_text='hex string. ex. 00 for Eddystone-UID', max_length=64, null=True, validators=[django.core.validators.RegexValidator('^([0-9a-fA-F]{2})*$', 'hex string of bytes is required.')], verbose_name='prefix of service_data'),
+        ),
+    ]
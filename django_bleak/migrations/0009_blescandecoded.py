@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0008_blescanfilter_prefix_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BleScanDecoded',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('format', models.CharField(help_text='ibeacon', max_length=32, verbose_name='format')),
+                ('name', models.CharField(help_text='major', max_length=32, verbose_name='field name')),
+                ('value', models.FloatField(blank=True, default=None, null=True, verbose_name='numeric value')),
+                ('text', models.CharField(blank=True, default=None, max_length=64, null=True, verbose_name='text value')),
+                ('result', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='decoded', to='django_bleak.blescanresult', verbose_name='relational result')),
+            ],
+            options={
+                'verbose_name': 'ble scan decoded field',
+                'verbose_name_plural': 'ble scan decoded fields',
+                'db_table': 'django_bleak_blescandecoded',
+                'indexes': [models.Index(fields=['format', 'name', 'value'], name='bsd_for_nam_val_idx'), models.Index(fields=['format', 'name', 'text'], name='bsd_for_nam_tex_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0009_blescandecoded'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlePresence',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entered_at', models.DateTimeField(verbose_name='entered datetime')),
+                ('left_at', models.DateTimeField(blank=True, default=None, help_text='last seen datetime. null while present.', null=True, verbose_name='left datetime')),
+                ('rssi', models.FloatField(verbose_name='smoothed rssi[dBm]')),
+                ('count', models.IntegerField(verbose_name='count')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='django_bleak.blescandevice', verbose_name='relational device')),
+                ('event', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.CASCADE, to='django_bleak.blescanevent', verbose_name='relational event')),
+            ],
+            options={
+                'verbose_name': 'ble presence',
+                'verbose_name_plural': 'ble presences',
+                'db_table': 'django_bleak_blepresence',
+                'indexes': [models.Index(fields=['device', 'entered_at'], name='bp_dev_ent_idx'), models.Index(fields=['left_at'], name='bp_lef_idx')],
+            },
+        ),
+    ]
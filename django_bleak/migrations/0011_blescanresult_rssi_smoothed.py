@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0010_blepresence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blescanresult',
+            name='rssi_smoothed',
+            field=models.FloatField(blank=True, default=None, null=True, verbose_name='smoothed rssi[dBm]'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0011_blescanresult_rssi_smoothed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blescanresult',
+            index=models.Index(fields=['received_at', 'id'], name='bsr_rec_id_idx'),
+        ),
+    ]
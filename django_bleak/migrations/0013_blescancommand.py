@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:06
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0012_blescanresult_bsr_rec_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BleScanCommand',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('start', 'Start'), ('stop', 'Stop')], max_length=8, verbose_name='action')),
+                ('events', models.JSONField(default=list, help_text='["ScanEvent001", "ScanEvent002"]', verbose_name='event names')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created datetime')),
+                ('processed_at', models.DateTimeField(blank=True, default=None, help_text='null means not processed yet.', null=True, verbose_name='processed datetime')),
+                ('error', models.TextField(blank=True, default=None, null=True, verbose_name='error')),
+            ],
+            options={
+                'verbose_name': 'ble scan command',
+                'verbose_name_plural': 'ble scan commands',
+                'db_table': 'django_bleak_blescancommand',
+                'indexes': [models.Index(fields=['processed_at', 'id'], name='bsc_pro_id_idx')],
+            },
+        ),
+    ]
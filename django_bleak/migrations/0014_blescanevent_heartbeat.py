@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0013_blescancommand'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blescanevent',
+            name='last_heartbeat',
+            field=models.DateTimeField(blank=True, default=None, help_text='saved by the scanner every interval. null means no heartbeat.', null=True, verbose_name='last heartbeat'),
+        ),
+        migrations.AddField(
+            model_name='blescanevent',
+            name='processed',
+            field=models.BigIntegerField(default=0, verbose_name='processed advertising data'),
+        ),
+        migrations.AddField(
+            model_name='blescanevent',
+            name='queue_depth',
+            field=models.IntegerField(default=0, help_text='advertising data waiting for saving.', verbose_name='queue depth'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0014_blescanevent_heartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BleScanBucket',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('bucket', models.DateTimeField(verbose_name='bucket start datetime')),
+                ('count', models.IntegerField(verbose_name='count')),
+                ('first_id', models.BigIntegerField(verbose_name='first result id')),
+                ('data', models.BinaryField(help_text='see django_bleak.utils.columnar.', verbose_name='packed results')),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='django_bleak.blescandevice', verbose_name='relational device')),
+            ],
+            options={
+                'verbose_name': 'ble scan bucket',
+                'verbose_name_plural': 'ble scan buckets',
+                'db_table': 'django_bleak_blescanbucket',
+                'indexes': [models.Index(fields=['device', 'bucket'], name='bsb_dev_buc_idx'), models.Index(fields=['bucket'], name='bsb_buc_idx')],
+            },
+        ),
+    ]
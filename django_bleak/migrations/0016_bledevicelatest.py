@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0015_blescanbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BleDeviceLatest',
+            fields=[
+                ('device', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='latest', serialize=False, to='django_bleak.blescandevice', verbose_name='relational device')),
+                ('received_at', models.DateTimeField(verbose_name='received datetime')),
+                ('local_name', models.CharField(blank=True, default=None, max_length=256, null=True, verbose_name='local name')),
+                ('company_code', models.IntegerField(blank=True, default=None, help_text='first company code of the advertising data.', null=True, verbose_name='company code')),
+                ('manufacturer_data', models.BinaryField(blank=True, default=None, max_length=256, null=True, verbose_name='manufacturer_data')),
+                ('service_uuid', models.UUIDField(blank=True, default=None, help_text='first service uuid of the advertising data.', null=True, verbose_name='service uuid')),
+                ('service_data', models.BinaryField(blank=True, default=None, max_length=256, null=True, verbose_name='service_data')),
+                ('tx_power', models.FloatField(blank=True, default=None, null=True, verbose_name='tx_power[dBm]')),
+                ('rssi', models.FloatField(verbose_name='rssi[dBm]')),
+                ('rssi_smoothed', models.FloatField(blank=True, default=None, null=True, verbose_name='smoothed rssi[dBm]')),
+            ],
+            options={
+                'verbose_name': 'ble device latest state',
+                'verbose_name_plural': 'ble device latest states',
+                'db_table': 'django_bleak_bledevicelatest',
+            },
+        ),
+    ]
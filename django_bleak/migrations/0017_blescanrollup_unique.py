@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+
+def merge_duplicates(apps, schema_editor):
+    # rollups created twice by ble_rollup and scanners running at the same time.
+    BleScanRollup = apps.get_model('django_bleak', 'BleScanRollup')
+    rollups = BleScanRollup.objects.using(schema_editor.connection.alias)
+    keys = ['period', 'device', 'bucket', 'company_code', 'service_uuid']
+    duplicates = rollups.values(*keys).annotate(n=models.Count('id')).filter(n__gt=1)
+    for key in duplicates:
+        key.pop('n')
+        keep, *others = rollups.filter(**key).order_by('id')
+        for obj in others:
+            keep.count += obj.count
+            keep.rssi_min = min(keep.rssi_min, obj.rssi_min)
+            keep.rssi_max = max(keep.rssi_max, obj.rssi_max)
+            keep.rssi_sum += obj.rssi_sum
+            if obj.last_received_at >= keep.last_received_at:
+                keep.last_received_at = obj.last_received_at
+                keep.last_payload = obj.last_payload
+        keep.save()
+        rollups.filter(id__in=[obj.id for obj in others]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_bleak', '0016_bledevicelatest'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='blescanrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('service_uuid__isnull', True)), fields=('period', 'device', 'bucket', 'company_code'), name='bsru_per_dev_buc_com_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='blescanrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('service_uuid__isnull', False)), fields=('period', 'device', 'bucket', 'service_uuid'), name='bsru_per_dev_buc_ser_uniq'),
+        ),
+    ]
@@ -1,9 +1,21 @@
 
-from .scanner import BleScanDevice, BleScanEvent, BleScanFilter, BleScanResult
+from .bucket import BleScanBucket
+from .rollup import BleScanRollup
+from .scanner import (BleDeviceLatest, BlePresence, BleScanDecoded,
+                      BleScanDevice, BleScanEvent, BleScanFilter,
+                      BleScanResult, BleScanVersion)
+from .supervisor import BleScanCommand
 
 __all__ = [
     'BleScanFilter',
     'BleScanEvent',
     'BleScanDevice',
     'BleScanResult',
+    'BleScanDecoded',
+    'BlePresence',
+    'BleDeviceLatest',
+    'BleScanVersion',
+    'BleScanRollup',
+    'BleScanBucket',
+    'BleScanCommand',
 ]
@@ -0,0 +1,227 @@
+
+import datetime
+import heapq
+import typing as typ
+
+from django.db import models, transaction
+from django.utils.translation import gettext_lazy as _
+from django_bleak.utils import columnar
+
+from .rollup import BleScanRollup
+from .scanner import (BleScanDecoded, BleScanDevice, BleScanResult,
+                      BleScanVersion)
+
+
+class BucketQueryset(models.QuerySet):
+
+    DEFAULT_CHUNK_SIZE = 10000
+
+    def compact(self,
+                before: datetime.datetime,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                max_chunks: typ.Optional[int] = None) -> int:
+        """pack BleScanResult received before `before` into buckets, and delete them in chunks
+
+        `before` is truncated to the bucket start, so no bucket is split by the cutoff.
+        Results not rolled up yet are not compacted if BleScanRollup is used.
+        Ids of results are kept, so BleScanDecoded still refers to them.
+
+        Args:
+            before (datetime.datetime): cutoff datetime
+            chunk_size (int): max ids compacted at once
+            max_chunks (typ.Optional[int]): max chunks compacted by this call. None is unlimited.
+
+        Returns:
+            int: count of compacted results
+        """
+        before = BleScanBucket.truncate(before)
+        results = BleScanResult.objects.using(self.db)
+        cutoff = results.cutoff_id(before)
+        watermark = (BleScanVersion.objects.using(self.db).filter(name=BleScanRollup.WATERMARK)
+                     .values_list('version', flat=True).first())
+        if watermark is not None:
+            cutoff = min(cutoff, watermark + 1)
+        lo = results.filter(id__lt=cutoff, received_at__lt=before).aggregate(lo=models.Min('id'))['lo']
+        compacted = chunks = 0
+        while lo is not None and lo < cutoff and (max_chunks is None or chunks < max_chunks):
+            hi = min(lo + chunk_size, cutoff)
+            with transaction.atomic(using=self.db):
+                chunk = results.filter(id__gte=lo, id__lt=hi, received_at__lt=before)
+                rows = list(chunk.values_list('device_id', *columnar.COLUMNS))
+                if rows:
+                    self._merge(rows)
+                    chunk.delete()
+            compacted += len(rows)
+            chunks += 1
+            lo = hi
+        return compacted
+
+    def _merge(self, rows: typ.List[tuple]):
+        grouped: typ.Dict[tuple, typ.Tuple[typ.Any, typ.List[columnar.Row]]] = {}
+        for device_id, *row in rows:
+            key = (str(device_id), BleScanBucket.truncate(row[1]))
+            grouped.setdefault(key, (device_id, []))[1].append(tuple(row))
+
+        # merge into saved buckets, ex. a bucket split by chunks.
+        saved = self.filter(bucket__in={key[1] for key in grouped},
+                            device_id__in={device_id for device_id, _rows in grouped.values()})
+        updated = []
+        for obj in saved:
+            new = grouped.pop((str(obj.device_id), obj.bucket), None)
+            if new is not None:
+                obj.pack(obj.unpack() + new[1])
+                updated.append(obj)
+        created = []
+        for (_key, bucket), (device_id, group) in grouped.items():
+            obj = BleScanBucket(device_id=device_id, bucket=bucket)
+            obj.pack(group)
+            created.append(obj)
+        self.bulk_update(updated, ['count', 'first_id', 'data'], batch_size=1000)
+        self.bulk_create(created, batch_size=1000)
+
+    def results(self,
+                device: typ.Union[BleScanDevice, str],
+                start: datetime.datetime,
+                end: datetime.datetime) -> typ.Iterator[BleScanResult]:
+        """get results of a device in time range from buckets and BleScanResult
+
+        Args:
+            device (typ.Union[BleScanDevice, str]): device or mac address
+            start (datetime.datetime): start of range, inclusive
+            end (datetime.datetime): end of range, exclusive
+
+        Yields:
+            BleScanResult: results ordered by received datetime. unpacked results are not saved.
+        """
+        buckets = self.filter(device=device, bucket__gte=BleScanBucket.truncate(start), bucket__lt=end)
+        packed = (result
+                  for bucket in buckets.order_by('bucket').iterator(chunk_size=100)
+                  for result in bucket.results()
+                  if start <= result.received_at < end)
+        rows = (BleScanResult.objects.using(self.db)
+                .filter(device=device, received_at__gte=start, received_at__lt=end)
+                .order_by('received_at', 'id')
+                .iterator(chunk_size=self.DEFAULT_CHUNK_SIZE))
+        yield from heapq.merge(packed, rows, key=lambda result: (result.received_at, result.id))
+
+    def prune(self,
+              before: datetime.datetime,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              archive: typ.Optional[typ.Callable[[typ.List[BleScanResult]], typ.Any]] = None) -> int:
+        """delete buckets older than `before` in chunks
+
+        Args:
+            before (datetime.datetime): cutoff datetime. the bucket including it is kept.
+            chunk_size (int): max buckets deleted at once
+            archive (typ.Optional[typ.Callable]): called with unpacked results of each chunk before it is deleted
+
+        Returns:
+            int: count of deleted results in buckets
+        """
+        deleted = 0
+        old = self.filter(bucket__lt=BleScanBucket.truncate(before))
+        while True:
+            with transaction.atomic(using=self.db):
+                ids = list(old.order_by('id').values_list('id', flat=True)[:chunk_size])
+                if not ids:
+                    break
+                chunk = self.filter(id__in=ids)
+                if archive is not None:
+                    archive([result for obj in chunk.order_by('id') for result in obj.results()])
+                deleted += chunk.aggregate(count=models.Sum('count'))['count']
+                chunk.delete()
+        # decoded fields of results in deleted buckets.
+        BleScanDecoded.objects.using(self.db).prune_orphans()
+        return deleted
+
+
+class BucketManager(models.Manager.from_queryset(BucketQueryset)):
+    pass
+
+
+class BleScanBucket(models.Model):
+    """Results of a device in a minute packed into one row.
+
+    Results are saved as BleScanResult while scanning,
+    and old results are compacted into buckets by ble_compact.
+    """
+
+    # seconds of a bucket. offsets of received datetimes are microseconds.
+    PERIOD = 60
+
+    id = models.BigAutoField(
+        primary_key=True)
+
+    bucket = models.DateTimeField(
+        verbose_name=_('bucket start datetime'))
+
+    device = models.ForeignKey(
+        verbose_name=_('relational device'),
+        to=BleScanDevice,
+        on_delete=models.CASCADE)
+
+    count = models.IntegerField(
+        verbose_name=_('count'))
+
+    first_id = models.BigIntegerField(
+        verbose_name=_('first result id'))
+
+    data = models.BinaryField(
+        verbose_name=_('packed results'),
+        help_text=_('see django_bleak.utils.columnar.'))
+
+    objects = BucketManager()
+
+    def __str__(self):
+        return f'{self.device_id}: {self.bucket}/{self.count}'
+
+    @classmethod
+    def truncate(cls, dt: datetime.datetime) -> datetime.datetime:
+        """get bucket start datetime in UTC
+
+        Args:
+            dt (datetime.datetime): aware datetime
+
+        Returns:
+            datetime.datetime: bucket start datetime
+        """
+        dt = dt.astimezone(datetime.timezone.utc).replace(microsecond=0)
+        return dt - datetime.timedelta(seconds=dt.timestamp() % cls.PERIOD)
+
+    def pack(self, rows: typ.List[columnar.Row]):
+        """replace packed results
+
+        Args:
+            rows (typ.List[columnar.Row]): rows of columnar.COLUMNS
+        """
+        self.count = len(rows)
+        self.first_id = min(row[0] for row in rows)
+        self.data = columnar.pack(rows, self.bucket)
+
+    def unpack(self) -> typ.List[columnar.Row]:
+        """get packed results
+
+        Returns:
+            typ.List[columnar.Row]: rows of columnar.COLUMNS ordered by received datetime
+        """
+        return columnar.unpack(self.data, self.bucket)
+
+    def results(self) -> typ.List[BleScanResult]:
+        """get packed results in the shape of BleScanResult
+
+        Returns:
+            typ.List[BleScanResult]: results, not saved
+        """
+        return [BleScanResult(device_id=self.device_id, **dict(zip(columnar.COLUMNS, row)))
+                for row in self.unpack()]
+
+    class Meta:
+        verbose_name = _('ble scan bucket')
+        verbose_name_plural = _('ble scan buckets')
+        db_table = 'django_bleak_blescanbucket'
+        indexes = [
+            models.Index(fields=['device', 'bucket'],
+                         name='bsb_dev_buc_idx'),
+            models.Index(fields=['bucket'],
+                         name='bsb_buc_idx'),
+        ]
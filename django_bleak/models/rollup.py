@@ -0,0 +1,243 @@
+
+import datetime
+import typing as typ
+from itertools import takewhile
+
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .scanner import BleScanDevice, BleScanResult, BleScanVersion
+
+
+class RollupQueryset(models.QuerySet):
+
+    DEFAULT_CHUNK_SIZE = 10000
+    # results newer than this may not be committed yet.
+    DEFAULT_LAG = datetime.timedelta(seconds=60)
+
+    def update_rollups(self,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       max_chunks: typ.Optional[int] = None,
+                       lag: datetime.timedelta = DEFAULT_LAG) -> int:
+        """aggregate BleScanResult saved since last watermark into rollups
+
+        The watermark is the last aggregated result id,
+        saved as BleScanVersion(name=BleScanRollup.WATERMARK).
+        Its row is locked while a chunk is aggregated, so a result is not aggregated twice
+        by ble_rollup and scanners running at the same time.
+
+        Args:
+            chunk_size (int): max results aggregated at once
+            max_chunks (typ.Optional[int]): max chunks aggregated by this call. None is unlimited.
+            lag (datetime.timedelta): results received in this time are not aggregated yet
+
+        Returns:
+            int: count of aggregated results
+        """
+        until = timezone.now() - lag
+        processed = chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            with transaction.atomic(using=self.db):
+                # the watermark is locked until commit, so concurrent calls aggregate a chunk in turn.
+                version, _ = (BleScanVersion.objects.using(self.db).select_for_update()
+                              .get_or_create(name=BleScanRollup.WATERMARK))
+                watermark = version.version
+                rows = list(BleScanResult.objects.using(self.db)
+                            .filter(id__gt=watermark)
+                            .order_by('id')
+                            .values_list('id', 'device_id', 'received_at', 'company_code', 'service_uuid',
+                                         'manufacturer_data', 'service_data', 'rssi')[:chunk_size])
+                # stop at the first recent result not to skip it by watermark.
+                rows = list(takewhile(lambda row: row[2] < until, rows))
+                if not rows:
+                    break
+                self._merge(rows)
+                version.version = rows[-1][0]
+                version.save(using=self.db, update_fields=['version'])
+            processed += len(rows)
+            chunks += 1
+            if len(rows) < chunk_size:
+                break
+        return processed
+
+    def _merge(self, rows: typ.List[tuple]):
+        aggregated: typ.Dict[tuple, BleScanRollup] = {}
+        for result_id, device_id, received_at, company_code, service_uuid, manufacturer_data, service_data, rssi in rows:
+            payload = manufacturer_data if service_uuid is None else service_data
+            for period in BleScanRollup.Period:
+                bucket = BleScanRollup.truncate(received_at, period)
+                key = (period.value, str(device_id), bucket, company_code, service_uuid)
+                obj = aggregated.get(key)
+                if obj is None:
+                    aggregated[key] = BleScanRollup(
+                        period=period, bucket=bucket, device_id=device_id,
+                        company_code=company_code, service_uuid=service_uuid,
+                        count=1, rssi_min=rssi, rssi_max=rssi, rssi_sum=rssi,
+                        last_received_at=received_at, last_payload=payload)
+                else:
+                    obj.add(1, rssi, rssi, rssi, received_at, payload)
+
+        # merge into saved rollups.
+        saved = self.filter(bucket__in={key[2] for key in aggregated},
+                            device_id__in={obj.device_id for obj in aggregated.values()})
+        updated = []
+        for obj in saved:
+            key = (obj.period, str(obj.device_id), obj.bucket, obj.company_code, obj.service_uuid)
+            new = aggregated.pop(key, None)
+            if new is not None:
+                obj.add(new.count, new.rssi_min, new.rssi_max, new.rssi_sum, new.last_received_at, new.last_payload)
+                updated.append(obj)
+        self.bulk_update(updated, ['count', 'rssi_min', 'rssi_max', 'rssi_sum', 'last_received_at', 'last_payload'],
+                         batch_size=5000)
+        self.bulk_create(aggregated.values(), batch_size=5000)
+
+    def series(self,
+               device: typ.Union[BleScanDevice, str],
+               start: datetime.datetime,
+               end: datetime.datetime,
+               period: typ.Optional['BleScanRollup.Period'] = None) -> 'models.QuerySet[BleScanRollup]':
+        """get rollups of a device in time range
+
+        Args:
+            device (typ.Union[BleScanDevice, str]): device or mac address
+            start (datetime.datetime): start of range, inclusive
+            end (datetime.datetime): end of range, exclusive
+            period (typ.Optional[BleScanRollup.Period]): None is hour if range is over a day, else minute.
+
+        Returns:
+            models.QuerySet[BleScanRollup]: rollups ordered by bucket
+        """
+        if period is None:
+            period = BleScanRollup.Period.HOUR if end - start > datetime.timedelta(days=1) else BleScanRollup.Period.MINUTE
+        return self.filter(device=device, period=period, bucket__gte=BleScanRollup.truncate(start, period),
+                           bucket__lt=end).order_by('bucket')
+
+
+class RollupManager(models.Manager.from_queryset(RollupQueryset)):
+    pass
+
+
+class BleScanRollup(models.Model):
+
+    # BleScanVersion name of last aggregated result id.
+    WATERMARK = 'rollup'
+
+    class Period(models.TextChoices):
+        MINUTE = 'min', _('Minute')
+        HOUR = 'hour', _('Hour')
+
+    id = models.BigAutoField(
+        primary_key=True)
+
+    period = models.CharField(
+        verbose_name=_('period'),
+        choices=Period.choices,
+        max_length=4)
+
+    bucket = models.DateTimeField(
+        verbose_name=_('bucket start datetime'))
+
+    device = models.ForeignKey(
+        verbose_name=_('relational device'),
+        to=BleScanDevice,
+        on_delete=models.CASCADE)
+
+    company_code = models.IntegerField(
+        verbose_name=_('company code'),
+        null=True,
+        blank=True,
+        default=None)
+
+    service_uuid = models.UUIDField(
+        verbose_name=_('service uuid'),
+        null=True,
+        blank=True,
+        default=None)
+
+    count = models.IntegerField(
+        verbose_name=_('count'))
+
+    rssi_min = models.FloatField(
+        verbose_name=_('rssi min[dBm]'))
+
+    rssi_max = models.FloatField(
+        verbose_name=_('rssi max[dBm]'))
+
+    rssi_sum = models.FloatField(
+        verbose_name=_('rssi sum[dBm]'))
+
+    last_received_at = models.DateTimeField(
+        verbose_name=_('last received datetime'))
+
+    last_payload = models.BinaryField(
+        verbose_name=_('last payload'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=256)
+
+    objects = RollupManager()
+
+    def __str__(self):
+        return f'{self.device_id}: {self.bucket}/{self.period}'
+
+    @property
+    def rssi_avg(self) -> float:
+        """average rssi[dBm]"""
+        return self.rssi_sum / self.count
+
+    @staticmethod
+    def truncate(dt: datetime.datetime, period: 'BleScanRollup.Period') -> datetime.datetime:
+        """get bucket start datetime in UTC
+
+        Args:
+            dt (datetime.datetime): aware datetime
+            period (BleScanRollup.Period): period
+
+        Returns:
+            datetime.datetime: bucket start datetime
+        """
+        dt = dt.astimezone(datetime.timezone.utc).replace(second=0, microsecond=0)
+        if period == BleScanRollup.Period.HOUR:
+            dt = dt.replace(minute=0)
+        return dt
+
+    def add(self, count: int, rssi_min: float, rssi_max: float, rssi_sum: float,
+            received_at: datetime.datetime, payload: typ.Optional[bytes]):
+        """merge aggregated values
+
+        Args:
+            count (int): count
+            rssi_min (float): minimum rssi
+            rssi_max (float): maximum rssi
+            rssi_sum (float): sum of rssi
+            received_at (datetime.datetime): last received datetime
+            payload (typ.Optional[bytes]): last payload
+        """
+        self.count += count
+        self.rssi_min = min(self.rssi_min, rssi_min)
+        self.rssi_max = max(self.rssi_max, rssi_max)
+        self.rssi_sum += rssi_sum
+        if received_at >= self.last_received_at:
+            self.last_received_at = received_at
+            self.last_payload = payload
+
+    class Meta:
+        verbose_name = _('ble scan rollup')
+        verbose_name_plural = _('ble scan rollups')
+        db_table = 'django_bleak_blescanrollup'
+        indexes = [
+            models.Index(fields=['device', 'period', 'bucket'],
+                         name='bsru_dev_per_buc_idx'),
+        ]
+        # one rollup per key. a rollup has either company_code or service_uuid,
+        # and NULLs are distinct in a unique constraint, so the other one is a condition.
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'device', 'bucket', 'company_code'],
+                                    condition=models.Q(service_uuid__isnull=True),
+                                    name='bsru_per_dev_buc_com_uniq'),
+            models.UniqueConstraint(fields=['period', 'device', 'bucket', 'service_uuid'],
+                                    condition=models.Q(service_uuid__isnull=False),
+                                    name='bsru_per_dev_buc_ser_uniq'),
+        ]
@@ -1,22 +1,72 @@
 
+import datetime
+import logging
 import re
+import time
 import typing as typ
+from collections import defaultdict
 from enum import Enum
+from functools import cached_property
+from itertools import chain, compress, repeat
 
 import bleak as blk
 import psutil
 from macaddress.fields import MACAddressField
+from netaddr import EUI, mac_unix_expanded
 from regex_field.fields import RegexField as BrokenRegexField
 
-from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models, transaction
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.validators import (MaxValueValidator, MinValueValidator,
+                                    RegexValidator)
+from django.db import (DatabaseError, IntegrityError, connections, models,
+                       transaction)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
 from django.forms.fields import CharField
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from django_bleak.utils import Deduplicator, DeviceCache
+from django_bleak.utils.decoders import DecoderRegistry
+from django_bleak.utils.metrics import SIZE_BUCKETS, metrics
+from django_bleak.utils.presence import (PresenceState, PresenceTracker,
+                                         Transition)
+from django_bleak.utils.rssi import RssiSmoother, rssi_arrays
+
+logger = logging.getLogger('ble_scanner')
+
+if typ.TYPE_CHECKING:
+    import numpy as np
 
 BleScanData = typ.Tuple[blk.BLEDevice, blk.AdvertisementData]
 
 
+def format_mac_addr(mac_addr: typ.Union[str, EUI]) -> str:
+    """format mac address as same as BLEDevice.address
+
+    Args:
+        mac_addr (typ.Union[str, EUI]): mac address
+
+    Returns:
+        str: ex. 12:34:56:78:90:AB
+    """
+    return str(EUI(mac_addr, dialect=mac_unix_expanded)).upper()
+
+
+# mac address of BleScanDevice saved in the database.
+device_cache: 'DeviceCache[str]' = DeviceCache()
+
+# measured only while a metrics sink is started.
+FILTERED = metrics.counter('filtered_total', 'advertising data given to filter_data.')
+MATCHED = metrics.counter('matched_total', 'advertising data matched by filters.')
+CREATED = metrics.counter('results_created_total', 'BleScanResult saved by create_data.')
+DB_ERRORS = metrics.counter('db_errors_total', 'create_data failed by database errors.')
+CREATE_SECONDS = metrics.histogram('create_data_seconds', 'seconds create_data takes per batch.')
+BATCH_SIZE = metrics.histogram('batch_size', 'advertising data given to create_data per batch.', SIZE_BUCKETS)
+
+
 # until fix issue below ===========================================================
 # https://github.com/ambitioninc/django-regex-field/issues/34
 class FixedRegexField(CharField):
@@ -35,8 +85,151 @@ class RegexField(BrokenRegexField):
 # =================================================================================
 
 
+hex_validator = RegexValidator(r'^([0-9a-fA-F]{2})*$', _('hex string of bytes is required.'))
+
+
+class PayloadHex:
+    """hex strings of the payloads of an advertising data.
+
+    Payloads are converted at most once per advertising data,
+    and shared by all filters.
+    """
+
+    __slots__ = ('adv', '_manufacturer_data', '_service_data')
+
+    def __init__(self, adv: blk.AdvertisementData):
+        self.adv = adv
+        self._manufacturer_data = None
+        self._service_data = None
+
+    @property
+    def manufacturer_data(self) -> typ.List[str]:
+        if self._manufacturer_data is None:
+            self._manufacturer_data = [v.hex() for v in self.adv.manufacturer_data.values()]
+        return self._manufacturer_data
+
+    @property
+    def service_data(self) -> typ.List[str]:
+        if self._service_data is None:
+            self._service_data = [v.hex() for v in self.adv.service_data.values()]
+        return self._service_data
+
+
+class BytesPrefix:
+    """leading bytes of a payload compared without regex.
+
+    Bits which are 0 in mask are ignored.
+    """
+
+    __slots__ = ('prefix', 'size', 'mask', 'value')
+
+    def __init__(self, prefix: str, mask: typ.Optional[str] = None):
+        self.prefix = bytes.fromhex(prefix)
+        self.size = len(self.prefix)
+        self.mask = int(mask, 16) if mask else None
+        self.value = None if self.mask is None else int.from_bytes(self.prefix, 'big') & self.mask
+
+    def match(self, payload: bytes) -> bool:
+        if self.mask is None:
+            return payload.startswith(self.prefix)
+        return len(payload) >= self.size and (int.from_bytes(payload[:self.size], 'big') & self.mask) == self.value
+
+
+class FilterMatcher:
+    """BleScanFilter index compiled once from filters.
+
+    Each filter is indexed by its first exact key (mac_addr, local_name,
+    service_uuid, company_code), so an advertisement is only checked by
+    is_match of the filters that can match it.
+    """
+
+    def __init__(self, filters: typ.Iterable['BleScanFilter']):
+        self.filters = tuple(iter(filters))
+        self._mac_addr = defaultdict(list)
+        self._local_name = defaultdict(list)
+        self._service_uuid = defaultdict(list)
+        self._company_code = defaultdict(list)
+        self._wildcards = []
+        # hex strings are shared only if regex filters exist.
+        self._regex = any(f.manufacturer_data or f.service_data for f in self.filters)
+        for f in self.filters:
+            # same conditions as is_match.
+            if f.mac_addr:
+                self._mac_addr[str(f.mac_addr)].append(f)
+            elif f.local_name:
+                self._local_name[f.local_name].append(f)
+            elif f.service_uuid:
+                self._service_uuid[f.service_uuid].append(f)
+            elif f.company_code is not None:
+                self._company_code[f.company_code].append(f)
+            else:
+                self._wildcards.append(f)
+
+    def __len__(self):
+        return len(self.filters)
+
+    def candidates(self, data: BleScanData) -> typ.Iterator['BleScanFilter']:
+        """get filters that can match BleScanData
+
+        Args:
+            data (BleScanData): BleScanData
+
+        Yields:
+            BleScanFilter: candidate filter
+        """
+        yield from self._wildcards
+        dev, adv = data
+        if self._mac_addr:
+            yield from self._mac_addr.get(dev.address, ())
+        if self._local_name:
+            yield from self._local_name.get(adv.local_name, ())
+        if self._service_uuid:
+            for service_uuid in adv.service_data:
+                yield from self._service_uuid.get(service_uuid, ())
+        if self._company_code:
+            for company_code in adv.manufacturer_data:
+                yield from self._company_code.get(company_code, ())
+
+    def is_match(self, data: BleScanData) -> bool:
+        """is BleScanData matche to any filter
+
+        Args:
+            data (BleScanData): BleScanData
+
+        Returns:
+            bool: True is matching
+        """
+        payload_hex = PayloadHex(data[1]) if self._regex else None
+        return any(f.is_match(data, payload_hex) for f in self.candidates(data))
+
+
 class CustomQueryset(models.QuerySet):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._matcher = None
+
+    @property
+    def matcher(self) -> FilterMatcher:
+        """FilterMatcher compiled from this queryset.
+
+        It is built once, so reload the queryset when filters change.
+        """
+        if self._matcher is None:
+            self._matcher = FilterMatcher(self)
+        return self._matcher
+
+    def for_event(self, name: str) -> 'CustomQueryset':
+        """filters used by a scan event
+
+        Args:
+            name (str): scan event name
+
+        Returns:
+            CustomQueryset: filters bound to the event and filters bound to no event
+        """
+        return self.filter(models.Q(events__isnull=True) | models.Q(events=name)).distinct()
+
     def filter_data(self, data_list: typ.List[BleScanData]) -> typ.List[BleScanData]:
         """get BleScanData list that matches BleScanFilters
 
@@ -48,62 +241,353 @@ class CustomQueryset(models.QuerySet):
             typ.List[BleScanData]:
                 get BleScanData list that matches BleScanFilters
                 return [] if filter is [].
+                each BleScanData is returned once even if some filters match it.
         """
+        matcher = self.matcher
+        if not len(matcher):
+            return []
         res = [data
-               for f in self
                for data in data_list
-               if f.is_match(data)]
+               if matcher.is_match(data)]
+        if metrics.enabled:
+            FILTERED.inc(len(data_list))
+            MATCHED.inc(len(res))
 
         return res
 
-    @transaction.atomic
-    def create_data(self, data_list: typ.List[BleScanData]) -> 'models.QuerySet[BleScanResult]':
+    def create_data(self, data_list: typ.List[BleScanData],
+                    dedup: typ.Optional[Deduplicator] = None,
+                    received_at: typ.Optional[typ.Sequence[datetime.datetime]] = None,
+                    decoders: typ.Optional[DecoderRegistry] = None,
+                    presence: typ.Optional[PresenceTracker] = None,
+                    smoother: typ.Optional[RssiSmoother] = None,
+                    latest: bool = False) -> 'models.QuerySet[BleScanResult]':
         """save result that matches BleScanFilters
 
         Args:
             data_list (typ.List[BleScanData]): BleScanData list
+            dedup (typ.Optional[Deduplicator]): suppress repeated result if not None
+            received_at (typ.Optional[typ.Sequence[datetime.datetime]]):
+                received datetime of each BleScanData. None is now.
+            decoders (typ.Optional[DecoderRegistry]): save decoded fields to BleScanDecoded if not None
+            presence (typ.Optional[PresenceTracker]): save enter/leave of devices to BlePresence if not None
+            smoother (typ.Optional[RssiSmoother]): save smoothed rssi to rssi_smoothed if not None
+            latest (bool): upsert the last advertising data of each device to BleDeviceLatest
         """
-        received_at = timezone.now()
+        started = time.perf_counter()
+        try:
+            try:
+                results = self._create_data(data_list, dedup, received_at, decoders, presence, smoother, latest)
+            except IntegrityError:
+                # cached device may be deleted by other process.
+                device_cache.clear()
+                results = self._create_data(data_list, dedup, received_at, decoders, presence, smoother, latest)
+        except DatabaseError:
+            if metrics.enabled:
+                DB_ERRORS.inc()
+            raise
+        if metrics.enabled:
+            CREATE_SECONDS.observe(time.perf_counter() - started)
+            BATCH_SIZE.observe(len(data_list))
+            CREATED.inc(len(results))
+        return results
+
+    @transaction.atomic
+    def _create_data(self, data_list: typ.List[BleScanData],
+                     dedup: typ.Optional[Deduplicator] = None,
+                     received_at: typ.Optional[typ.Sequence[datetime.datetime]] = None,
+                     decoders: typ.Optional[DecoderRegistry] = None,
+                     presence: typ.Optional[PresenceTracker] = None,
+                     smoother: typ.Optional[RssiSmoother] = None,
+                     latest: bool = False) -> 'models.QuerySet[BleScanResult]':
+        now = timezone.now()
+        # filter_data returns the given objects, so look up their datetime by id.
+        received = None if received_at is None else {id(data): at for data, at in zip(data_list, received_at)}
         filter_data = self.filter_data(data_list)
-        addrs = set([dev.address for dev, _ in filter_data])
-        devs = {addr: BleScanDevice.objects.get_or_create(mac_addr=addr)[0]
-                for addr in addrs}
+        devs = {addr: BleScanDevice(mac_addr=addr) for addr in dict.fromkeys(dev.address for dev, _ in filter_data)}
+        addrs = device_cache.missing(devs)
+        if addrs:
+            BleScanDevice.objects.bulk_create(
+                [BleScanDevice(mac_addr=addr) for addr in addrs],
+                ignore_conflicts=True,
+            )
+            transaction.on_commit(lambda: device_cache.add(addrs))
+        if presence is not None:
+            # every advertising data is seen, even if suppressed by dedup.
+            transitions, presence_staged = presence.check(
+                (data[0].address, (now if received is None else received[id(data)]).timestamp(), data[1].rssi)
+                for data in filter_data)
+            BlePresence.objects.save_transitions(transitions, presence.event)
+            # retried batches are checked against the same states.
+            transaction.on_commit(lambda: presence.commit(presence_staged))
+
+        # every advertising data is smoothed, even if suppressed by dedup.
+        smoothed = repeat(None)
+        if smoother is not None:
+            smoothed, smoother_staged = smoother.check((dev.address, adv.rssi) for dev, adv in filter_data)
+            transaction.on_commit(lambda: smoother.commit(smoother_staged))
 
         scan_results = []
-        for (dev, adv) in filter_data:
+        # address -> (received datetime, advertising data, smoothed rssi)
+        states: typ.Dict[str, tuple] = {}
+        for data, rssi_smoothed in zip(filter_data, smoothed):
+            dev, adv = data
+            at = now if received is None else received[id(data)]
+            # every advertising data is the latest, even if suppressed by dedup.
+            if latest and (dev.address not in states or states[dev.address][0] <= at):
+                states[dev.address] = (at, adv, rssi_smoothed)
             scan_results += [
                 # for manufacturer_data
                 BleScanResult(
-                    received_at=received_at,
+                    received_at=at,
                     device=devs[dev.address],
                     local_name=adv.local_name,
                     company_code=company_code,
                     manufacturer_data=adv.manufacturer_data[company_code],
                     tx_power=adv.tx_power,
                     rssi=adv.rssi,
+                    rssi_smoothed=rssi_smoothed,
                 ) for company_code in adv.manufacturer_data
             ] + [
                 # for service_data
                 BleScanResult(
-                    received_at=received_at,
+                    received_at=at,
                     device=devs[dev.address],
                     local_name=adv.local_name,
                     service_uuid=service_uuid,
                     service_data=adv.service_data[service_uuid],
                     tx_power=adv.tx_power,
                     rssi=adv.rssi,
+                    rssi_smoothed=rssi_smoothed,
                 ) for service_uuid in adv.service_data
             ]
-        return BleScanResult.objects.bulk_create(
-            scan_results,
-            batch_size=5000,
-        )
+        if dedup is not None:
+            keeps, staged = dedup.check(
+                (((r.device_id, r.company_code, r.service_uuid),
+                  r.manufacturer_data if r.service_uuid is None else r.service_data,
+                  r.rssi) for r in scan_results),
+                now.timestamp())
+            scan_results = list(compress(scan_results, keeps))
+            transaction.on_commit(lambda: dedup.commit(keeps, staged))
+        if received is not None and scan_results:
+            # imported results are older than saved ones. see ResultQueryset.cutoff_id.
+            BleScanResult.objects.mark_unordered()
+        if decoders is not None:
+            # decoded fields refer to the ids of results.
+            results = BleScanResult.objects.bulk_create(scan_results, batch_size=5000)
+            BleScanDecoded.objects.create_decoded(results, decoders)
+        else:
+            results = BleScanResult.objects.insert(scan_results)
+        if states:
+            BleDeviceLatest.objects.upsert(
+                (BleDeviceLatest.from_data(devs[addr], *state) for addr, state in states.items()),
+                # imported data may be older than saved states.
+                skip_older=received is not None)
+        return results
 
 
 class CustomManager(models.Manager.from_queryset(CustomQueryset)):
     pass
 
 
+class ResultQueryset(models.QuerySet):
+
+    DEFAULT_CHUNK_SIZE = 10000
+
+    def unordered_id(self) -> int:
+        """get the first id which may be saved out of received order, ex. by ble_import
+
+        Returns:
+            int: first unordered id, 0 if ids increase with received_at.
+        """
+        return (BleScanVersion.objects.using(self.db).filter(name=BleScanResult.UNORDERED)
+                .values_list('version', flat=True).first() or 0)
+
+    def mark_unordered(self):
+        """record that results saved from now may be out of received order
+
+        Call it in the transaction saving results with given received datetimes.
+        The first unordered id is kept, so it is one query after the first call.
+        """
+        versions = BleScanVersion.objects.using(self.db)
+        if versions.filter(name=BleScanResult.UNORDERED).exists():
+            return
+        last = self.aggregate(hi=models.Max('id'))['hi'] or 0
+        versions.get_or_create(name=BleScanResult.UNORDERED, defaults={'version': last + 1})
+
+    def insert(self, objs: typ.List['BleScanResult']) -> typ.List['BleScanResult']:
+        """save results like bulk_create, but ids are not returned
+
+        bulk_create prepares every field of every object and is the bottleneck of the scanner at high rates.
+        Here a value is prepared once per field and batch, ex. received_at and device of live results.
+
+        Args:
+            objs (typ.List[BleScanResult]): unsaved results
+
+        Returns:
+            typ.List[BleScanResult]: given results whose id is still None
+        """
+        connection = connections[self.db]
+        fields = [f for f in self.model._meta.concrete_fields if not f.primary_key]
+        quote = connection.ops.quote_name
+        placeholders = ['%s'] * len(fields)
+        batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+        with connection.cursor() as cursor:
+            for start in range(0, len(objs), batch_size):
+                batch = objs[start:start + batch_size]
+                prepared = [{} for _ in fields]
+                params = []
+                for obj in batch:
+                    for field, cache in zip(fields, prepared):
+                        value = getattr(obj, field.attname)
+                        try:
+                            params.append(cache[value])
+                        except KeyError:
+                            params.append(cache.setdefault(value, field.get_db_prep_save(value, connection)))
+                        except TypeError:
+                            # unhashable, ex. bytearray.
+                            params.append(field.get_db_prep_save(value, connection))
+                cursor.execute(
+                    f'INSERT INTO {quote(self.model._meta.db_table)} ({", ".join(quote(f.column) for f in fields)}) '
+                    + connection.ops.bulk_insert_sql(fields, [placeholders] * len(batch)),
+                    params)
+        return objs
+
+    def _bounds(self) -> typ.Tuple[int, int]:
+        bounds = self.aggregate(lo=models.Min('id'), hi=models.Max('id'))
+        if bounds['lo'] is None:
+            return 0, 0
+        return bounds['lo'], bounds['hi'] + 1
+
+    def _search_id(self, before: datetime.datetime, lo: int, hi: int) -> int:
+        # first id in [lo, hi) received at or after `before`, or hi.
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = self.filter(id__gte=mid).order_by('id').values_list('id', 'received_at').first()
+            if row is None or row[1] >= before:
+                hi = mid
+            else:
+                lo = row[0] + 1
+        return lo
+
+    def cutoff_id(self, before: datetime.datetime) -> int:
+        """get an id which results received before `before` are less than
+
+        It is searched by primary key in O(log n) queries,
+        because id increases with received_at.
+        After results are saved out of order (see unordered_id), it is the last id + 1,
+        so filter received_at, too.
+
+        Args:
+            before (datetime.datetime): cutoff datetime
+
+        Returns:
+            int: first id received at or after `before`, 0 if empty.
+        """
+        lo, hi = self._bounds()
+        if self.unordered_id():
+            return hi
+        return self._search_id(before, lo, hi)
+
+    def start_id(self, start: datetime.datetime) -> int:
+        """get an id which results received at or after `start` are equal to or greater than
+
+        It is searched like cutoff_id in ids saved in received order.
+
+        Args:
+            start (datetime.datetime): start datetime
+
+        Returns:
+            int: first id received at or after `start`, 0 if empty.
+        """
+        lo, hi = self._bounds()
+        unordered = self.unordered_id()
+        return self._search_id(start, lo, min(hi, unordered) if unordered else hi)
+
+    def prune(self,
+              before: datetime.datetime,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              max_chunks: typ.Optional[int] = None,
+              archive: typ.Optional[typ.Callable[['models.QuerySet[BleScanResult]'], typ.Any]] = None) -> int:
+        """delete results received before `before` in chunks
+
+        Each chunk is deleted by primary key range in its own transaction,
+        so the table is never locked by one giant DELETE.
+
+        Args:
+            before (datetime.datetime): cutoff datetime
+            chunk_size (int): max ids deleted at once
+            max_chunks (typ.Optional[int]): max chunks deleted by this call. None is unlimited.
+            archive (typ.Optional[typ.Callable]): called with each chunk before it is deleted
+
+        Returns:
+            int: count of deleted results
+        """
+        cutoff = self.cutoff_id(before)
+        lo = self.filter(id__lt=cutoff, received_at__lt=before).aggregate(lo=models.Min('id'))['lo']
+        deleted = chunks = 0
+        while lo is not None and lo < cutoff and (max_chunks is None or chunks < max_chunks):
+            hi = min(lo + chunk_size, cutoff)
+            with transaction.atomic(using=self.db):
+                chunk = self.filter(id__gte=lo, id__lt=hi, received_at__lt=before)
+                if archive is not None:
+                    archive(chunk.order_by('id'))
+                # BleScanDecoded has no foreign key constraint not to slow down this delete.
+                BleScanDecoded.objects.using(self.db).delete_results(chunk)
+                deleted += chunk.delete()[0]
+            chunks += 1
+            lo = hi
+        return deleted
+
+    def rssi_series(self) -> typ.Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """get results ordered by received datetime as arrays for django_bleak.utils.rssi. numpy is required.
+
+        Returns:
+            typ.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+                received unix time, rssi[dBm] and tx power[dBm] (nan if null)
+        """
+        return rssi_arrays(self.order_by('received_at', 'id')
+                           .values_list('received_at', 'rssi', 'tx_power')
+                           .iterator(chunk_size=self.DEFAULT_CHUNK_SIZE))
+
+    def stream(self,
+               after_id: int = 0,
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               fields: typ.Sequence[str] = ()) -> typ.Iterator[typ.List[typ.Dict[str, typ.Any]]]:
+        """iterate results in chunks ordered by id with constant memory
+
+        Each chunk is fetched by keyset pagination of id,
+        so no cursor or transaction is held across chunks,
+        and it can be resumed from the last id.
+
+        Args:
+            after_id (int): results whose id is greater than this are iterated
+            chunk_size (int): max results fetched at once
+            fields (typ.Sequence[str]): fields of values(). () is all fields.
+
+        Yields:
+            typ.List[typ.Dict[str, typ.Any]]: chunk of values, device_id is formatted by format_mac_addr
+        """
+        if fields and 'id' not in fields:
+            fields = ('id', *fields)
+        qs = self.order_by('id').values(*fields)
+        while True:
+            rows = list(qs.filter(id__gt=after_id)[:chunk_size])
+            if not rows:
+                break
+            for row in rows:
+                if row.get('device_id') is not None:
+                    row['device_id'] = format_mac_addr(row['device_id'])
+            yield rows
+            after_id = rows[-1]['id']
+            if len(rows) < chunk_size:
+                break
+
+
+class ResultManager(models.Manager.from_queryset(ResultQueryset)):
+    pass
+
+
 class BleScanFilter(models.Model):
 
     id = models.BigAutoField(
@@ -154,6 +638,24 @@ class BleScanFilter(models.Model):
         max_length=1024,
         re_flags=re.IGNORECASE)
 
+    manufacturer_prefix = models.CharField(
+        verbose_name=_('prefix of manufacturer_data'),
+        help_text=_('hex string. ex. 0215 for iBeacon'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=64,
+        validators=[hex_validator])
+
+    manufacturer_mask = models.CharField(
+        verbose_name=_('mask of manufacturer_data prefix'),
+        help_text=_('hex string as long as prefix. null compares all bits. ex. FF00'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=64,
+        validators=[hex_validator])
+
     service_uuid = models.UUIDField(
         verbose_name=_('service uuid'),
         help_text=r'01234567-0123-0123-0123-0123456789AB',
@@ -170,6 +672,24 @@ class BleScanFilter(models.Model):
         max_length=1024,
         re_flags=re.IGNORECASE)
 
+    service_prefix = models.CharField(
+        verbose_name=_('prefix of service_data'),
+        help_text=_('hex string. ex. 00 for Eddystone-UID'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=64,
+        validators=[hex_validator])
+
+    service_mask = models.CharField(
+        verbose_name=_('mask of service_data prefix'),
+        help_text=_('hex string as long as prefix. null compares all bits. ex. F0'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=64,
+        validators=[hex_validator])
+
     rssi_min = models.IntegerField(
         verbose_name=_('rssi min[dBm]'),
         help_text='default -100[dBm]',
@@ -184,16 +704,36 @@ class BleScanFilter(models.Model):
         validators=[MinValueValidator(-100),
                     MaxValueValidator(0)])
 
+    events = models.ManyToManyField(
+        'BleScanEvent',
+        verbose_name=_('scan events'),
+        help_text=_('empty means all scan events.'),
+        related_name='filters',
+        blank=True)
+
     objects = CustomManager()
 
     def __str__(self):
         return f'{self.id}: {self.note or "-"}'
 
-    def is_match(self, data: BleScanData) -> bool:
+    def clean(self):
+        for prefix, mask in (('manufacturer_prefix', 'manufacturer_mask'), ('service_prefix', 'service_mask')):
+            if getattr(self, mask) and len(getattr(self, mask)) != len(getattr(self, prefix) or ''):
+                raise ValidationError({mask: _('mask must be as long as prefix.')})
+
+    @cached_property
+    def prefixes(self) -> typ.Tuple[typ.Optional[BytesPrefix], typ.Optional[BytesPrefix]]:
+        """compiled manufacturer_data and service_data prefixes"""
+        return tuple(BytesPrefix(prefix, mask) if prefix else None
+                     for prefix, mask in ((self.manufacturer_prefix, self.manufacturer_mask),
+                                          (self.service_prefix, self.service_mask)))
+
+    def is_match(self, data: BleScanData, payload_hex: typ.Optional[PayloadHex] = None) -> bool:
         """is BleScanData matche to filters
 
         Args:
             data (BleScanData): BleScanData
+            payload_hex (typ.Optional[PayloadHex]): hex strings shared by filters. None is converted here.
 
         Returns:
             bool: True is matching
@@ -205,16 +745,38 @@ class BleScanFilter(models.Model):
             return False
         if (self.company_code is not None) and (self.company_code not in adv.manufacturer_data.keys()):
             return False
-        if self.manufacturer_data and all([self.manufacturer_data.match(v.hex()) is None
-                                           for v in adv.manufacturer_data.values()]):
-            return False
         if self.service_uuid and self.service_uuid not in adv.service_data.keys():
             return False
-        if self.service_data and all([self.service_data.match(v.hex()) is None
-                                      for v in adv.service_data.values()]):
-            return False
         if not (self.rssi_min <= adv.rssi <= self.rssi_max):
             return False
+        # compare bytes before regex. for-else stops at the first matched payload.
+        manufacturer_prefix, service_prefix = self.prefixes
+        if manufacturer_prefix:
+            for v in adv.manufacturer_data.values():
+                if manufacturer_prefix.match(v):
+                    break
+            else:
+                return False
+        if service_prefix:
+            for v in adv.service_data.values():
+                if service_prefix.match(v):
+                    break
+            else:
+                return False
+        if self.manufacturer_data:
+            match = self.manufacturer_data.match
+            for v in payload_hex.manufacturer_data if payload_hex else [v.hex() for v in adv.manufacturer_data.values()]:
+                if match(v):
+                    break
+            else:
+                return False
+        if self.service_data:
+            match = self.service_data.match
+            for v in payload_hex.service_data if payload_hex else [v.hex() for v in adv.service_data.values()]:
+                if match(v):
+                    break
+            else:
+                return False
 
         return True
 
@@ -224,9 +786,49 @@ class BleScanFilter(models.Model):
         db_table = 'django_bleak_blescanfilter'
 
 
+class EventQueryset(models.QuerySet):
+
+    def heartbeat(self, name: str, processed: int, queue_depth: int) -> int:
+        """save that the scanner of the scan event is alive.
+        update() does not bump BleScanVersion, so scanners do not reload.
+
+        Args:
+            name (str): scan event name
+            processed (int): advertising data processed by the scanner
+            queue_depth (int): advertising data waiting for saving
+
+        Returns:
+            int: updated count
+        """
+        return self.filter(name=name, pid__isnull=False).update(
+            last_heartbeat=timezone.now(), processed=processed, queue_depth=queue_depth)
+
+    def stalled(self, now: typ.Optional[datetime.datetime] = None) -> typ.List['BleScanEvent']:
+        """get scan events whose scanner stopped sending heartbeats, in one query
+
+        Args:
+            now (typ.Optional[datetime.datetime]): current time
+
+        Returns:
+            typ.List[BleScanEvent]: scan events
+        """
+        now = now or timezone.now()
+        candidates = self.filter(
+            pid__isnull=False,
+            last_heartbeat__lt=now - datetime.timedelta(seconds=BleScanEvent.MIN_HEARTBEAT_TIMEOUT))
+        return [event for event in candidates if not event.is_beating(now)]
+
+
+class EventManager(models.Manager.from_queryset(EventQueryset)):
+    pass
+
+
 class BleScanEvent(models.Model):
 
     DEFAULT_INTERVAL = 3.0
+    # heartbeats missed before a scanner is stalled.
+    HEARTBEAT_MISSES = 3
+    MIN_HEARTBEAT_TIMEOUT = 10.0
 
     class ModeChoices(models.TextChoices):
         SEQUENTIAL = 'seq', _('Sequential')
@@ -269,6 +871,32 @@ class BleScanEvent(models.Model):
         default=ModeChoices.INTERVAL,
         max_length=3)
 
+    adapter = models.CharField(
+        verbose_name=_('bluetooth adapter'),
+        help_text=_('hci0. null means default adapter.'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=32)
+
+    last_heartbeat = models.DateTimeField(
+        verbose_name=_('last heartbeat'),
+        help_text=_('saved by the scanner every interval. null means no heartbeat.'),
+        null=True,
+        blank=True,
+        default=None)
+
+    processed = models.BigIntegerField(
+        verbose_name=_('processed advertising data'),
+        default=0)
+
+    queue_depth = models.IntegerField(
+        verbose_name=_('queue depth'),
+        help_text=_('advertising data waiting for saving.'),
+        default=0)
+
+    objects = EventManager()
+
     def __str__(self):
         pid_info = self.pid and f'{self.pid}@{self.create_time}'
         return f'{self.name}: {self.is_enabled}/{pid_info or "-"}/{self.scan_mode}/{self.interval:.3f}sec'
@@ -279,29 +907,55 @@ class BleScanEvent(models.Model):
         ERROR = "Error"
         ZOMBIE = "Zombie"
         KILLED = "Killed"
+        STALLED = "Stalled"
+
+    @property
+    def heartbeat_timeout(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=max(self.interval * self.HEARTBEAT_MISSES, self.MIN_HEARTBEAT_TIMEOUT))
+
+    def is_beating(self, now: typ.Optional[datetime.datetime] = None) -> bool:
+        """is the last heartbeat in heartbeat_timeout
+
+        Args:
+            now (typ.Optional[datetime.datetime]): current time
+
+        Returns:
+            bool: "True" is beating
+        """
+        if self.last_heartbeat is None:
+            return False
+        return (now or timezone.now()) - self.last_heartbeat <= self.heartbeat_timeout
 
     @property
     def status(self) -> 'Status':
         """Get Process Status
 
+        The process is probed only if the heartbeat is not fresh,
+        so listing scan events does not access processes.
+
         Returns: result code below
-            No | pid   | is_running | is_enabled | Return
-            01 | null  |            |          t | Error
-            02 | null  |            |          f | Waitting
-            03 | reuse |          f |            | Killed
-            04 | me    |          t |          f | Zombie
-            05 | me    |          t |          t | Running
+            No | pid   | heartbeat | is_running | is_enabled | Return
+            01 | null  |           |            |          t | Error
+            02 | null  |           |            |          f | Waitting
+            03 | me    | fresh     |            |          f | Zombie
+            04 | me    | fresh     |            |          t | Running
+            05 | reuse | not fresh |          f |            | Killed
+            06 | me    | stale     |          t |            | Stalled
+            07 | me    | null      |          t |          f | Zombie
+            08 | me    | null      |          t |          t | Running
         """
-        # saved process
-        proc = psutil.Process()
-        proc._init(self.pid, _ignore_nsp=True)
-        proc._create_time = self.create_time
-        status = {None: {True: self.Status.ERROR,
-                         False: self.Status.WAITTING}[self.is_enabled]}.get(self.pid)\
-            or {True: {True: self.Status.RUNNING,
-                       False: self.Status.ZOMBIE}[self.is_enabled],
-                False: self.Status.KILLED}[proc.is_running()]
-        return status
+        if self.pid is None:
+            return self.Status.ERROR if self.is_enabled else self.Status.WAITTING
+        if not self.is_beating():
+            # saved process
+            proc = psutil.Process()
+            proc._init(self.pid, _ignore_nsp=True)
+            proc._create_time = self.create_time
+            if not proc.is_running():
+                return self.Status.KILLED
+            if self.last_heartbeat is not None:
+                return self.Status.STALLED
+        return self.Status.RUNNING if self.is_enabled else self.Status.ZOMBIE
 
     @property
     def is_running(self) -> bool:
@@ -310,7 +964,7 @@ class BleScanEvent(models.Model):
         Returns:
             bool: "True" is running
         """
-        return self.status in [self.Status.RUNNING, self.Status.ZOMBIE]
+        return self.status in [self.Status.RUNNING, self.Status.ZOMBIE, self.Status.STALLED]
 
     class Meta:
         verbose_name = _('ble scan event')
@@ -344,6 +998,9 @@ class BleScanDevice(models.Model):
 
 class BleScanResult(models.Model):
 
+    # BleScanVersion name of the first id saved out of received order.
+    UNORDERED = 'unordered'
+
     id = models.BigAutoField(
         primary_key=True)
 
@@ -399,6 +1056,14 @@ class BleScanResult(models.Model):
     rssi = models.FloatField(
         verbose_name=_('rssi[dBm]'))
 
+    rssi_smoothed = models.FloatField(
+        verbose_name=_('smoothed rssi[dBm]'),
+        null=True,
+        blank=True,
+        default=None)
+
+    objects = ResultManager()
+
     def __str__(self):
         return f'{self.device.mac_addr}: {self.received_at}'
 
@@ -417,4 +1082,495 @@ class BleScanResult(models.Model):
                          name='bsr_dev_rec_com_idx'),
             models.Index(fields=['device', 'received_at', 'service_uuid'],
                          name='bsr_dev_rec_ser_idx'),
+            # keyset pagination of admin
+            models.Index(fields=['received_at', 'id'],
+                         name='bsr_rec_id_idx'),
+        ]
+
+
+class DecodedQueryset(models.QuerySet):
+
+    def create_decoded(self, results: typ.Sequence[BleScanResult],
+                       decoders: DecoderRegistry) -> typ.List['BleScanDecoded']:
+        """decode payloads of saved results and save the fields
+
+        Args:
+            results (typ.Sequence[BleScanResult]): saved results
+            decoders (DecoderRegistry): decoders
+
+        Returns:
+            typ.List[BleScanDecoded]: saved fields
+        """
+        if any(r.id is None for r in results):
+            # the database can not return ids from bulk_create, ex. MySQL.
+            logger.warning(f'decoded fields of {len(results)} results are not saved. '
+                           f'{connections[self.db].vendor} does not return ids from bulk_create.')
+            return []
+        entries = [(r.company_code, r.service_uuid,
+                    r.manufacturer_data if r.service_uuid is None else r.service_data)
+                   for r in results]
+        objs = [
+            self.model(result_id=r.id, format=format, name=name,
+                       **({'text': value} if isinstance(value, str) else {'value': value}))
+            for r, decoded in zip(results, decoders.decode(entries))
+            for format, fields in decoded
+            for name, value in fields.items()
+        ]
+        return self.bulk_create(objs, batch_size=5000)
+
+    def delete_results(self, results: 'models.QuerySet[BleScanResult]') -> int:
+        """delete fields of results, before the results are deleted
+
+        Args:
+            results (models.QuerySet[BleScanResult]): results to be deleted
+
+        Returns:
+            int: count of deleted fields
+        """
+        return self.filter(result__in=results.values('id')).delete()[0]
+
+    def prune_orphans(self) -> int:
+        """delete fields of results deleted without prune, ex. by dropping partitions.
+        fields of results compacted into BleScanBucket are kept.
+
+        Returns:
+            int: count of deleted fields
+        """
+        from .bucket import BleScanBucket
+        los = [BleScanResult.objects.using(self.db).aggregate(lo=models.Min('id'))['lo'],
+               BleScanBucket.objects.using(self.db).aggregate(lo=models.Min('first_id'))['lo']]
+        lo = min((lo for lo in los if lo is not None), default=None)
+        orphans = self if lo is None else self.filter(result_id__lt=lo)
+        return orphans.delete()[0]
+
+
+class DecodedManager(models.Manager.from_queryset(DecodedQueryset)):
+    pass
+
+
+class BleScanDecoded(models.Model):
+
+    id = models.BigAutoField(
+        primary_key=True)
+
+    result = models.ForeignKey(
+        verbose_name=_('relational result'),
+        to=BleScanResult,
+        related_name='decoded',
+        # deleted with results by ResultQueryset.prune, admin and deleting devices.
+        on_delete=models.DO_NOTHING,
+        db_constraint=False)
+
+    format = models.CharField(
+        verbose_name=_('format'),
+        help_text='ibeacon',
+        max_length=32)
+
+    name = models.CharField(
+        verbose_name=_('field name'),
+        help_text='major',
+        max_length=32)
+
+    value = models.FloatField(
+        verbose_name=_('numeric value'),
+        null=True,
+        blank=True,
+        default=None)
+
+    text = models.CharField(
+        verbose_name=_('text value'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=64)
+
+    objects = DecodedManager()
+
+    def __str__(self):
+        return f'{self.result_id}: {self.format}.{self.name}={self.text if self.value is None else self.value}'
+
+    class Meta:
+        verbose_name = _('ble scan decoded field')
+        verbose_name_plural = _('ble scan decoded fields')
+        db_table = 'django_bleak_blescandecoded'
+        indexes = [
+            models.Index(fields=['format', 'name', 'value'],
+                         name='bsd_for_nam_val_idx'),
+            models.Index(fields=['format', 'name', 'text'],
+                         name='bsd_for_nam_tex_idx'),
+        ]
+
+
+def _datetime(timestamp: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+
+
+class PresenceQueryset(models.QuerySet):
+
+    def save_transitions(self, transitions: typ.Sequence[Transition],
+                         event: typ.Optional[str] = None) -> typ.List['BlePresence']:
+        """save enter as a new presence, and leave as left datetime of the presence
+
+        Args:
+            transitions (typ.Sequence[Transition]): transitions of PresenceTracker
+            event (typ.Optional[str]): scan event name
+
+        Returns:
+            typ.List[BlePresence]: created or updated presences
+        """
+        # state id -> (presence, state)
+        created: typ.Dict[int, typ.Tuple[BlePresence, PresenceState]] = {}
+        updated: typ.List[typ.Tuple[BlePresence, PresenceState]] = []
+        for kind, key, state in transitions:
+            if kind == Transition.Kind.ENTER:
+                created[id(state)] = (self.model(event_id=event, device_id=key,
+                                                 entered_at=_datetime(state.first_seen)), state)
+                continue
+            if id(state) in created:
+                obj = created[id(state)][0]
+            elif state.saved_id is not None:
+                obj = self.model(id=state.saved_id)
+                updated.append((obj, state))
+            else:
+                # the database can not return ids from bulk_create.
+                self.filter(event_id=event, device_id=key, entered_at=_datetime(state.first_seen),
+                            left_at__isnull=True).update(left_at=_datetime(state.last_seen),
+                                                         rssi=state.rssi, count=state.count)
+                continue
+            obj.left_at = _datetime(state.last_seen)
+        # rssi and count at the end of the batch.
+        for obj, state in chain(created.values(), updated):
+            obj.rssi = state.rssi
+            obj.count = state.count
+        self.bulk_create([obj for obj, _ in created.values()], batch_size=5000)
+        for obj, state in created.values():
+            state.saved_id = obj.id
+        self.bulk_update([obj for obj, _ in updated], ['left_at', 'rssi', 'count'], batch_size=5000)
+        return [obj for obj, _ in chain(created.values(), updated)]
+
+    def present(self, at: typ.Optional[datetime.datetime] = None) -> 'models.QuerySet[BlePresence]':
+        """get presences of devices present at `at`
+
+        Args:
+            at (typ.Optional[datetime.datetime]): datetime. None is now.
+
+        Returns:
+            models.QuerySet[BlePresence]: presences
+        """
+        if at is None:
+            return self.filter(left_at__isnull=True)
+        return self.filter(models.Q(left_at__isnull=True) | models.Q(left_at__gte=at), entered_at__lte=at)
+
+    def close_open(self, event: typ.Optional[str] = None) -> int:
+        """close presences left open by a stopped process at the last saved result of the device
+
+        The last seen datetime is not saved until leave, so the last result received since entered is used.
+        Results suppressed by dedup are not saved, so it may be earlier than the last seen datetime.
+
+        Args:
+            event (typ.Optional[str]): scan event name
+
+        Returns:
+            int: count of closed presences
+        """
+        last_received = (BleScanResult.objects
+                         .filter(device=models.OuterRef('device'), received_at__gte=models.OuterRef('entered_at'))
+                         .order_by('-received_at')
+                         .values('received_at')[:1])
+        return self.filter(event_id=event, left_at__isnull=True).update(
+            left_at=Coalesce(models.Subquery(last_received), models.F('entered_at')))
+
+
+class PresenceManager(models.Manager.from_queryset(PresenceQueryset)):
+    pass
+
+
+class BlePresence(models.Model):
+
+    id = models.BigAutoField(
+        primary_key=True)
+
+    event = models.ForeignKey(
+        verbose_name=_('relational event'),
+        to=BleScanEvent,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        default=None)
+
+    device = models.ForeignKey(
+        verbose_name=_('relational device'),
+        to=BleScanDevice,
+        on_delete=models.CASCADE)
+
+    entered_at = models.DateTimeField(
+        verbose_name=_('entered datetime'))
+
+    left_at = models.DateTimeField(
+        verbose_name=_('left datetime'),
+        help_text=_('last seen datetime. null while present.'),
+        null=True,
+        blank=True,
+        default=None)
+
+    rssi = models.FloatField(
+        verbose_name=_('smoothed rssi[dBm]'))
+
+    count = models.IntegerField(
+        verbose_name=_('count'))
+
+    objects = PresenceManager()
+
+    def __str__(self):
+        return f'{self.device_id}: {self.entered_at} - {self.left_at or ""}'
+
+    class Meta:
+        verbose_name = _('ble presence')
+        verbose_name_plural = _('ble presences')
+        db_table = 'django_bleak_blepresence'
+        indexes = [
+            models.Index(fields=['device', 'entered_at'],
+                         name='bp_dev_ent_idx'),
+            models.Index(fields=['left_at'],
+                         name='bp_lef_idx'),
         ]
+
+
+class LatestQueryset(models.QuerySet):
+
+    # seconds lookup() caches latest states
+    DEFAULT_CACHE_TIMEOUT = 5.0
+
+    def upsert(self, objs: typ.Iterable['BleDeviceLatest'], skip_older: bool = False) -> typ.List['BleDeviceLatest']:
+        """insert or update latest states in one statement
+
+        Args:
+            objs (typ.Iterable[BleDeviceLatest]): latest states, one per device
+            skip_older (bool): do not overwrite newer saved states, ex. when old data is imported
+
+        Returns:
+            typ.List[BleDeviceLatest]: saved states
+        """
+        objs = list(objs)
+        if skip_older and objs:
+            saved = {format_mac_addr(device_id): at for device_id, at in self.filter(
+                device__in=[obj.device_id for obj in objs]).values_list('device_id', 'received_at')}
+            objs = [obj for obj in objs if saved.get(format_mac_addr(obj.device_id), obj.received_at) <= obj.received_at]
+        if not objs:
+            return []
+        # MySQL updates by any unique key, and does not accept unique_fields.
+        features = connections[self.db].features
+        return self.bulk_create(
+            objs, batch_size=5000, update_conflicts=True,
+            unique_fields=['device'] if features.supports_update_conflicts_with_target else None,
+            update_fields=['received_at', 'local_name', 'company_code', 'manufacturer_data',
+                           'service_uuid', 'service_data', 'tx_power', 'rssi', 'rssi_smoothed'])
+
+    @staticmethod
+    def cache_key(addr: str) -> str:
+        return f'django_bleak:latest:{addr}'
+
+    def lookup(self,
+               devices: typ.Iterable[typ.Union[BleScanDevice, str]],
+               cache: typ.Optional[str] = None,
+               timeout: float = DEFAULT_CACHE_TIMEOUT) -> typ.Dict[str, 'BleDeviceLatest']:
+        """get latest states of devices by primary key in one query
+
+        Args:
+            devices (typ.Iterable[typ.Union[BleScanDevice, str]]): devices or mac addresses
+            cache (typ.Optional[str]): alias of CACHES. states are cached for timeout seconds if not None.
+            timeout (float): seconds states may be older than saved ones
+
+        Returns:
+            typ.Dict[str, BleDeviceLatest]: mac address -> latest state. devices never seen are not included.
+        """
+        addrs = [format_mac_addr(getattr(device, 'mac_addr', device)) for device in devices]
+        found: typ.Dict[str, typ.Optional[BleDeviceLatest]] = {}
+        if cache is not None:
+            keys = {self.cache_key(addr): addr for addr in addrs}
+            found = {keys[key]: obj for key, obj in caches[cache].get_many(keys).items()}
+        missing = [addr for addr in addrs if addr not in found]
+        if missing:
+            saved = {format_mac_addr(obj.device_id): obj for obj in self.filter(device__in=missing)}
+            # devices never seen are cached as None.
+            fetched = {addr: saved.get(addr) for addr in missing}
+            if cache is not None:
+                caches[cache].set_many({self.cache_key(addr): obj for addr, obj in fetched.items()}, timeout)
+            found.update(fetched)
+        return {addr: obj for addr, obj in found.items() if obj is not None}
+
+
+class LatestManager(models.Manager.from_queryset(LatestQueryset)):
+    pass
+
+
+class BleDeviceLatest(models.Model):
+
+    device = models.OneToOneField(
+        primary_key=True,
+        verbose_name=_('relational device'),
+        to=BleScanDevice,
+        related_name='latest',
+        on_delete=models.CASCADE)
+
+    received_at = models.DateTimeField(
+        verbose_name=_('received datetime'))
+
+    local_name = models.CharField(
+        verbose_name=_('local name'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=256)
+
+    company_code = models.IntegerField(
+        verbose_name=_('company code'),
+        help_text=_('first company code of the advertising data.'),
+        null=True,
+        blank=True,
+        default=None)
+
+    manufacturer_data = models.BinaryField(
+        verbose_name=_('manufacturer_data'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=256)
+
+    service_uuid = models.UUIDField(
+        verbose_name=_('service uuid'),
+        help_text=_('first service uuid of the advertising data.'),
+        null=True,
+        blank=True,
+        default=None)
+
+    service_data = models.BinaryField(
+        verbose_name=_('service_data'),
+        null=True,
+        blank=True,
+        default=None,
+        max_length=256)
+
+    tx_power = models.FloatField(
+        verbose_name=_('tx_power[dBm]'),
+        null=True,
+        blank=True,
+        default=None)
+
+    rssi = models.FloatField(
+        verbose_name=_('rssi[dBm]'))
+
+    rssi_smoothed = models.FloatField(
+        verbose_name=_('smoothed rssi[dBm]'),
+        null=True,
+        blank=True,
+        default=None)
+
+    objects = LatestManager()
+
+    def __str__(self):
+        return f'{self.device_id}: {self.received_at}'
+
+    @classmethod
+    def from_data(cls, device: BleScanDevice, received_at: datetime.datetime,
+                  adv: blk.AdvertisementData, rssi_smoothed: typ.Optional[float] = None) -> 'BleDeviceLatest':
+        """latest state of advertising data, not saved
+
+        Args:
+            device (BleScanDevice): device
+            received_at (datetime.datetime): received datetime
+            adv (blk.AdvertisementData): advertising data
+            rssi_smoothed (typ.Optional[float]): smoothed rssi
+
+        Returns:
+            BleDeviceLatest: latest state
+        """
+        company_code = next(iter(adv.manufacturer_data), None)
+        service_uuid = next(iter(adv.service_data), None)
+        return cls(device=device, received_at=received_at, local_name=adv.local_name,
+                   company_code=company_code,
+                   manufacturer_data=None if company_code is None else adv.manufacturer_data[company_code],
+                   service_uuid=service_uuid,
+                   service_data=None if service_uuid is None else adv.service_data[service_uuid],
+                   tx_power=adv.tx_power, rssi=adv.rssi, rssi_smoothed=rssi_smoothed)
+
+    class Meta:
+        verbose_name = _('ble device latest state')
+        verbose_name_plural = _('ble device latest states')
+        db_table = 'django_bleak_bledevicelatest'
+
+
+class BleScanVersion(models.Model):
+
+    # changed by BleScanFilter, BleScanEvent and BleScanDevice.
+    SCANNER = 'scanner'
+
+    name = models.CharField(
+        primary_key=True,
+        verbose_name=_('version name'),
+        max_length=32)
+
+    version = models.BigIntegerField(
+        verbose_name=_('version'),
+        default=0)
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
+
+    @classmethod
+    def bump(cls, name: str):
+        """increment version
+
+        Args:
+            name (str): version name
+        """
+        if not cls.objects.filter(name=name).update(version=models.F('version') + 1):
+            cls.objects.get_or_create(name=name, defaults={'version': 1})
+
+    @classmethod
+    def get_version(cls, name: str) -> int:
+        """get version with one query
+
+        Args:
+            name (str): version name
+
+        Returns:
+            int: version, 0 if never bumped
+        """
+        return cls.objects.filter(name=name).values_list('version', flat=True).first() or 0
+
+    class Meta:
+        verbose_name = _('ble scan version')
+        verbose_name_plural = _('ble scan versions')
+        db_table = 'django_bleak_blescanversion'
+
+
+@receiver(post_save, sender=BleScanFilter)
+@receiver(post_delete, sender=BleScanFilter)
+@receiver(post_save, sender=BleScanEvent)
+@receiver(post_delete, sender=BleScanEvent)
+@receiver(post_delete, sender=BleScanDevice)
+def bump_scanner_version(sender, **kwargs):
+    # QuerySet.update() does not send signals, so call bump() after it.
+    BleScanVersion.bump(BleScanVersion.SCANNER)
+
+
+@receiver(m2m_changed, sender=BleScanFilter.events.through)
+def bump_scanner_version_m2m(sender, action: str, **kwargs):
+    if action.startswith('post_'):
+        BleScanVersion.bump(BleScanVersion.SCANNER)
+
+
+@receiver(post_delete, sender=BleScanDevice)
+def discard_device_cache(sender, instance: BleScanDevice, **kwargs):
+    device_cache.discard(format_mac_addr(instance.mac_addr))
+
+
+@receiver(pre_delete, sender=BleScanDevice)
+def delete_device_decoded(sender, instance: BleScanDevice, using: str, **kwargs):
+    # results are deleted by cascade, which does not collect BleScanDecoded.
+    from .bucket import BleScanBucket
+    decoded = BleScanDecoded.objects.using(using)
+    decoded.delete_results(BleScanResult.objects.using(using).filter(device=instance))
+    for bucket in BleScanBucket.objects.using(using).filter(device=instance).iterator(chunk_size=100):
+        decoded.filter(result_id__in=[row[0] for row in bucket.unpack()]).delete()
@@ -0,0 +1,105 @@
+
+import datetime
+import typing as typ
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class CommandQueryset(models.QuerySet):
+
+    # pending commands older than this mean ble_supervisor is not running.
+    DEFAULT_STALE = datetime.timedelta(seconds=30)
+
+    def enqueue(self, action: 'BleScanCommand.Action', events: typ.Iterable[str]) -> 'BleScanCommand':
+        """request ble_supervisor to start or stop scan events
+
+        Args:
+            action (BleScanCommand.Action): start or stop
+            events (typ.Iterable[str]): scan event names, scanned in one process if started
+
+        Returns:
+            BleScanCommand: queued command
+        """
+        return self.create(action=action, events=list(events))
+
+    def pending(self) -> 'models.QuerySet[BleScanCommand]':
+        """get commands not processed yet in queued order"""
+        return self.filter(processed_at__isnull=True).order_by('id')
+
+    def is_stale(self, stale: datetime.timedelta = DEFAULT_STALE) -> bool:
+        """is any command left pending for stale time
+
+        Args:
+            stale (datetime.timedelta): time ble_supervisor takes a command in
+
+        Returns:
+            bool: True if ble_supervisor seems not running
+        """
+        return self.pending().filter(created_at__lt=timezone.now() - stale).exists()
+
+
+class CommandManager(models.Manager.from_queryset(CommandQueryset)):
+    pass
+
+
+class BleScanCommand(models.Model):
+
+    class Action(models.TextChoices):
+        START = 'start', _('Start')
+        STOP = 'stop', _('Stop')
+
+    id = models.BigAutoField(
+        primary_key=True)
+
+    action = models.CharField(
+        verbose_name=_('action'),
+        choices=Action.choices,
+        max_length=8)
+
+    events = models.JSONField(
+        verbose_name=_('event names'),
+        help_text='["ScanEvent001", "ScanEvent002"]',
+        default=list)
+
+    created_at = models.DateTimeField(
+        verbose_name=_('created datetime'),
+        default=timezone.now)
+
+    processed_at = models.DateTimeField(
+        verbose_name=_('processed datetime'),
+        help_text=_('null means not processed yet.'),
+        null=True,
+        blank=True,
+        default=None)
+
+    error = models.TextField(
+        verbose_name=_('error'),
+        null=True,
+        blank=True,
+        default=None)
+
+    objects = CommandManager()
+
+    def __str__(self):
+        return f'{self.action}: {",".join(self.events)}'
+
+    def finish(self, error: typ.Optional[str] = None):
+        """mark processed
+
+        Args:
+            error (typ.Optional[str]): error message if failed
+        """
+        self.processed_at = timezone.now()
+        self.error = error
+        type(self).objects.filter(id=self.id).update(processed_at=self.processed_at, error=error)
+
+    class Meta:
+        verbose_name = _('ble scan command')
+        verbose_name_plural = _('ble scan commands')
+        db_table = 'django_bleak_blescancommand'
+        indexes = [
+            models.Index(fields=['processed_at', 'id'],
+                         name='bsc_pro_id_idx'),
+        ]
@@ -0,0 +1,46 @@
+
+import datetime
+import uuid
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.test import RequestFactory, TestCase
+from django_bleak.admin.filters import (CompanyCodeFilter, DeviceFilter,
+                                        ServiceUuidFilter)
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+UUID = uuid.UUID('0000180f-0000-1000-8000-00805f9b34fb')
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        other = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AC')
+        self.result = BleScanResult.objects.create(
+            received_at=BASE, device=dev, rssi=-60, company_code=76, service_uuid=UUID)
+        BleScanResult.objects.create(received_at=BASE, device=other, rssi=-60)
+
+    def queryset(self, filter_class, value):
+        request = RequestFactory().get('/')
+        model_admin = admin.site._registry[BleScanResult]
+        spec = filter_class(request, {filter_class.parameter_name: value}, BleScanResult, model_admin)
+        self.assertTrue(spec.has_output())
+        return spec.queryset(request, BleScanResult.objects.all())
+
+    def test_queryset(self):
+        for filter_class, value in ((DeviceFilter, ' 12-34-56-78-90-ab '),
+                                    (CompanyCodeFilter, '0x004c'),
+                                    (CompanyCodeFilter, '76'),
+                                    (ServiceUuidFilter, str(UUID).upper())):
+            with self.subTest(filter_class=filter_class, value=value):
+                self.assertEqual(list(self.queryset(filter_class, value)), [self.result])
+
+    def test_empty(self):
+        self.assertEqual(self.queryset(DeviceFilter, '').count(), 2)
+
+    def test_invalid(self):
+        for filter_class in (DeviceFilter, CompanyCodeFilter, ServiceUuidFilter):
+            with self.subTest(filter_class=filter_class), self.assertRaises(IncorrectLookupParameters):
+                self.queryset(filter_class, 'invalid')
@@ -0,0 +1,52 @@
+
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django_bleak.admin.pagination import EstimatedCountPaginator
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        self.dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=i), device=self.dev, rssi=-60)
+            for i in range(5)])
+
+    def test_count(self):
+        # sqlite has no statistics.
+        paginator = EstimatedCountPaginator(BleScanResult.objects.order_by('-id'), 2)
+        self.assertEqual(paginator.count, 5)
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertFalse(paginator.estimated)
+        self.assertFalse(paginator.capped)
+
+    @mock.patch.object(EstimatedCountPaginator, 'MAX_COUNT', 3)
+    def test_capped(self):
+        paginator = EstimatedCountPaginator(BleScanResult.objects.filter(device=self.dev).order_by('-id'), 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.capped)
+        self.assertEqual(paginator.num_pages, 2)
+
+    @mock.patch('django_bleak.admin.pagination.estimate_count', return_value=10 ** 7)
+    def test_estimated(self, estimate_count):
+        paginator = EstimatedCountPaginator(BleScanResult.objects.order_by('-id'), 2)
+        self.assertEqual(paginator.count, 10 ** 7)
+        self.assertTrue(paginator.estimated)
+        self.assertEqual(estimate_count.call_args.args[1], 'django_bleak_blescanresult')
+
+        # filtered queryset is not estimated.
+        paginator = EstimatedCountPaginator(BleScanResult.objects.filter(rssi=-60).order_by('-id'), 2)
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.estimated)
+
+    @mock.patch('django_bleak.admin.pagination.estimate_count', return_value=100)
+    def test_small_table(self, estimate_count):
+        # exact count if the estimate is small.
+        paginator = EstimatedCountPaginator(BleScanResult.objects.order_by('-id'), 2)
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.estimated)
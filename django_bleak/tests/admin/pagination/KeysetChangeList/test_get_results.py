@@ -0,0 +1,73 @@
+
+import datetime
+from urllib.parse import parse_qs
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django_bleak.admin.pagination import CURSOR_VAR
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.other = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AC')
+        # two results at the same time for each second.
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=i // 2),
+                          device=self.dev if i % 3 else self.other, rssi=-60, company_code=i % 2)
+            for i in range(10)])
+        self.model_admin = admin.site._registry[BleScanResult]
+        self.model_admin.list_per_page = 3
+
+    def tearDown(self):
+        self.model_admin.list_per_page = 100
+
+    def changelist(self, **params):
+        request = RequestFactory().get('/', params)
+        request.user = self.user
+        return self.model_admin.get_changelist_instance(request)
+
+    def test_get_results(self):
+        expected = list(BleScanResult.objects.order_by('-received_at', '-id'))
+        results = []
+        params = {}
+        while True:
+            cl = self.changelist(**params)
+            results.extend(cl.result_list)
+            if cl.next_url is None:
+                break
+            params = {k: v[0] for k, v in parse_qs(cl.next_url[1:]).items()}
+            self.assertIn(CURSOR_VAR, params)
+        self.assertEqual(results, expected)
+        self.assertEqual(cl.first_url, '?')
+
+    def test_filters(self):
+        cl = self.changelist(device='12-34-56-78-90-ac')
+        expected = list(BleScanResult.objects.filter(device=self.other).order_by('-received_at', '-id'))
+        self.assertEqual(cl.result_list, expected[:3])
+        self.assertEqual(cl.result_count, len(expected))
+        # filters are kept in the next page.
+        params = parse_qs(cl.next_url[1:])
+        self.assertEqual(params['device'], ['12-34-56-78-90-ac'])
+        cl = self.changelist(device='12-34-56-78-90-ac', company_code='0x1')
+        self.assertEqual(cl.result_list, [r for r in expected if r.company_code == 1])
+        self.assertIsNone(cl.next_url)
+
+    def test_queries(self):
+        # count, results with devices. no COUNT(*) of all rows and no query per row.
+        with self.assertNumQueries(2):
+            cl = self.changelist()
+            [str(r.device) for r in cl.result_list]
+
+    def test_invalid(self):
+        with self.assertRaises(IncorrectLookupParameters):
+            self.changelist(**{CURSOR_VAR: 'invalid'})
+        with self.assertRaises(IncorrectLookupParameters):
+            self.changelist(device='invalid')
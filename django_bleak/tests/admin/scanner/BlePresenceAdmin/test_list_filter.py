@@ -0,0 +1,41 @@
+import datetime
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django_bleak.models import BlePresence, BleScanDevice, BleScanEvent
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        for name in ('ScanEvent001', 'ScanEvent002'):
+            BleScanEvent.objects.create(name=name)
+        for mac_addr in ('12:34:56:78:90:AB', '12:34:56:78:90:CD'):
+            dev = BleScanDevice.objects.create(mac_addr=mac_addr)
+            for name in ('ScanEvent001', 'ScanEvent002'):
+                BlePresence.objects.create(event_id=name, device=dev, entered_at=BASE, rssi=-60, count=1)
+        self.model_admin = admin.site._registry[BlePresence]
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def changelist(self, **params):
+        request = RequestFactory().get('/', params)
+        request.user = self.user
+        return self.model_admin.get_changelist_instance(request)
+
+    def test_list_filter(self):
+        with CaptureQueriesContext(connection) as ctx:
+            cl = self.changelist(event='ScanEvent001', device='12-34-56-78-90-ab')
+            presences = list(cl.queryset)
+
+        self.assertEqual([(p.event_id, p.device_id) for p in presences], [('ScanEvent001', '12:34:56:78:90:AB')])
+        # choices of devices and events are not loaded.
+        self.assertFalse([q for q in ctx.captured_queries
+                          if 'FROM "django_bleak_blescandevice"' in q['sql'] or 'FROM "django_bleak_blescanevent"' in q['sql']])
+
+    def test_empty(self):
+        self.assertEqual(self.changelist().queryset.count(), 4)
@@ -0,0 +1,56 @@
+
+import os
+from unittest import mock
+
+import psutil
+
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from django_bleak.models import BleScanCommand, BleScanEvent
+
+
+@mock.patch('django_bleak.admin.scanner.messages')
+class Test(TestCase):
+
+    def setUp(self):
+        BleScanEvent.objects.create(name='ScanEvent001')
+        BleScanEvent.objects.create(name='ScanEvent002')
+        self.model_admin = admin.site._registry[BleScanEvent]
+        self.request = RequestFactory().post('/')
+
+    def test_run_scan_event(self, messages):
+        # returns without waiting for the scanner.
+        with self.assertNumQueries(3):
+            self.model_admin.run_scan_event(self.request, BleScanEvent.objects.all())
+        command = BleScanCommand.objects.get()
+        self.assertEqual((command.action, command.events), (BleScanCommand.Action.START, ['ScanEvent001', 'ScanEvent002']))
+        messages.info.assert_called_once()
+        messages.warning.assert_not_called()
+
+    def test_running(self, messages):
+        BleScanEvent.objects.create(name='ScanEvent003', is_enabled=True)
+        BleScanEvent.objects.filter(name='ScanEvent001').update(
+            is_enabled=True, pid=os.getpid(), create_time=psutil.Process().create_time(), last_heartbeat=timezone.now())
+        self.model_admin.run_scan_event(self.request, BleScanEvent.objects.filter(name__in=['ScanEvent001', 'ScanEvent002']))
+
+        # only the selected scan event not running is started, while other scan events run.
+        command = BleScanCommand.objects.get()
+        self.assertEqual(command.events, ['ScanEvent002'])
+        messages.warning.assert_called_once()
+        messages.error.assert_not_called()
+
+    def test_all_running(self, messages):
+        BleScanEvent.objects.filter(name='ScanEvent001').update(
+            is_enabled=True, pid=os.getpid(), create_time=psutil.Process().create_time(), last_heartbeat=timezone.now())
+        self.model_admin.run_scan_event(self.request, BleScanEvent.objects.filter(name='ScanEvent001'))
+        self.assertFalse(BleScanCommand.objects.exists())
+        messages.error.assert_called_once()
+
+    def test_stop_scan_event(self, messages):
+        BleScanEvent.objects.update(is_enabled=True)
+        self.model_admin.stop_scan_event(self.request, BleScanEvent.objects.filter(name='ScanEvent001'))
+        command = BleScanCommand.objects.get()
+        self.assertEqual((command.action, command.events), (BleScanCommand.Action.STOP, ['ScanEvent001']))
+        self.assertEqual(list(BleScanEvent.objects.filter(is_enabled=True).values_list('name', flat=True)),
+                         ['ScanEvent002'])
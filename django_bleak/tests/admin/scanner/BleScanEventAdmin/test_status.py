@@ -0,0 +1,20 @@
+
+from unittest import mock
+
+from django.contrib import admin
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models import BleScanEvent
+
+
+class Test(TestCase):
+
+    def test_status(self):
+        model_admin = admin.site._registry[BleScanEvent]
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, pid=1, last_heartbeat=timezone.now())
+        BleScanEvent.objects.create(name='ScanEvent002')
+        with mock.patch('django_bleak.models.scanner.psutil.Process.is_running') as is_running:
+            with self.assertNumQueries(1):
+                statuses = [model_admin.status(obj) for obj in BleScanEvent.objects.order_by('name')]
+        self.assertEqual(statuses, ['Running', 'Waitting'])
+        is_running.assert_not_called()
@@ -0,0 +1,31 @@
+
+import datetime
+
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+from django_bleak.models import BleScanDecoded, BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.results = BleScanResult.objects.bulk_create(
+            [BleScanResult(received_at=BASE, device=dev, rssi=-50) for _ in range(3)])
+        BleScanDecoded.objects.bulk_create(
+            [BleScanDecoded(result_id=r.id, format='ibeacon', name='major', value=1) for r in self.results])
+        self.model_admin = admin.site._registry[BleScanResult]
+        self.request = RequestFactory().post('/')
+
+    def test_delete_queryset(self):
+        self.model_admin.delete_queryset(self.request, BleScanResult.objects.filter(id__lt=self.results[2].id))
+
+        self.assertEqual(list(BleScanDecoded.objects.values_list('result_id', flat=True)), [self.results[2].id])
+
+    def test_delete_model(self):
+        self.model_admin.delete_model(self.request, BleScanResult.objects.get(id=self.results[0].id))
+
+        self.assertEqual(sorted(BleScanDecoded.objects.values_list('result_id', flat=True)),
+                         [r.id for r in self.results[1:]])
@@ -0,0 +1,59 @@
+
+import json
+import os
+import timeit
+import typing as typ
+
+BASELINE_PATH = os.environ.get('DJANGO_BLEAK_BASELINE',
+                               os.path.join(os.path.dirname(__file__), 'baselines.json'))
+# fail if slower than baseline * TOLERANCE.
+TOLERANCE = float(os.environ.get('DJANGO_BLEAK_BENCHMARK_TOLERANCE', '1.5'))
+# store results as new baselines instead of comparing.
+SAVE = bool(os.environ.get('DJANGO_BLEAK_BENCHMARK_SAVE'))
+
+
+def measure(func: typ.Callable[[], typ.Any], number: int = 1, repeat: int = 5) -> float:
+    """best seconds per call
+
+    Args:
+        func (typ.Callable[[], typ.Any]): measured function
+        number (int): calls per repeat
+        repeat (int): repeat count
+
+    Returns:
+        float: seconds
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def load() -> typ.Dict[str, float]:
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as fp:
+        return json.load(fp)
+
+
+def save(name: str, seconds: float):
+    baselines = load()
+    baselines[name] = seconds
+    with open(BASELINE_PATH, 'w') as fp:
+        json.dump(dict(sorted(baselines.items())), fp, indent=2)
+        fp.write('\n')
+
+
+class BaselineMixin:
+    """compare benchmark results with stored baselines"""
+
+    def assertBaseline(self, name: str, seconds: float):
+        baseline = load().get(name)
+        if baseline:
+            print(f'\n{name}: {seconds * 1e3:.3f}ms baseline={baseline * 1e3:.3f}ms ratio={seconds / baseline:.2f}x')
+        else:
+            print(f'\n{name}: {seconds * 1e3:.3f}ms baseline=-')
+        if SAVE:
+            save(name, seconds)
+            return
+        if baseline is None:
+            return
+        self.assertLessEqual(seconds, baseline * TOLERANCE,
+                             f'{name} regressed. {seconds * 1e3:.3f}ms > {baseline * 1e3:.3f}ms * {TOLERANCE}')
@@ -0,0 +1,72 @@
+
+import datetime
+import os
+import random
+import time
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from django_bleak.models import BleScanBucket, BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+DEVICES = 20
+MINUTES = 60
+# adverts per device and second
+RATE = 1
+
+
+def table_bytes(model) -> int:
+    # pages of the table and its indexes. sqlite only.
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT SUM(pgsize) FROM dbstat WHERE name IN '
+                       '(SELECT name FROM sqlite_master WHERE tbl_name = %s)', [model._meta.db_table])
+        return cursor.fetchone()[0] or 0
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        rnd = random.Random(0)
+        devs = BleScanDevice.objects.bulk_create(
+            [BleScanDevice(mac_addr=f'00:00:00:00:00:{i:02X}') for i in range(DEVICES)])
+        objs = [BleScanResult(received_at=BASE + datetime.timedelta(seconds=s + rnd.random() / RATE),
+                              device=dev, local_name=f'dev-{i:03d}', company_code=0x004c,
+                              manufacturer_data=bytes.fromhex('0215') + bytes(20) + bytes([i, s // 600]),
+                              tx_power=-8, rssi=rnd.randint(-80, -50))
+                for s in range(MINUTES * 60 * RATE) for i, dev in enumerate(devs)]
+        BleScanResult.objects.bulk_create(objs, batch_size=5000)
+        return super().setUpTestData()
+
+    def scan(self, read) -> float:
+        # one device, 10 minutes
+        start = BASE + datetime.timedelta(minutes=20)
+        end = start + datetime.timedelta(minutes=10)
+        started = time.perf_counter()
+        for _ in range(5):
+            count = len(read('00:00:00:00:00:01', start, end))
+        self.assertEqual(count, 10 * 60 * RATE)
+        return (time.perf_counter() - started) / 5
+
+    def test_compact(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('size is measured by sqlite dbstat.')
+        rows = BleScanResult.objects.count()
+        before = table_bytes(BleScanResult)
+        row_seconds = self.scan(lambda dev, start, end: list(
+            BleScanResult.objects.filter(device=dev, received_at__gte=start, received_at__lt=end)))
+
+        started = time.perf_counter()
+        compacted = BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=MINUTES))
+        compact_seconds = time.perf_counter() - started
+        self.assertEqual(compacted, rows)
+        # deleted pages are not returned without VACUUM.
+        after = table_bytes(BleScanBucket)
+        bucket_seconds = self.scan(lambda dev, start, end: list(BleScanBucket.objects.results(dev, start, end)))
+        print(f'\nrows={rows} BleScanResult={before / rows:.1f}B/row BleScanBucket={after / rows:.1f}B/row '
+              f'ratio={before / after:.1f}x compact={rows / compact_seconds:.0f}rows/s\n'
+              f'range scan of a device: BleScanResult={row_seconds * 1e3:.1f}ms '
+              f'BleScanBucket={bucket_seconds * 1e3:.1f}ms')
+        self.assertGreater(before / after, 10)
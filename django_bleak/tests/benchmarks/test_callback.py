@@ -0,0 +1,48 @@
+
+import os
+import unittest
+
+from asgiref.sync import async_to_sync
+
+from django.db import connection
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner import Command
+from django_bleak.models.scanner import (BleScanFilter, BleScanResult,
+                                         device_cache)
+
+from .baseline import BaselineMixin, measure
+from .test_filter_data import make_data
+
+ADVERTS = 5000
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(BaselineMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanFilter.objects.create(rssi_min=-70)
+        return super().setUpTestData()
+
+    def tearDown(self) -> None:
+        device_cache.clear()
+        return super().tearDown()
+
+    def test_callback(self):
+        # callback -> buffer -> filter_data -> create_data without scanner pacing.
+        data_list = make_data(ADVERTS)
+        cmd = Command()
+        # the writer thread can not see data of the test transaction.
+        cmd.configure(writer='executor')
+        session = cmd.create_session('ScanEvent001')
+        session.filters = session.load_filters()
+
+        async def main():
+            for dev, adv in data_list:
+                await session.callback(dev, adv)
+            await cmd.buffer.flush()
+
+        seconds = measure(async_to_sync(main))
+        self.assertBaseline(f'callback[{connection.vendor}] adverts={ADVERTS}', seconds)
+        self.assertEqual(cmd.buffer.dropped, 0)
+        self.assertGreater(BleScanResult.objects.count(), 0)
@@ -0,0 +1,34 @@
+
+import os
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from django_bleak.models.scanner import (BleScanFilter, BleScanResult,
+                                         device_cache)
+
+from .baseline import BaselineMixin, measure
+from .test_filter_data import make_data
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(BaselineMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanFilter.objects.create()
+        return super().setUpTestData()
+
+    def tearDown(self) -> None:
+        device_cache.clear()
+        return super().tearDown()
+
+    def test_create_data(self):
+        # runs on DATABASES['default'], so run with PostgreSQL settings to measure PostgreSQL.
+        filters = BleScanFilter.objects.filter(is_enabled=True)
+        for batch_size in (100, 500, 5000):
+            data_list = make_data(batch_size)
+            # devices are saved by the first call and cached after that.
+            seconds = measure(lambda: filters.create_data(data_list))
+            self.assertBaseline(f'create_data[{connection.vendor}] batch={batch_size}', seconds)
+        self.assertGreater(BleScanResult.objects.count(), 0)
@@ -0,0 +1,75 @@
+
+import os
+import random
+import timeit
+import unittest
+
+import bleak as blk
+
+from django.test import SimpleTestCase
+from django_bleak.models.scanner import BleScanFilter, FilterMatcher
+
+from .baseline import BaselineMixin
+
+
+def make_filters(n: int):
+    rnd = random.Random(n)
+    filters = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            filters.append(BleScanFilter(mac_addr=f'00:00:00:00:{i // 256:02X}:{i % 256:02X}'))
+        elif kind == 1:
+            filters.append(BleScanFilter(company_code=rnd.randrange(0x10000),
+                                         manufacturer_data=r'^0215'))
+        elif kind == 2:
+            filters.append(BleScanFilter(local_name=f'dev-{i:04d}'))
+        else:
+            filters.append(BleScanFilter(mac_addr=f'00:00:00:01:{i // 256:02X}:{i % 256:02X}',
+                                         rssi_min=-70))
+    return filters
+
+
+def make_data(n: int):
+    rnd = random.Random(0)
+    data_list = []
+    for i in range(n):
+        dev = blk.BLEDevice(f'00:00:00:00:{i // 256 % 256:02X}:{i % 256:02X}', None, None, -60)
+        adv = blk.AdvertisementData(
+            f'dev-{i:04d}',
+            {rnd.randrange(0x10000): bytes.fromhex('0215') + rnd.randbytes(21)},
+            {},
+            [],
+            None,
+            rnd.randint(-100, -30),
+            tuple()
+        )
+        data_list.append((dev, adv))
+    return data_list
+
+
+def legacy_filter_data(filters, data_list):
+    # nested loop before FilterMatcher.
+    return [data
+            for f in filters
+            for data in data_list
+            if f.is_match(data)]
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(BaselineMixin, SimpleTestCase):
+
+    def test_filter_data(self):
+        data_list = make_data(1000)
+        for n in (10, 100, 1000):
+            filters = make_filters(n)
+            matcher = FilterMatcher(filters)
+            legacy = min(timeit.repeat(lambda: legacy_filter_data(filters, data_list), number=1, repeat=3))
+            compiled = min(timeit.repeat(lambda: [d for d in data_list if matcher.is_match(d)], number=1, repeat=3))
+            build = min(timeit.repeat(lambda: FilterMatcher(filters), number=1, repeat=3))
+            print(f'\nfilter_data filters={n} adverts={len(data_list)}: '
+                  f'legacy={legacy * 1e3:.2f}ms compiled={compiled * 1e3:.2f}ms build={build * 1e3:.2f}ms')
+            self.assertBaseline(f'filter_data filters={n} adverts={len(data_list)}', compiled)
+
+            expected = {id(d) for d in legacy_filter_data(filters, data_list)}
+            self.assertEqual({id(d) for d in data_list if matcher.is_match(d)}, expected)
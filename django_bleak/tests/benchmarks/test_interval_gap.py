@@ -0,0 +1,82 @@
+
+import asyncio
+import os
+import time
+import unittest
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner_interval import Command
+from django_bleak.models import BleScanEvent, BleScanFilter
+from django_bleak.utils.backend import load_backend
+
+# seconds to start discovery, like BlueZ.
+STARTUP = 0.2
+
+
+def tracked_backend(spec: str):
+    """backend class recording when each scanner is listening"""
+    base = load_backend(spec)
+
+    class Tracked(base):
+        spans = []
+
+        async def start(self):
+            await super().start()
+            self._span = [time.monotonic(), None]
+            self.spans.append(self._span)
+
+        async def stop(self):
+            await super().stop()
+            self._span[1] = time.monotonic()
+
+    return Tracked
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(TestCase):
+
+    SECONDS = 5.0
+    INTERVAL = 1.0
+
+    def setUp(self) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, interval=self.INTERVAL)
+        BleScanFilter.objects.create()
+        return super().setUp()
+
+    def test_interval_gap(self):
+        blind = {}
+        for continuous in (False, True):
+            BleScanEvent.objects.filter(name='ScanEvent001').update(is_enabled=True)
+            cmd = Command()
+            scanner_class = tracked_backend(f'synthetic:devices=100,rate=1000,seed=0,startup={STARTUP}')
+
+            def stop():
+                scan_event = BleScanEvent.objects.get(name='ScanEvent001')
+                scan_event.is_enabled = False
+                scan_event.save()
+
+            async def main():
+                cmd.scanner_class = scanner_class
+                started = time.monotonic()
+                task = asyncio.ensure_future(cmd.run('ScanEvent001', self.INTERVAL, writer='executor',
+                                                     continuous=continuous))
+                await asyncio.sleep(self.SECONDS)
+                await sync_to_async(stop)()
+                # is_enabled is checked after the interval.
+                await asyncio.wait_for(task, self.INTERVAL * 3)
+                return started, time.monotonic()
+
+            started, finished = async_to_sync(main)()
+            spans = [(start, end or finished) for start, end in scanner_class.spans]
+            gaps = [b[0] - a[1] for a, b in zip(spans, spans[1:])]
+            listening = sum(end - start for start, end in spans)
+            blind[continuous] = 1 - listening / (finished - started)
+            mode = 'continuous' if continuous else 'discover'
+            print(f'\ninterval_gap mode={mode} startup={STARTUP * 1e3:.0f}ms: scanners={len(spans)} '
+                  f'gap mean={sum(gaps) / max(len(gaps), 1) * 1e3:.1f}ms max={max(gaps, default=0) * 1e3:.1f}ms '
+                  f'blind={blind[continuous] * 100:.1f}% rows={cmd.buffer.received}')
+
+        # one scanner is started once, so the only blind window is its startup.
+        self.assertLess(blind[True], blind[False])
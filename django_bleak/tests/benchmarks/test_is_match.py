@@ -0,0 +1,33 @@
+
+import os
+import unittest
+
+from django.test import SimpleTestCase
+from django_bleak.models.scanner import BleScanFilter
+
+from .baseline import BaselineMixin, measure
+from .test_filter_data import make_data
+
+ADVERTS = 10000
+
+FILTERS = {
+    'mac_addr': BleScanFilter(mac_addr='00:00:00:00:00:01'),
+    'local_name': BleScanFilter(local_name='dev-0001'),
+    'company_code': BleScanFilter(company_code=0x004c),
+    'manufacturer_data': BleScanFilter(manufacturer_data=r'^0215(34|35)'),
+    'manufacturer_prefix': BleScanFilter(manufacturer_prefix='0215'),
+    'manufacturer_mask': BleScanFilter(manufacturer_prefix='021534', manufacturer_mask='fffffe'),
+    'service_uuid': BleScanFilter(service_uuid='0000feaa-0000-1000-8000-00805f9b34fb'),
+    'service_data': BleScanFilter(service_data=r'^10'),
+    'rssi': BleScanFilter(rssi_min=-70),
+}
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(BaselineMixin, SimpleTestCase):
+
+    def test_is_match(self):
+        data_list = make_data(ADVERTS)
+        for name, f in FILTERS.items():
+            seconds = measure(lambda: [f.is_match(d) for d in data_list])
+            self.assertBaseline(f'is_match[{name}] adverts={ADVERTS}', seconds)
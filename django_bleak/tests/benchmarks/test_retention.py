@@ -0,0 +1,47 @@
+
+import datetime
+import os
+import time
+import unittest
+
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+BATCH_SIZE = 500
+BATCHES = 400
+DEVICES = 100
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(TestCase):
+
+    def insert(self, retention: int = None):
+        devs = BleScanDevice.objects.bulk_create(
+            [BleScanDevice(mac_addr=f'00:00:00:00:00:{i:02X}') for i in range(DEVICES)])
+        elapsed = []
+        for n in range(BATCHES):
+            received_at = BASE + datetime.timedelta(seconds=n)
+            objs = [BleScanResult(received_at=received_at, device=devs[i % DEVICES],
+                                  company_code=i % 8, manufacturer_data=bytes(24), rssi=-50)
+                    for i in range(BATCH_SIZE)]
+            started = time.perf_counter()
+            BleScanResult.objects.bulk_create(objs, batch_size=5000)
+            if retention is not None:
+                BleScanResult.objects.prune(received_at - datetime.timedelta(seconds=retention),
+                                            chunk_size=BATCH_SIZE, max_chunks=1)
+            elapsed.append(time.perf_counter() - started)
+        return elapsed
+
+    def report(self, name, elapsed):
+        # throughput of each quarter.
+        window = BATCHES // 4
+        rates = [f'{BATCH_SIZE * window / sum(elapsed[i:i + window]):.0f}'
+                 for i in range(0, BATCHES, window)]
+        print(f'\n{name}: rows={BleScanResult.objects.count()} rows/s={rates}')
+
+    def test_without_retention(self):
+        self.report('insert without retention', self.insert())
+
+    def test_with_retention(self):
+        self.report('insert with retention', self.insert(retention=20))
@@ -0,0 +1,75 @@
+
+import math
+import os
+import random
+import time
+import unittest
+
+from django.test import SimpleTestCase
+from django_bleak.utils.rssi import (DEFAULT_LOSS_1M, DEFAULT_MEASURED_POWER,
+                                     DEFAULT_PATH_LOSS_EXPONENT, distance, ema,
+                                     kalman)
+
+from .baseline import BaselineMixin, measure
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SAMPLES = 1000000
+
+
+def python_ema(rssi, alpha=0.3):
+    res = []
+    last = rssi[0]
+    for value in rssi:
+        last += alpha * (value - last)
+        res.append(last)
+    return res
+
+
+def python_kalman(rssi, q=0.008, r=4.0):
+    res = [rssi[0]]
+    x, p = rssi[0], r
+    for value in rssi[1:]:
+        p += q
+        k = p / (p + r)
+        x += k * (value - x)
+        p *= 1 - k
+        res.append(x)
+    return res
+
+
+def python_distance(rssi, tx_power):
+    return [10 ** (((DEFAULT_MEASURED_POWER if power is None else power - DEFAULT_LOSS_1M) - value)
+                   / (10 * DEFAULT_PATH_LOSS_EXPONENT))
+            for value, power in zip(rssi, tx_power)]
+
+
+@unittest.skipIf(np is None, 'numpy is not installed.')
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(BaselineMixin, SimpleTestCase):
+
+    def test_rssi(self):
+        rand = random.Random(0)
+        rssi = [rand.gauss(-70, 8) for _ in range(SAMPLES)]
+        tx_power = [None if i % 2 else 0.0 for i in range(SAMPLES)]
+        rssi_array = np.array(rssi)
+        tx_power_array = np.array(tx_power, dtype=float)
+        cases = {
+            'ema': (lambda: ema(rssi_array), lambda: python_ema(rssi)),
+            'kalman': (lambda: kalman(rssi_array), lambda: python_kalman(rssi)),
+            'distance': (lambda: distance(rssi_array, tx_power_array), lambda: python_distance(rssi, tx_power)),
+        }
+        for name, (vectorized, loop) in cases.items():
+            seconds = measure(vectorized)
+            started = time.perf_counter()
+            expected = loop()
+            loop_seconds = time.perf_counter() - started
+            np.testing.assert_allclose(vectorized(), expected, rtol=1e-6)
+            print(f'\nrssi {name} samples={SAMPLES}: numpy={seconds * 1e3:.1f}ms '
+                  f'python={loop_seconds * 1e3:.1f}ms speedup={loop_seconds / seconds:.1f}x')
+            self.assertLess(seconds, loop_seconds)
+            self.assertBaseline(f'rssi[{name}] samples={SAMPLES}', seconds)
+        self.assertFalse(math.isnan(kalman(rssi_array)[-1]))
@@ -0,0 +1,79 @@
+
+import asyncio
+import itertools
+import os
+import statistics
+import time
+import unittest
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.db import OperationalError
+from django.test import TransactionTestCase
+from django_bleak.management.commands.ble_scanner import Command
+from django_bleak.models import BleScanEvent, BleScanFilter
+
+
+class LatencyCommand(Command):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.latencies = []
+
+    def write(self, data_list):
+        super().write(data_list)
+        # synthetic backend puts emitted monotonic time in platform_data.
+        now = time.monotonic()
+        self.latencies += [now - adv.platform_data[0] for _, (_, adv) in data_list]
+
+
+@unittest.skipUnless(os.environ.get('DJANGO_BLEAK_BENCHMARK'), 'set DJANGO_BLEAK_BENCHMARK=1 to run benchmarks.')
+class Test(TransactionTestCase):
+    # the writer thread saves results with its own connection, so data is committed.
+
+    SECONDS = 5.0
+    # the scanner must keep up with the rate, not drop advertising data silently.
+    MAX_DROP_RATIO = 0.01
+
+    def setUp(self) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, interval=1.0)
+        BleScanFilter.objects.create()
+        return super().setUp()
+
+    def test_scanner_loop(self):
+        for writer, rate in itertools.product(('executor', 'thread'), (1000, 10000)):
+            cmd = LatencyCommand()
+            BleScanEvent.objects.filter(name='ScanEvent001').update(is_enabled=True)
+
+            def stop():
+                # in-memory SQLite of tests fails instead of waiting while the writer thread writes.
+                for _ in range(100):
+                    try:
+                        scan_event = BleScanEvent.objects.get(name='ScanEvent001')
+                        scan_event.is_enabled = False
+                        scan_event.save()
+                        return
+                    except OperationalError:
+                        time.sleep(0.01)
+                raise TimeoutError('can not stop the scan event.')
+
+            async def main():
+                task = asyncio.ensure_future(cmd.run('ScanEvent001', 1.0, writer=writer,
+                                                     backend=f'synthetic:devices=1000,rate={rate},seed=0'))
+                await asyncio.sleep(self.SECONDS)
+                await sync_to_async(stop)()
+                await task
+
+            started = time.monotonic()
+            async_to_sync(main)()
+            elapsed = time.monotonic() - started
+
+            latencies = sorted(cmd.latencies)
+            p99 = latencies[int(len(latencies) * 0.99)] if latencies else float('nan')
+            print(f'\nscanner_loop writer={writer} rate={rate}/s: received={cmd.buffer.received} flushed={cmd.buffer.flushed} '
+                  f'dropped={cmd.buffer.dropped} throughput={cmd.buffer.flushed / elapsed:.0f}/s '
+                  f'latency p50={statistics.median(latencies) * 1e3:.1f}ms p99={p99 * 1e3:.1f}ms')
+
+            self.assertGreater(cmd.buffer.flushed, 0)
+            self.assertLessEqual(cmd.buffer.dropped, cmd.buffer.received * self.MAX_DROP_RATIO,
+                                 f'writer={writer} rate={rate}/s dropped {cmd.buffer.dropped} of {cmd.buffer.received}.')
@@ -0,0 +1,25 @@
+
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models import BleScanBucket, BleScanDevice, BleScanResult
+
+
+class Test(TestCase):
+
+    def test_handle(self):
+        now = timezone.now()
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=now - datetime.timedelta(days=days), device=dev, rssi=-50)
+            for days in (10, 10, 8, 1)
+        ])
+        out = StringIO()
+        call_command('ble_compact', days=7, stdout=out)
+
+        self.assertIn('compacted 3 results', out.getvalue())
+        self.assertEqual(BleScanResult.objects.count(), 1)
+        self.assertEqual(sum(BleScanBucket.objects.values_list('count', flat=True)), 3)
@@ -0,0 +1,94 @@
+
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        devs = [BleScanDevice.objects.create(mac_addr=f'12:34:56:78:90:A{i}') for i in range(2)]
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=i), device=devs[i % 2], rssi=-i)
+            for i in range(6)
+        ])
+        return super().setUpTestData()
+
+    def export(self, *args, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.jsonl')
+            call_command('ble_export', path, *args, format='jsonl', stderr=StringIO(), **kwargs)
+            with open(path, encoding='utf-8') as fp:
+                return [json.loads(line) for line in fp]
+
+    def test_all(self):
+        rows = self.export(chunk_size=4)
+
+        self.assertEqual([row['rssi'] for row in rows], [0, -1, -2, -3, -4, -5])
+
+    def test_range(self):
+        rows = self.export(start=BASE + datetime.timedelta(minutes=1), end=BASE + datetime.timedelta(minutes=4))
+
+        self.assertEqual([row['rssi'] for row in rows], [-1, -2, -3])
+
+    def test_unordered(self):
+        # imported results are older than saved ones.
+        BleScanResult.objects.mark_unordered()
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=i, seconds=30),
+                          device=BleScanDevice.objects.first(), rssi=-10 - i)
+            for i in range(6)
+        ])
+        rows = self.export(start=BASE + datetime.timedelta(minutes=1), end=BASE + datetime.timedelta(minutes=3))
+
+        self.assertEqual(sorted(row['rssi'] for row in rows), [-12, -11, -2, -1])
+
+    def test_device(self):
+        rows = self.export(device=['12:34:56:78:90:A1'])
+
+        self.assertEqual([row['rssi'] for row in rows], [-1, -3, -5])
+        self.assertEqual(rows[0]['device_id'], '12:34:56:78:90:A1')
+
+    def test_resume(self):
+        ids = list(BleScanResult.objects.order_by('id').values_list('id', flat=True))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.csv')
+            stderr = StringIO()
+            call_command('ble_export', path, end=BASE + datetime.timedelta(minutes=3), stderr=stderr)
+            self.assertIn(f'last id is {ids[2]}.', stderr.getvalue())
+            call_command('ble_export', path, after_id=ids[2], stderr=StringIO())
+            with open(path, encoding='utf-8') as fp:
+                lines = fp.read().splitlines()
+
+        self.assertEqual(len(lines), 1 + 6)
+        self.assertTrue(lines[0].startswith('id,'))
+
+    def test_start_overwrites(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.csv')
+            for _ in range(2):
+                call_command('ble_export', path, start=BASE + datetime.timedelta(minutes=3), stderr=StringIO())
+            with open(path, encoding='utf-8') as fp:
+                lines = fp.read().splitlines()
+
+        # --start narrows the range, but does not resume.
+        self.assertEqual(len(lines), 1 + 3)
+
+    def test_parquet_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.parquet')
+            with open(path, 'wb') as fp:
+                fp.write(b'PAR1')
+            with self.assertRaises(CommandError):
+                call_command('ble_export', path, format='parquet', after_id=3, stderr=StringIO())
+            with open(path, 'rb') as fp:
+                self.assertEqual(fp.read(), b'PAR1')
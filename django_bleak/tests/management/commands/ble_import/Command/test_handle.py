@@ -0,0 +1,72 @@
+
+import datetime
+import io
+import os
+import tempfile
+
+import bleak as blk
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django_bleak.models import (BleScanDevice, BleScanEvent, BleScanFilter,
+                                 BleScanResult)
+from django_bleak.models.scanner import device_cache
+from django_bleak.utils.capture import CaptureWriter
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanFilter.objects.create(company_code=0xffff)
+        event = BleScanEvent.objects.create(name='ScanEvent001')
+        BleScanFilter.objects.create(company_code=0x004c).events.add(event)
+        return super().setUpTestData()
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        with CaptureWriter(self.path) as writer:
+            for i in range(30):
+                dev = blk.BLEDevice(f'12:34:56:78:90:{i % 3:02X}', None, None, -50)
+                code = (0xffff, 0x004c, 0x0001)[i % 3]
+                adv = blk.AdvertisementData(None, {code: bytes([i])}, {}, [], None, -50, tuple())
+                writer.write((BASE + datetime.timedelta(seconds=i)).timestamp(), (dev, adv))
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+        device_cache.clear()
+        return super().tearDown()
+
+    def test_handle(self):
+        out = io.StringIO()
+        call_command('ble_import', self.path, '--batch-size', '7', stdout=out)
+
+        self.assertIn('imported 20 results from 30 advertising data.', out.getvalue())
+        results = BleScanResult.objects.order_by('id')
+        self.assertEqual(sorted(set(results.values_list('company_code', flat=True))), [0x004c, 0xffff])
+        # received_at is the recorded time.
+        self.assertEqual(results[0].received_at, BASE)
+        self.assertEqual(results.last().received_at, BASE + datetime.timedelta(seconds=28))
+
+    def test_unordered(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:FF')
+        live = BleScanResult.objects.create(received_at=BASE + datetime.timedelta(hours=1), device=dev, rssi=-50)
+        call_command('ble_import', self.path, stdout=io.StringIO())
+
+        # imported results are older than saved ones, so they are bounded by received_at only.
+        self.assertEqual(BleScanResult.objects.unordered_id(), live.id + 1)
+        self.assertEqual(BleScanResult.objects.prune(BASE + datetime.timedelta(minutes=1)), 20)
+        self.assertEqual(list(BleScanResult.objects.values_list('id', flat=True)), [live.id])
+
+    def test_event(self):
+        BleScanEvent.objects.create(name='ScanEvent002')
+        call_command('ble_import', self.path, '--event', 'ScanEvent002', stdout=io.StringIO())
+        self.assertEqual(set(BleScanResult.objects.values_list('company_code', flat=True)), {0xffff})
+
+    def test_not_found(self):
+        with self.assertRaises(CommandError):
+            call_command('ble_import', self.path + '.none')
@@ -0,0 +1,34 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+from django_bleak.utils.partition import next_month, partition_name
+
+
+class Test(TestCase):
+
+    def test_not_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command('ble_partition', stdout=StringIO())
+
+    def test_dry_run(self):
+        now = timezone.now()
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.create(received_at=now - datetime.timedelta(days=62), device=dev, rssi=-50)
+        out = StringIO()
+
+        call_command('ble_partition', partitions=2, dry_run=True, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('ALTER TABLE "django_bleak_blescanresult" RENAME TO'))
+        self.assertTrue(all(line.endswith(';') for line in lines))
+        partitions = [line for line in lines if 'PARTITION OF' in line]
+        # from the oldest result to the next month.
+        self.assertIn(partition_name('django_bleak_blescanresult', now - datetime.timedelta(days=62)), partitions[0])
+        self.assertIn(partition_name('django_bleak_blescanresult', next_month(now)), partitions[-1])
+        # nothing is executed.
+        self.assertEqual(BleScanResult.objects.count(), 1)
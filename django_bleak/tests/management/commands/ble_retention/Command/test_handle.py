@@ -0,0 +1,58 @@
+
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models import BleScanBucket
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        now = timezone.now()
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=now - datetime.timedelta(days=days), device=dev,
+                          company_code=0xffff, manufacturer_data=b'\x01\x02', rssi=-50)
+            for days in (40, 35, 20, 1)
+        ])
+        return super().setUpTestData()
+
+    def test_delete(self):
+        call_command('ble_retention', days=30, stdout=StringIO())
+
+        self.assertEqual(BleScanResult.objects.count(), 2)
+
+    def test_archive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive.jsonl')
+            call_command('ble_retention', days=30, archive=path, stdout=StringIO())
+            with open(path, encoding='utf-8') as fp:
+                rows = [json.loads(line) for line in fp]
+
+        self.assertEqual(BleScanResult.objects.count(), 2)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['manufacturer_data'], '0102')
+        self.assertEqual(rows[0]['company_code'], 0xffff)
+
+    def test_buckets(self):
+        BleScanBucket.objects.compact(timezone.now() - datetime.timedelta(days=10))
+        self.assertEqual(BleScanBucket.objects.count(), 3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'archive.jsonl')
+            call_command('ble_retention', days=30, archive=path, stdout=StringIO())
+            with open(path, encoding='utf-8') as fp:
+                rows = [json.loads(line) for line in fp]
+
+        self.assertEqual(BleScanBucket.objects.count(), 1)
+        self.assertEqual(BleScanResult.objects.count(), 1)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['device_id'], '12:34:56:78:90:AB')
+        self.assertEqual(rows[0]['manufacturer_data'], '0102')
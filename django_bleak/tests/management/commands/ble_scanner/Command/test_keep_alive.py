@@ -0,0 +1,43 @@
+
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner import Command
+from django_bleak.models import BleScanEvent
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, pid=1)
+        return super().setUpTestData()
+
+    def create_command(self) -> Command:
+        cmd = Command()
+        cmd.sessions = [cmd.create_session('ScanEvent001')]
+        return cmd
+
+    def test_keep_alive(self):
+        cmd = self.create_command()
+        cmd.sessions[0].processed = 10
+        cmd.keep_alive(cmd.sessions[0])
+
+        event = BleScanEvent.objects.get()
+        self.assertIsNotNone(event.last_heartbeat)
+        self.assertEqual(event.processed, 10)
+
+    def test_database_error(self):
+        cmd = self.create_command()
+        with patch.object(cmd, 'maintain', side_effect=OperationalError('database table is locked')), \
+                self.assertLogs('ble_scanner', 'ERROR'):
+            # retried on the next interval instead of stopping the scanner.
+            cmd.keep_alive(cmd.sessions[0])
+
+        # the heartbeat is sent even if maintain failed.
+        self.assertIsNotNone(BleScanEvent.objects.get().last_heartbeat)
+
+        with patch('django_bleak.models.scanner.EventQueryset.heartbeat', side_effect=OperationalError), \
+                self.assertLogs('ble_scanner', 'ERROR'):
+            cmd.keep_alive(cmd.sessions[0])
@@ -0,0 +1,140 @@
+
+import asyncio
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner import LOOP_LAG, Command
+from django_bleak.models import (BleDeviceLatest, BlePresence, BleScanEvent,
+                                 BleScanFilter, BleScanResult)
+from django_bleak.models.scanner import CREATED, FILTERED
+from django_bleak.utils.backend import SyntheticScanner
+from django_bleak.utils.capture import read_capture
+from django_bleak.utils.metrics import Histogram, metrics
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, interval=0.1)
+        BleScanFilter.objects.create(company_code=SyntheticScanner.COMPANY_CODE)
+        return super().setUpTestData()
+
+    def run_command(self, **options) -> Command:
+        cmd = Command()
+
+        def stop():
+            scan_event = BleScanEvent.objects.get(name='ScanEvent001')
+            scan_event.is_enabled = False
+            scan_event.save()
+
+        async def main():
+            # the writer thread can not see data of the test transaction.
+            options.setdefault('writer', 'executor')
+            task = asyncio.ensure_future(cmd.run('ScanEvent001', 0.1, batch_wait=0.05,
+                                                 backend='synthetic:devices=10,rate=1000,manufacturer=0.5,seed=0',
+                                                 **options))
+            await asyncio.sleep(0.3)
+            await sync_to_async(stop)()
+            await asyncio.wait_for(task, 2.0)
+
+        async_to_sync(main)()
+        return cmd
+
+    def test_run(self):
+        cmd = self.run_command()
+
+        self.assertTrue(issubclass(cmd.scanner_class, SyntheticScanner))
+        self.assertGreater(cmd.buffer.received, 100)
+        self.assertEqual(cmd.buffer.received, cmd.buffer.flushed)
+        self.assertEqual(cmd.buffer.dropped, 0)
+        # only devices sending manufacturer data are saved.
+        count = BleScanResult.objects.count()
+        self.assertGreater(count, 0)
+        self.assertLess(count, cmd.buffer.flushed)
+        self.assertEqual(BleScanResult.objects.exclude(company_code=SyntheticScanner.COMPANY_CODE).count(), 0)
+
+    def test_record(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        cmd = self.run_command(record=path)
+
+        # all advertising data are recorded without saving results.
+        self.assertEqual(BleScanResult.objects.count(), 0)
+        self.assertEqual(cmd.buffer.received, 0)
+        self.assertGreater(cmd.recorder.written, 100)
+        self.assertEqual(len(list(read_capture(path))), cmd.recorder.written)
+
+    def test_writer(self):
+        written = []
+
+        def write(cmd, data_list):
+            written.append((threading.get_ident(), len(data_list)))
+
+        with patch.object(Command, 'write', write):
+            cmd = self.run_command(writer='thread')
+
+        # batches are written in the writer thread, not in the event loop or the asgiref executor.
+        self.assertNotIn(threading.get_ident(), {ident for ident, _ in written})
+        self.assertEqual(len({ident for ident, _ in written}), 1)
+        self.assertEqual(sum(size for _, size in written), cmd.buffer.flushed)
+        self.assertEqual(cmd.writer.written, cmd.buffer.flushed)
+        self.assertEqual(cmd.writer.depth, 0)
+        self.assertFalse(cmd.writer.is_running)
+
+    def test_presence(self):
+        # the test transaction is not committed, so run callbacks on commit of each batch at once.
+        with patch('django.db.transaction.on_commit', side_effect=lambda func, *args, **kwargs: func()):
+            cmd = self.run_command(presence_timeout=60.0)
+
+        # devices sending manufacturer data entered, and left when scanning stopped.
+        devices = set(BleScanResult.objects.values_list('device_id', flat=True))
+        self.assertEqual(set(BlePresence.objects.values_list('device_id', flat=True)), devices)
+        self.assertEqual(BlePresence.objects.count(), len(devices))
+        self.assertFalse(BlePresence.objects.present().exists())
+        self.assertEqual(BlePresence.objects.filter(event_id='ScanEvent001').count(), len(devices))
+        self.assertEqual(len(cmd.sessions[0].presence), 0)
+
+    def test_metrics(self):
+        before = {m.name: next(m.samples())[2] for m in metrics.collect() if not isinstance(m, Histogram)}
+        lag = LOOP_LAG.count
+        with self.assertLogs('ble_scanner', 'INFO') as logs:
+            cmd = self.run_command(metrics='log')
+
+        self.assertEqual(FILTERED.value - before['django_bleak_filtered_total'], cmd.buffer.flushed)
+        self.assertEqual(CREATED.value - before['django_bleak_results_created_total'], BleScanResult.objects.count())
+        self.assertGreater(LOOP_LAG.count, lag)
+        self.assertIn(f'django_bleak_adverts_received_total {cmd.buffer.received}', metrics.render())
+        self.assertTrue(any('metrics ' in line and 'matched_total=' in line for line in logs.output))
+        # disabled after scanning.
+        self.assertFalse(metrics.enabled)
+        self.run_command()
+        self.assertEqual(FILTERED.value - before['django_bleak_filtered_total'], cmd.buffer.flushed)
+
+    def test_heartbeat(self):
+        BleScanEvent.objects.filter(name='ScanEvent001').update(pid=os.getpid())
+        cmd = self.run_command()
+
+        event = BleScanEvent.objects.get(name='ScanEvent001')
+        self.assertTrue(event.is_beating())
+        self.assertGreater(event.processed, 0)
+        self.assertLessEqual(event.processed, cmd.buffer.flushed)
+        self.assertLessEqual(event.processed, cmd.sessions[0].processed)
+
+    def test_latest(self):
+        self.run_command(latest=True)
+
+        # one state per device sending manufacturer data.
+        latest = BleDeviceLatest.objects.lookup(BleScanResult.objects.values_list('device_id', flat=True).distinct())
+        self.assertGreater(len(latest), 0)
+        self.assertEqual(len(latest), BleDeviceLatest.objects.count())
+        for addr, state in latest.items():
+            last = BleScanResult.objects.filter(device=addr).order_by('received_at', 'id').last()
+            self.assertEqual(state.received_at, last.received_at)
+            self.assertEqual(state.rssi, last.rssi)
@@ -0,0 +1,87 @@
+
+import asyncio
+import time
+
+import bleak as blk
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner import Command, Session
+from django_bleak.models import BleScanEvent
+from django_bleak.utils import AdvertisementBuffer
+
+
+async def flush(data_list):
+    pass
+
+
+class Test(TestCase):
+
+    dev = blk.BLEDevice(
+        '12:34:56:78:90:AB',
+        'dev-001',
+        None,
+        -50
+    )
+    adv = blk.AdvertisementData(
+        'dev-001',
+        {0xffff: b'manufacturer data'},
+        {},
+        [],
+        0,
+        -50,
+        tuple()
+    )
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, interval=0.2)
+        return super().setUpTestData()
+
+    def test_callback_not_starved(self):
+        cmd = Command()
+        session = Session('ScanEvent001', cmd)
+        cmd.sessions = [session]
+        ticks = []
+
+        async def producer(async_event: asyncio.Event):
+            while not async_event.is_set():
+                await session.callback(self.dev, self.adv)
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            cmd.buffer = AdvertisementBuffer(flush)
+            async_event = asyncio.Event()
+            task = asyncio.ensure_future(producer(async_event))
+            monitor = asyncio.ensure_future(session.monitor_task(async_event))
+            await asyncio.sleep(0.5)
+            async_event.set()
+            started = time.monotonic()
+            await monitor
+            await task
+            return time.monotonic() - started
+
+        stopped = async_to_sync(main)()
+
+        # callbacks are delivered while monitor is waiting interval.
+        self.assertGreater(len(ticks), 10)
+        self.assertEqual(cmd.buffer.received, len(ticks))
+        self.assertLess(max(b - a for a, b in zip(ticks, ticks[1:])), 0.1)
+        # monitor stops without waiting interval.
+        self.assertLess(stopped, 0.1)
+
+    def test_disabled(self):
+        BleScanEvent.objects.filter(name='ScanEvent001').update(is_enabled=False)
+        cmd = Command()
+        session = Session('ScanEvent001', cmd)
+        cmd.sessions = [session]
+
+        async def main():
+            async_event = asyncio.Event()
+            await session.monitor_task(async_event)
+            return async_event
+
+        async_event = async_to_sync(main)()
+
+        self.assertTrue(async_event.is_set())
@@ -0,0 +1,34 @@
+
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner import Command, Session
+from django_bleak.models import BleScanEvent, BleScanFilter
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True)
+        BleScanFilter.objects.create(mac_addr='12:34:56:78:90:AB')
+        return super().setUpTestData()
+
+    def test_reload(self):
+        session = Session('ScanEvent001', Command())
+        event = async_to_sync(session.reload)()
+        self.assertEqual(event.name, 'ScanEvent001')
+        self.assertEqual(len(session.filters.matcher), 1)
+
+        # version is not changed.
+        filters = session.filters
+        with self.assertNumQueries(1):
+            ret = async_to_sync(session.reload)(event)
+        self.assertIs(ret, event)
+        self.assertIs(session.filters, filters)
+
+        # version is changed.
+        BleScanFilter.objects.create(mac_addr='12:34:56:78:90:AC')
+        ret = async_to_sync(session.reload)(event)
+        self.assertIsNot(ret, event)
+        self.assertEqual(len(session.filters.matcher), 2)
@@ -0,0 +1,69 @@
+
+import asyncio
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner_interval import Command
+from django_bleak.models import BleScanEvent, BleScanFilter, BleScanResult
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, interval=0.1)
+        BleScanFilter.objects.create()
+        return super().setUpTestData()
+
+    def test_run(self):
+        cmd = Command()
+
+        def stop():
+            scan_event = BleScanEvent.objects.get(name='ScanEvent001')
+            scan_event.is_enabled = False
+            scan_event.save()
+
+        async def main():
+            # the writer thread can not see data of the test transaction.
+            task = asyncio.ensure_future(cmd.run('ScanEvent001', 0.1, batch_wait=0.05, writer='executor',
+                                                 backend='synthetic:devices=10,rate=1000'))
+            await asyncio.sleep(0.35)
+            await sync_to_async(stop)()
+            await asyncio.wait_for(task, 2.0)
+
+        async_to_sync(main)()
+
+        # discover() returns the last advertising data of each device per interval.
+        self.assertEqual(cmd.buffer.received % 10, 0)
+        self.assertGreaterEqual(cmd.buffer.received, 20)
+        self.assertEqual(BleScanResult.objects.count(), cmd.buffer.received)
+
+    def test_continuous(self):
+        cmd = Command()
+
+        def stop():
+            scan_event = BleScanEvent.objects.get(name='ScanEvent001')
+            scan_event.is_enabled = False
+            scan_event.save()
+
+        async def main():
+            task = asyncio.ensure_future(cmd.run('ScanEvent001', 0.1, batch_wait=0.05, writer='executor', continuous=True,
+                                                 backend='synthetic:devices=10,rate=1000'))
+            await asyncio.sleep(0.35)
+            await sync_to_async(stop)()
+            await asyncio.wait_for(task, 2.0)
+
+        async_to_sync(main)()
+
+        # the last advertising data of each device per interval, from one scanner.
+        self.assertEqual(cmd.buffer.received % 10, 0)
+        self.assertGreaterEqual(cmd.buffer.received, 20)
+        self.assertEqual(BleScanResult.objects.count(), cmd.buffer.received)
+        # payloads have the round of adverts, increasing across intervals without restarting.
+        rounds = {}
+        for device_id, m, s in BleScanResult.objects.order_by('id').values_list(
+                'device_id', 'manufacturer_data', 'service_data'):
+            rounds.setdefault(device_id, []).append(int.from_bytes(bytes(m or s)[:6], 'big'))
+        for values in rounds.values():
+            self.assertEqual(values, sorted(set(values)))
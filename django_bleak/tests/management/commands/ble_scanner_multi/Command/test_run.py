@@ -0,0 +1,123 @@
+
+import asyncio
+
+import bleak as blk
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.test import TestCase
+from django_bleak.management.commands.ble_scanner_multi import (
+    Command, IntervalSession, Session)
+from django_bleak.models import BleScanEvent, BleScanFilter, BleScanResult
+from django_bleak.models.scanner import format_mac_addr
+
+
+def advertise(mac_addr: str):
+    dev = blk.BLEDevice(mac_addr, 'dev-001', None, -50)
+    adv = blk.AdvertisementData('dev-001', {0xffff: b'manufacturer data'}, {}, [], 0, -50, tuple())
+    return dev, adv
+
+
+class FakeScanner:
+
+    macs = {
+        'hci0': ('12:34:56:78:90:AB', '12:34:56:78:90:CC'),
+        'hci1': ('12:34:56:78:90:AC', '12:34:56:78:90:CC'),
+    }
+    instances = []
+
+    def __init__(self, callback, **kwargs):
+        self.callback = callback
+        self.kwargs = kwargs
+        self.instances.append(self)
+
+    async def advertise(self):
+        while True:
+            for mac_addr in self.macs[self.kwargs['adapter']]:
+                await self.callback(*advertise(mac_addr))
+            await asyncio.sleep(0.01)
+
+    async def __aenter__(self):
+        self.task = asyncio.ensure_future(self.advertise())
+        return self
+
+    async def __aexit__(self, *args):
+        self.task.cancel()
+
+
+class BrokenScanner(FakeScanner):
+
+    async def __aenter__(self):
+        if self.kwargs['adapter'] == 'hci1':
+            raise OSError('adapter not found')
+        return await super().__aenter__()
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        event1 = BleScanEvent.objects.create(name='ScanEvent001', is_enabled=True, interval=0.1, adapter='hci0')
+        event2 = BleScanEvent.objects.create(name='ScanEvent002', is_enabled=True, interval=0.1, adapter='hci1')
+        BleScanFilter.objects.create(mac_addr='12:34:56:78:90:AB').events.add(event1)
+        BleScanFilter.objects.create(mac_addr='12:34:56:78:90:AC').events.add(event2)
+        return super().setUpTestData()
+
+    def setUp(self) -> None:
+        FakeScanner.instances = []
+        return super().setUp()
+
+    def run_command(self, scanner_class, seconds: float) -> Command:
+        cmd = Command()
+        cmd.scanner_class = scanner_class
+        scan_events = list(BleScanEvent.objects.order_by('name'))
+
+        def stop():
+            for scan_event in BleScanEvent.objects.all():
+                scan_event.is_enabled = False
+                scan_event.save()
+
+        async def main():
+            # the writer thread can not see data of the test transaction.
+            task = asyncio.ensure_future(cmd.run(scan_events, batch_wait=0.05, writer='executor'))
+            await asyncio.sleep(seconds)
+            await sync_to_async(stop)()
+            await asyncio.wait_for(task, 2.0)
+
+        async_to_sync(main)()
+        return cmd
+
+    def test_run(self):
+        cmd = self.run_command(FakeScanner, 0.3)
+
+        # each scan event scans with its adapter.
+        self.assertEqual(sorted(s.kwargs['adapter'] for s in FakeScanner.instances), ['hci0', 'hci1'])
+        # each scan event saves results matching its filters only.
+        devices = {format_mac_addr(d) for d in BleScanResult.objects.values_list('device', flat=True)}
+        self.assertEqual(devices, {'12:34:56:78:90:AB', '12:34:56:78:90:AC'})
+        # results of all scan events are written by one buffer.
+        self.assertEqual(cmd.buffer.received, cmd.buffer.flushed)
+        self.assertEqual(BleScanResult.objects.count(), cmd.buffer.flushed // 2)
+        self.assertFalse(BleScanEvent.objects.filter(is_enabled=True).exists())
+        # processed advertising data are counted per scan event.
+        self.assertEqual([s.processed for s in cmd.sessions], [cmd.buffer.flushed // 2] * 2)
+
+    def test_broken_adapter(self):
+        self.run_command(BrokenScanner, 0.3)
+
+        # other scan events keep scanning.
+        devices = {format_mac_addr(d) for d in BleScanResult.objects.values_list('device', flat=True)}
+        self.assertEqual(devices, {'12:34:56:78:90:AB'})
+        self.assertFalse(BleScanEvent.objects.get(name='ScanEvent002').is_enabled)
+
+    def test_scan_mode(self):
+        BleScanEvent.objects.filter(name='ScanEvent002').update(scan_mode=BleScanEvent.ModeChoices.SEQUENTIAL)
+        cmd = self.run_command(FakeScanner, 0.3)
+
+        self.assertIsInstance(cmd.sessions[0], IntervalSession)
+        self.assertNotIsInstance(cmd.sessions[1], IntervalSession)
+        self.assertIsInstance(cmd.sessions[1], Session)
+        # interval mode saves the last data of a device per interval, and sequential mode saves every data.
+        interval = BleScanResult.objects.filter(device='12:34:56:78:90:AB').count()
+        sequential = BleScanResult.objects.filter(device='12:34:56:78:90:AC').count()
+        self.assertLessEqual(interval, 4)
+        self.assertGreater(sequential, interval)
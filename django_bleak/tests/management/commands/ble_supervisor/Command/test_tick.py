@@ -0,0 +1,171 @@
+
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.management.commands.ble_supervisor import Command
+from django_bleak.models import BleScanCommand, BleScanEvent
+
+
+class FakeProcess:
+
+    pids = iter(range(1000, 2000))
+
+    def __init__(self, args):
+        self.args = args
+        self.pid = next(self.pids)
+        self.returncode = None
+        self.signals = []
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.signals.append('terminate')
+
+    def kill(self):
+        self.signals.append('kill')
+
+
+@mock.patch('subprocess.Popen', FakeProcess)
+class Test(TestCase):
+
+    def setUp(self):
+        BleScanEvent.objects.create(name='ScanEvent001', scan_mode=BleScanEvent.ModeChoices.SEQUENTIAL)
+        BleScanEvent.objects.create(name='ScanEvent002', scan_mode=BleScanEvent.ModeChoices.INTERVAL)
+        self.cmd = Command()
+        self.cmd.manage_py = 'manage.py'
+        self.cmd.scanner_args = ['--batch-size', '500']
+
+    def test_start(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent002'])
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001', 'ScanEvent003', 'ScanEvent004'])
+        self.cmd.tick(0.0)
+
+        self.assertEqual([m.proc.args[2:] for m in self.cmd.managed], [
+            ['ble_scanner', 'ScanEvent001', '--batch-size', '500'],
+            ['ble_scanner_interval', 'ScanEvent002', '--batch-size', '500'],
+            # ScanEvent001 is already supervised.
+            ['ble_scanner_multi', 'ScanEvent003', 'ScanEvent004', '--batch-size', '500'],
+        ])
+        self.assertFalse(BleScanCommand.objects.pending().exists())
+
+        # all are already supervised.
+        command = BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent002'])
+        self.cmd.tick(1.0)
+        command.refresh_from_db()
+        self.assertIsNotNone(command.processed_at)
+        self.assertEqual(command.error, 'scan events are already supervised.')
+        self.assertEqual(len(self.cmd.managed), 3)
+
+    def test_restart(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        self.cmd.tick(0.0)
+        m = self.cmd.managed[0]
+
+        # restarted with exponential backoff.
+        for now, backoff in ((1.0, 1.0), (3.0, 2.0), (6.0, 4.0)):
+            m.proc.returncode = 1
+            self.cmd.tick(now)
+            self.assertIsNone(m.proc)
+            self.assertEqual(m.backoff, backoff)
+            self.cmd.tick(now + backoff - 0.5)
+            self.assertIsNone(m.proc)
+            self.cmd.tick(now + backoff)
+            self.assertIsNotNone(m.proc)
+        self.assertEqual(m.restarts, 3)
+
+        # backoff is reset after running long enough.
+        m.proc.returncode = 1
+        self.cmd.tick(10.0 + self.cmd.backoff_reset)
+        self.assertEqual(m.backoff, 1.0)
+
+    def test_finish(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        self.cmd.tick(0.0)
+        # stopped by is_enabled.
+        self.cmd.managed[0].proc.returncode = 0
+        self.cmd.tick(1.0)
+        self.assertEqual(self.cmd.managed, [])
+
+    def test_stop(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001', 'ScanEvent002'])
+        self.cmd.tick(0.0)
+        m = self.cmd.managed[0]
+        proc = m.proc
+        BleScanEvent.objects.update(is_enabled=True, pid=proc.pid, create_time=1.0)
+
+        # ble_scanner_multi keeps scanning ScanEvent002.
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.STOP, ['ScanEvent001'])
+        self.cmd.tick(1.0)
+        self.assertEqual(m.events, ['ScanEvent002'])
+        self.assertIsNone(m.stop_deadline)
+        self.assertFalse(BleScanEvent.objects.get(name='ScanEvent001').is_enabled)
+
+        # terminated if not stopped in time, then killed.
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.STOP, ['ScanEvent002'])
+        self.cmd.tick(2.0)
+        self.assertEqual(m.stop_deadline, 2.0 + self.cmd.stop_timeout)
+        self.cmd.tick(2.0 + self.cmd.stop_timeout)
+        self.assertEqual(proc.signals, ['terminate'])
+        self.cmd.tick(2.0 + self.cmd.stop_timeout * 2)
+        self.assertEqual(proc.signals, ['terminate', 'kill'])
+
+        # scan events are released, and not restarted.
+        proc.returncode = -9
+        self.cmd.tick(3.0 + self.cmd.stop_timeout * 2)
+        self.assertEqual(self.cmd.managed, [])
+        self.assertFalse(BleScanEvent.objects.filter(pid=proc.pid).exists())
+
+    def test_stop_waiting(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        self.cmd.tick(0.0)
+        self.cmd.managed[0].proc.returncode = 1
+        self.cmd.tick(0.5)
+        # not restarted after stopped.
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.STOP, ['ScanEvent001'])
+        self.cmd.tick(0.6)
+        self.assertEqual(self.cmd.managed, [])
+
+    def test_stalled(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        self.cmd.tick(0.0)
+        m = self.cmd.managed[0]
+        proc = m.proc
+        stale = timezone.now() - datetime.timedelta(seconds=60)
+        BleScanEvent.objects.filter(name='ScanEvent001').update(
+            is_enabled=True, pid=proc.pid, create_time=1.0, last_heartbeat=stale)
+
+        # not checked while starting.
+        self.cmd.tick(1.0)
+        self.assertEqual(proc.signals, [])
+
+        # terminated, then killed.
+        now = self.cmd.startup_grace
+        self.cmd.tick(now)
+        self.assertEqual(proc.signals, ['terminate'])
+        self.cmd.tick(now + 1.0)
+        self.assertEqual(proc.signals, ['terminate'])
+        self.cmd.tick(now + self.cmd.stop_timeout)
+        self.assertEqual(proc.signals, ['terminate', 'kill'])
+
+        # released and restarted.
+        proc.returncode = -9
+        self.cmd.tick(now + self.cmd.stop_timeout + 1.0)
+        self.assertIsNone(BleScanEvent.objects.get(name='ScanEvent001').last_heartbeat)
+        self.assertIsNone(m.proc)
+        self.assertIsNone(m.kill_at)
+        self.assertEqual(m.restarts, 1)
+        self.cmd.tick(now + self.cmd.stop_timeout + 2.0)
+        self.assertIsNotNone(m.proc)
+
+    def test_beating(self):
+        BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        self.cmd.tick(0.0)
+        proc = self.cmd.managed[0].proc
+        BleScanEvent.objects.filter(name='ScanEvent001').update(
+            is_enabled=True, pid=proc.pid, create_time=1.0, last_heartbeat=timezone.now())
+        self.cmd.tick(self.cmd.startup_grace)
+        self.assertEqual(proc.signals, [])
@@ -0,0 +1,13 @@
+
+import datetime
+
+from django.test import SimpleTestCase
+from django_bleak.models import BleScanBucket
+
+
+class Test(SimpleTestCase):
+
+    def test_truncate(self):
+        jst = datetime.timezone(datetime.timedelta(hours=9))
+        self.assertEqual(BleScanBucket.truncate(datetime.datetime(2023, 1, 1, 21, 34, 56, 789, tzinfo=jst)),
+                         datetime.datetime(2023, 1, 1, 12, 34, tzinfo=datetime.timezone.utc))
@@ -0,0 +1,70 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import (BleScanBucket, BleScanDecoded, BleScanDevice,
+                                 BleScanResult, BleScanRollup, BleScanVersion)
+from django_bleak.utils.columnar import COLUMNS
+
+BASE = datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        self.devs = [BleScanDevice.objects.create(mac_addr=f'12:34:56:78:90:{i:02X}') for i in range(2)]
+        self.results = BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=seconds), device=dev,
+                          local_name='dev', company_code=0xffff, manufacturer_data=bytes([seconds % 3]),
+                          tx_power=-8, rssi=-50 - seconds % 7)
+            for seconds in range(0, 150, 10) for dev in self.devs
+        ])
+
+    def values(self, results):
+        return [(str(r.device_id), *(getattr(r, f) for f in COLUMNS)) for r in results]
+
+    def test_compact(self):
+        expected = self.values(BleScanResult.objects.filter(received_at__lt=BASE + datetime.timedelta(minutes=2))
+                               .order_by('received_at', 'id'))
+        BleScanDecoded.objects.create(result_id=self.results[0].id, format='test', name='value', value=1)
+
+        # cut off at the bucket start. small chunks split buckets.
+        compacted = BleScanBucket.objects.compact(BASE + datetime.timedelta(seconds=125), chunk_size=5)
+        self.assertEqual(compacted, len(expected))
+        self.assertEqual(BleScanBucket.objects.count(), 4)
+        self.assertEqual(BleScanResult.objects.count(), len(self.results) - len(expected))
+        self.assertFalse(BleScanResult.objects.filter(received_at__lt=BASE + datetime.timedelta(minutes=2)).exists())
+        # decoded fields are kept with ids.
+        self.assertTrue(BleScanDecoded.objects.filter(result_id=self.results[0].id).exists())
+
+        bucket = BleScanBucket.objects.get(device=self.devs[0], bucket=BASE)
+        self.assertEqual(bucket.count, 6)
+        self.assertEqual(bucket.first_id, self.results[0].id)
+        unpacked = sorted((r for b in BleScanBucket.objects.all() for r in b.results()),
+                          key=lambda r: (r.received_at, r.id))
+        self.assertEqual(self.values(unpacked), expected)
+        # nothing left to compact.
+        self.assertEqual(BleScanBucket.objects.compact(BASE + datetime.timedelta(seconds=125)), 0)
+
+    def test_max_chunks(self):
+        self.assertEqual(BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=3),
+                                                       chunk_size=4, max_chunks=2), 8)
+
+    def test_rollup(self):
+        # results not rolled up are kept.
+        BleScanVersion.objects.create(name=BleScanRollup.WATERMARK, version=self.results[3].id)
+        self.assertEqual(BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=3)), 4)
+
+    def test_unordered(self):
+        # imported results are older than saved ones.
+        BleScanResult.objects.mark_unordered()
+        imported = BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE - datetime.timedelta(seconds=seconds), device=self.devs[0], rssi=-60)
+            for seconds in (5, 65)
+        ])
+        compacted = BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=1))
+
+        self.assertEqual(compacted, 6 * 2 + len(imported))
+        self.assertFalse(BleScanResult.objects.filter(received_at__lt=BASE + datetime.timedelta(minutes=1)).exists())
+        self.assertEqual([r.id for r in BleScanBucket.objects.results(self.devs[0], BASE - datetime.timedelta(minutes=2), BASE)],
+                         [imported[1].id, imported[0].id])
@@ -0,0 +1,30 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import (BleScanBucket, BleScanDecoded, BleScanDevice,
+                                 BleScanResult)
+
+BASE = datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_prune(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        results = BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=minutes), device=dev, rssi=-50)
+            for minutes in range(5)
+        ])
+        for r in results:
+            BleScanDecoded.objects.create(result_id=r.id, format='test', name='value', value=1)
+        BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=4))
+
+        archived = []
+        deleted = BleScanBucket.objects.prune(BASE + datetime.timedelta(minutes=2, seconds=30),
+                                              chunk_size=1, archive=archived.extend)
+        self.assertEqual(deleted, 2)
+        self.assertEqual([r.id for r in archived], [r.id for r in results[:2]])
+        self.assertEqual(BleScanBucket.objects.count(), 2)
+        self.assertEqual(sorted(BleScanDecoded.objects.values_list('result_id', flat=True)),
+                         [r.id for r in results[2:]])
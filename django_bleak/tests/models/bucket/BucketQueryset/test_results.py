@@ -0,0 +1,30 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import BleScanBucket, BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_results(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        other = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:CD')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=seconds), device=d,
+                          company_code=0xffff, manufacturer_data=b'\x01', rssi=-50)
+            for seconds in range(0, 180, 15) for d in (dev, other)
+        ])
+        expected = [(r.id, r.received_at) for r in BleScanResult.objects.filter(device=dev).order_by('received_at')]
+        BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=2))
+
+        # packed and saved results in one range.
+        start, end = BASE + datetime.timedelta(seconds=20), BASE + datetime.timedelta(seconds=150)
+        with self.assertNumQueries(2):
+            results = list(BleScanBucket.objects.results('12:34:56:78:90:AB', start, end))
+        self.assertEqual([(r.id, r.received_at) for r in results],
+                         [e for e in expected if start <= e[1] < end])
+        self.assertEqual({bytes(r.manufacturer_data) for r in results}, {b'\x01'})
+        self.assertEqual({str(r.device_id) for r in results}, {str(dev.mac_addr)})
@@ -0,0 +1,29 @@
+
+import datetime
+
+from django.test import SimpleTestCase
+from django_bleak.models import BleScanRollup
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(SimpleTestCase):
+
+    def test_add(self):
+        obj = BleScanRollup(count=1, rssi_min=-50, rssi_max=-50, rssi_sum=-50,
+                            last_received_at=BASE, last_payload=b'1')
+        obj.add(2, -70, -40, -110, BASE + datetime.timedelta(seconds=1), b'2')
+
+        self.assertEqual(obj.count, 3)
+        self.assertEqual(obj.rssi_min, -70)
+        self.assertEqual(obj.rssi_max, -40)
+        self.assertEqual(obj.rssi_avg, -160 / 3)
+        self.assertEqual(obj.last_payload, b'2')
+
+    def test_add_older(self):
+        obj = BleScanRollup(count=1, rssi_min=-50, rssi_max=-50, rssi_sum=-50,
+                            last_received_at=BASE, last_payload=b'1')
+        obj.add(1, -60, -60, -60, BASE - datetime.timedelta(seconds=1), b'0')
+
+        self.assertEqual(obj.last_received_at, BASE)
+        self.assertEqual(obj.last_payload, b'1')
@@ -0,0 +1,23 @@
+
+import datetime
+
+from django.test import SimpleTestCase
+from django_bleak.models import BleScanRollup
+
+UTC = datetime.timezone.utc
+
+
+class Test(SimpleTestCase):
+
+    def test_minute(self):
+        dt = datetime.datetime(2023, 1, 2, 12, 34, 56, 789, tzinfo=UTC)
+
+        self.assertEqual(BleScanRollup.truncate(dt, BleScanRollup.Period.MINUTE),
+                         datetime.datetime(2023, 1, 2, 12, 34, tzinfo=UTC))
+
+    def test_hour_utc(self):
+        jst = datetime.timezone(datetime.timedelta(hours=9))
+        dt = datetime.datetime(2023, 1, 2, 12, 34, 56, tzinfo=jst)
+
+        self.assertEqual(BleScanRollup.truncate(dt, BleScanRollup.Period.HOUR),
+                         datetime.datetime(2023, 1, 2, 3, tzinfo=UTC))
@@ -0,0 +1,29 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import BleScanDevice, BleScanRollup
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanRollup.objects.bulk_create([
+            BleScanRollup(period=period, bucket=BASE + datetime.timedelta(hours=i), device=dev,
+                          count=1, rssi_min=-50, rssi_max=-50, rssi_sum=-50, last_received_at=BASE)
+            for period in BleScanRollup.Period
+            for i in range(48)
+        ])
+        return super().setUpTestData()
+
+    def test_auto_period(self):
+        ret = BleScanRollup.objects.series('12:34:56:78:90:AB', BASE, BASE + datetime.timedelta(hours=2))
+        self.assertEqual([obj.period for obj in ret], [BleScanRollup.Period.MINUTE] * 2)
+
+        ret = BleScanRollup.objects.series('12:34:56:78:90:AB', BASE, BASE + datetime.timedelta(days=2))
+        self.assertEqual(len(ret), 48)
+        self.assertEqual(ret[0].period, BleScanRollup.Period.HOUR)
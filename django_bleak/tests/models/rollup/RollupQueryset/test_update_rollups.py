@@ -0,0 +1,96 @@
+
+import datetime
+import uuid
+from unittest import mock
+
+from django.db import IntegrityError, models, transaction
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models import (BleScanDevice, BleScanResult, BleScanRollup,
+                                 BleScanVersion)
+
+BASE = datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def create(self, dev, seconds, rssi, payload=b'\x01', company_code=0xffff):
+        return BleScanResult.objects.create(received_at=BASE + datetime.timedelta(seconds=seconds), device=dev,
+                                            company_code=company_code, manufacturer_data=payload, rssi=rssi)
+
+    def test_incremental(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.create(dev, 0, -50)
+        self.create(dev, 30, -70, b'\x02')
+        self.create(dev, 60, -60)
+        self.create(dev, 0, -40, company_code=0x0001)
+
+        self.assertEqual(BleScanRollup.objects.update_rollups(), 4)
+        self.assertEqual(BleScanRollup.objects.update_rollups(), 0)
+        minute = BleScanRollup.objects.get(period=BleScanRollup.Period.MINUTE, bucket=BASE, company_code=0xffff)
+        self.assertEqual(minute.count, 2)
+        self.assertEqual(minute.rssi_min, -70)
+        self.assertEqual(minute.rssi_max, -50)
+        self.assertEqual(minute.rssi_avg, -60)
+        self.assertEqual(bytes(minute.last_payload), b'\x02')
+        hour = BleScanRollup.objects.get(period=BleScanRollup.Period.HOUR, bucket=BASE, company_code=0xffff)
+        self.assertEqual(hour.count, 3)
+
+        # merged into saved rollups.
+        last = self.create(dev, 90, -80)
+        self.assertEqual(BleScanRollup.objects.update_rollups(), 1)
+        self.assertEqual(BleScanVersion.get_version(BleScanRollup.WATERMARK), last.id)
+        hour.refresh_from_db()
+        self.assertEqual(hour.count, 4)
+        self.assertEqual(hour.rssi_min, -80)
+        self.assertEqual(BleScanRollup.objects.filter(period=BleScanRollup.Period.MINUTE).count(), 3)
+
+    def test_chunks(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        for i in range(5):
+            self.create(dev, i, -50)
+
+        self.assertEqual(BleScanRollup.objects.update_rollups(chunk_size=2, max_chunks=1), 2)
+        self.assertEqual(BleScanRollup.objects.update_rollups(chunk_size=2), 3)
+        self.assertEqual(BleScanRollup.objects.get(period=BleScanRollup.Period.MINUTE).count, 5)
+
+    def test_lag(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.create(dev, 0, -50)
+        BleScanResult.objects.create(received_at=timezone.now(), device=dev, rssi=-50)
+        self.create(dev, 1, -50)
+
+        # stop at recent result.
+        self.assertEqual(BleScanRollup.objects.update_rollups(), 1)
+
+    def test_lock_watermark(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.create(dev, 0, -50)
+        select_for_update = models.QuerySet.select_for_update
+        locked = []
+
+        def spy(qs, *args, **kwargs):
+            locked.append(qs.model)
+            return select_for_update(qs, *args, **kwargs)
+
+        with mock.patch.object(models.QuerySet, 'select_for_update', autospec=True, side_effect=spy):
+            self.assertEqual(BleScanRollup.objects.update_rollups(), 1)
+
+        self.assertEqual(locked, [BleScanVersion])
+        self.assertEqual(BleScanVersion.get_version(BleScanRollup.WATERMARK), BleScanResult.objects.get().id)
+
+    def test_unique(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        service_uuid = uuid.UUID('0000fe9a-0000-1000-8000-00805f9b34fb')
+        values = dict(period=BleScanRollup.Period.MINUTE, bucket=BASE, device=dev,
+                      count=1, rssi_min=-50, rssi_max=-50, rssi_sum=-50, last_received_at=BASE)
+        BleScanRollup.objects.create(company_code=0xffff, **values)
+        BleScanRollup.objects.create(service_uuid=service_uuid, **values)
+        # other keys.
+        BleScanRollup.objects.create(company_code=0x0001, **values)
+        BleScanRollup.objects.create(service_uuid=uuid.uuid4(), **values)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            BleScanRollup.objects.create(company_code=0xffff, **values)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            BleScanRollup.objects.create(service_uuid=service_uuid, **values)
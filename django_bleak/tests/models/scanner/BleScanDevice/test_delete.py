@@ -0,0 +1,26 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models.bucket import BleScanBucket
+from django_bleak.models.scanner import (BleScanDecoded, BleScanDevice,
+                                         BleScanResult)
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_decoded(self):
+        devs = [BleScanDevice.objects.create(mac_addr=f'12:34:56:78:90:A{i}') for i in range(2)]
+        results = BleScanResult.objects.bulk_create(
+            [BleScanResult(received_at=BASE + datetime.timedelta(minutes=i), device=devs[i % 2], rssi=-50)
+             for i in range(6)])
+        BleScanDecoded.objects.bulk_create(
+            [BleScanDecoded(result_id=r.id, format='ibeacon', name='major', value=1) for r in results])
+        # results compacted into buckets keep their decoded fields.
+        BleScanBucket.objects.compact(BASE + datetime.timedelta(minutes=2))
+        devs[0].delete()
+
+        self.assertEqual(sorted(BleScanDecoded.objects.values_list('result_id', flat=True)),
+                         [r.id for r in results[1::2]])
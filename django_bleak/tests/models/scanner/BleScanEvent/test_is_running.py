@@ -14,6 +14,8 @@ class Test(TestCase):
             self.assertTrue(obj.is_running)
         with patch('django_bleak.models.scanner.BleScanEvent.status', property(lambda self: BleScanEvent.Status.ZOMBIE)):
             self.assertTrue(obj.is_running)
+        with patch('django_bleak.models.scanner.BleScanEvent.status', property(lambda self: BleScanEvent.Status.STALLED)):
+            self.assertTrue(obj.is_running)
 
     def test_false(self):
         obj = BleScanEvent()
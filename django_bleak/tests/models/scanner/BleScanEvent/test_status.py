@@ -1,22 +1,28 @@
 
-
+import datetime
 from unittest.mock import patch
 
 from django.test import TestCase
+from django.utils import timezone
 from django_bleak.models import BleScanEvent
 
 
 class Test(TestCase):
     """
-        No | pid   | is_running | is_enabled | Return
-        01 | null  |            |          t | Error
-        02 | null  |            |          f | Waitting
-        03 | reuse |          f |            | Killed
-        04 | me    |          t |          f | Zombie
-        05 | me    |          t |          t | Running
+        No | pid   | heartbeat | is_running | is_enabled | Return
+        01 | null  |           |            |          t | Error
+        02 | null  |           |            |          f | Waitting
+        03 | me    | fresh     |            |          f | Zombie
+        04 | me    | fresh     |            |          t | Running
+        05 | reuse | not fresh |          f |            | Killed
+        06 | me    | stale     |          t |            | Stalled
+        07 | me    | null      |          t |          f | Zombie
+        08 | me    | null      |          t |          t | Running
     """
 
     def test_all(self):
+        fresh = timezone.now()
+        stale = fresh - datetime.timedelta(seconds=60)
         with patch('django_bleak.models.scanner.psutil.Process.is_running') as mock:
             # 01
             self.assertEqual(BleScanEvent(is_enabled=True).status,
@@ -25,17 +31,36 @@ class Test(TestCase):
             self.assertEqual(BleScanEvent(is_enabled=False).status,
                              BleScanEvent.Status.WAITTING)
             # 03
+            self.assertEqual(BleScanEvent(pid=1, is_enabled=False, last_heartbeat=fresh).status,
+                             BleScanEvent.Status.ZOMBIE)
+            # 04
+            self.assertEqual(BleScanEvent(pid=1, is_enabled=True, last_heartbeat=fresh).status,
+                             BleScanEvent.Status.RUNNING)
+            # the process is not probed with a fresh heartbeat.
+            mock.assert_not_called()
+            # 05
             mock.return_value = False
             self.assertEqual(BleScanEvent(pid=1, is_enabled=False).status,
                              BleScanEvent.Status.KILLED)
-            mock.return_value = False
-            self.assertEqual(BleScanEvent(pid=1, is_enabled=True).status,
+            self.assertEqual(BleScanEvent(pid=1, is_enabled=True, last_heartbeat=stale).status,
                              BleScanEvent.Status.KILLED)
-            # 04
+            # 06
             mock.return_value = True
+            self.assertEqual(BleScanEvent(pid=1, is_enabled=True, last_heartbeat=stale).status,
+                             BleScanEvent.Status.STALLED)
+            # 07
             self.assertEqual(BleScanEvent(pid=1, is_enabled=False).status,
                              BleScanEvent.Status.ZOMBIE)
-            # 05
-            mock.return_value = True
+            # 08
             self.assertEqual(BleScanEvent(pid=1, is_enabled=True).status,
                              BleScanEvent.Status.RUNNING)
+
+    def test_heartbeat_timeout(self):
+        stale = timezone.now() - datetime.timedelta(seconds=20)
+        with patch('django_bleak.models.scanner.psutil.Process.is_running', return_value=True):
+            # at least MIN_HEARTBEAT_TIMEOUT.
+            self.assertEqual(BleScanEvent(pid=1, interval=1.0, last_heartbeat=stale).status,
+                             BleScanEvent.Status.STALLED)
+            # HEARTBEAT_MISSES intervals.
+            self.assertEqual(BleScanEvent(pid=1, interval=10.0, last_heartbeat=stale).status,
+                             BleScanEvent.Status.ZOMBIE)
@@ -0,0 +1,24 @@
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from django_bleak.models.scanner import BleScanFilter
+
+
+class Test(SimpleTestCase):
+
+    def test_clean(self):
+        BleScanFilter(manufacturer_prefix='0215', manufacturer_mask='ffff').clean()
+        BleScanFilter(service_prefix='00').clean()
+
+    def test_mask_length(self):
+        with self.assertRaises(ValidationError) as cm:
+            BleScanFilter(manufacturer_prefix='0215', manufacturer_mask='ff').clean()
+        self.assertIn('manufacturer_mask', cm.exception.error_dict)
+        with self.assertRaises(ValidationError) as cm:
+            BleScanFilter(service_mask='ff').clean()
+        self.assertIn('service_mask', cm.exception.error_dict)
+
+    def test_hex(self):
+        with self.assertRaises(ValidationError) as cm:
+            BleScanFilter(manufacturer_prefix='021').clean_fields()
+        self.assertIn('manufacturer_prefix', cm.exception.error_dict)
@@ -98,3 +98,31 @@ class Test(TestCase):
         ret = self.filter.is_match((self.dev, self.adv))
 
         self.assertFalse(ret)
+
+    def test_true_manufacturer_prefix(self):
+        # b'manu' is 6d616e75
+        self.filter.manufacturer_prefix = '6d616e75'
+        self.assertTrue(self.filter.is_match((self.dev, self.adv)))
+
+    def test_false_manufacturer_prefix(self):
+        self.filter.manufacturer_prefix = '6d616e76'
+        self.assertFalse(self.filter.is_match((self.dev, self.adv)))
+
+    def test_manufacturer_mask(self):
+        self.filter.manufacturer_prefix = '6d006e00'
+        self.filter.manufacturer_mask = 'ff00ff00'
+        self.assertTrue(self.filter.is_match((self.dev, self.adv)))
+
+        self.filter = BleScanFilter(manufacturer_prefix='6d006e00', manufacturer_mask='ffffff00')
+        self.assertFalse(self.filter.is_match((self.dev, self.adv)))
+
+    def test_false_manufacturer_prefix_longer(self):
+        self.filter.manufacturer_prefix = (b'manufacturer data' + b'\x00').hex()
+        self.filter.manufacturer_mask = 'ff' * 18
+        self.assertFalse(self.filter.is_match((self.dev, self.adv)))
+
+    def test_service_prefix(self):
+        # b'serv' is 73657276
+        self.assertTrue(BleScanFilter(service_prefix='73657276').is_match((self.dev, self.adv)))
+        self.assertTrue(BleScanFilter(service_prefix='70', service_mask='F0').is_match((self.dev, self.adv)))
+        self.assertFalse(BleScanFilter(service_prefix='00').is_match((self.dev, self.adv)))
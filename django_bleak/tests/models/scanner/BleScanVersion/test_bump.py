@@ -0,0 +1,29 @@
+
+from django.test import TestCase
+from django_bleak.models.scanner import (BleScanDevice, BleScanEvent,
+                                         BleScanFilter, BleScanVersion)
+
+
+class Test(TestCase):
+
+    def test_bump(self):
+        self.assertEqual(BleScanVersion.get_version('test'), 0)
+        BleScanVersion.bump('test')
+        self.assertEqual(BleScanVersion.get_version('test'), 1)
+        BleScanVersion.bump('test')
+        self.assertEqual(BleScanVersion.get_version('test'), 2)
+
+    def test_signals(self):
+        name = BleScanVersion.SCANNER
+        obj = BleScanFilter.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.assertEqual(BleScanVersion.get_version(name), 1)
+        obj.delete()
+        self.assertEqual(BleScanVersion.get_version(name), 2)
+        obj = BleScanEvent.objects.create(name='ScanEvent001')
+        self.assertEqual(BleScanVersion.get_version(name), 3)
+        obj.delete()
+        self.assertEqual(BleScanVersion.get_version(name), 4)
+        obj = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        self.assertEqual(BleScanVersion.get_version(name), 4)
+        obj.delete()
+        self.assertEqual(BleScanVersion.get_version(name), 5)
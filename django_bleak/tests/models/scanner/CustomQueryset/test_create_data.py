@@ -1,20 +1,45 @@
 
-from contextlib import ExitStack
+from contextlib import ExitStack, contextmanager
 from unittest.mock import patch
 
 import bleak as blk
 
+from django.db import IntegrityError
 from django.test import TestCase
-from django_bleak.models.scanner import (BleScanDevice, BleScanResult,
-                                         CustomQueryset)
+from django_bleak.models.scanner import (BleDeviceLatest, BlePresence,
+                                         BleScanDecoded, BleScanDevice,
+                                         BleScanResult, CustomQueryset,
+                                         ResultQueryset, device_cache)
+from django_bleak.utils import Deduplicator
+from django_bleak.utils.decoders import registry
+from django_bleak.utils.presence import PresenceTracker
+from django_bleak.utils.rssi import RssiSmoother
+
+
+@contextmanager
+def fail_once(cls, name: str):
+    # IntegrityError by a device deleted by other process, and succeed when retried.
+    method = getattr(cls, name)
+    calls = []
+
+    def side_effect(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise IntegrityError
+        return method(*args, **kwargs)
+
+    with patch.object(cls, name, autospec=True, side_effect=side_effect):
+        yield
 
 
 class MockModel:
 
+    mac_addr = local_name = service_uuid = company_code = manufacturer_data = service_data = None
+
     def __init__(self, is_match):
         self.__is_match = is_match
 
-    def is_match(self, data):
+    def is_match(self, data, payload_hex=None):
         return self.__is_match
 
 
@@ -26,6 +51,7 @@ class Test(TestCase):
 
     def tearDown(self) -> None:
         self.stack.close()
+        device_cache.clear()
         return super().tearDown()
 
     def test_data_list_empty(self):
@@ -216,3 +242,211 @@ class Test(TestCase):
         CustomQueryset().create_data([(dev, adv)])
 
         self.assertEqual(BleScanDevice.objects.count(), 1)
+
+    def test_device_cache(self):
+        dev = blk.BLEDevice(
+            '12:34:56:78:90:AB',
+            'dev-001',
+            None,
+            -50
+        )
+        adv = blk.AdvertisementData(
+            'dev-001',
+            {0xffff: b'manufacturer data'},
+            {},
+            [],
+            0,
+            -50,
+            tuple()
+        )
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        qs = CustomQueryset()
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv)])
+        self.assertIn('12:34:56:78:90:AB', device_cache)
+        self.assertEqual(device_cache.misses, 1)
+
+        with self.assertNumQueries(3):
+            # savepoint, insert results and release savepoint.
+            qs.create_data([(dev, adv)])
+        self.assertEqual(device_cache.hits, 1)
+        self.assertEqual(BleScanResult.objects.count(), 2)
+
+        BleScanDevice.objects.get(mac_addr='12:34:56:78:90:AB').delete()
+        self.assertNotIn('12:34:56:78:90:AB', device_cache)
+
+    def test_retry_integrity_error(self):
+        device_cache.add(['12:34:56:78:90:AB'])
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset._create_data',
+                side_effect=[IntegrityError, []]
+            )
+        )
+        ret = CustomQueryset().create_data([])
+
+        self.assertEqual(ret, [])
+        self.assertEqual(len(device_cache), 0)
+
+    def test_dedup(self):
+        dev = blk.BLEDevice(
+            '12:34:56:78:90:AB',
+            'dev-001',
+            None,
+            -50
+        )
+        adv = blk.AdvertisementData(
+            'dev-001',
+            {0xffff: b'manufacturer data'},
+            {'01234567-0123-0123-0123-0123456789AB': b'service data'},
+            ['01234567-0123-0123-0123-0123456789AB'],
+            0,
+            -50,
+            tuple()
+        )
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        dedup = Deduplicator(60.0)
+        qs = CustomQueryset()
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv), (dev, adv)], dedup=dedup)
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv)], dedup=dedup)
+
+        self.assertEqual(BleScanResult.objects.count(), 2)
+        self.assertEqual(dedup.report(), (2, 4))
+
+    def test_decoders(self):
+        dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+        ibeacon = bytes.fromhex('0215' 'e2c56db5dffb48d2b060d0f5a71096e0' '0001' '0002' 'c5')
+        adv = blk.AdvertisementData('dev-001', {0x004c: ibeacon}, {}, [], 0, -50, tuple())
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            CustomQueryset().create_data([(dev, adv)], decoders=registry)
+
+        result = BleScanResult.objects.get()
+        self.assertEqual({d.name: d.value for d in result.decoded.filter(value__isnull=False)},
+                         {'major': 1, 'minor': 2, 'tx_power': -59})
+        self.assertEqual(BleScanDecoded.objects.get(name='uuid').text, 'e2c56db5dffb48d2b060d0f5a71096e0')
+
+    def test_presence(self):
+        dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+        adv = blk.AdvertisementData('dev-001', {0xffff: b'data'}, {}, [], 0, -50, tuple())
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        presence = PresenceTracker(60.0)
+        dedup = Deduplicator(60.0)
+        qs = CustomQueryset()
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv), (dev, adv)], dedup=dedup, presence=presence)
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv)], dedup=dedup, presence=presence)
+
+        # advertising data suppressed by dedup still update presence.
+        self.assertEqual(BleScanResult.objects.count(), 1)
+        self.assertEqual(presence.get('12:34:56:78:90:AB').count, 3)
+        presence_obj = BlePresence.objects.get()
+        self.assertEqual(presence_obj.left_at, None)
+        self.assertEqual(presence_obj.device_id, BleScanDevice.objects.get().mac_addr)
+
+    def test_presence_retried(self):
+        dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+        adv = blk.AdvertisementData('dev-001', {0xffff: b'data'}, {}, [], 0, -50, tuple())
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        self.stack.enter_context(fail_once(ResultQueryset, 'bulk_create'))
+        presence = PresenceTracker(60.0)
+        with self.captureOnCommitCallbacks(execute=True):
+            CustomQueryset().create_data([(dev, adv), (dev, adv)], presence=presence)
+
+        # states are updated once by the committed batch.
+        presence_obj = BlePresence.objects.get()
+        state = presence.get('12:34:56:78:90:AB')
+        self.assertEqual(state.count, 2)
+        self.assertEqual(state.saved_id, presence_obj.id)
+
+    def test_smoother(self):
+        dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+        adv1 = blk.AdvertisementData('dev-001', {0xffff: b'data'}, {'01234567-0123-0123-0123-0123456789AB': b'data'},
+                                     ['01234567-0123-0123-0123-0123456789AB'], 0, -50, tuple())
+        adv2 = adv1._replace(rssi=-70)
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            CustomQueryset().create_data([(dev, adv1), (dev, adv2)], smoother=RssiSmoother(0.5))
+
+        # smoothed once per advertising data, not per manufacturer/service data.
+        self.assertEqual(sorted(BleScanResult.objects.values_list('rssi', 'rssi_smoothed')),
+                         [(-70.0, -60.0), (-70.0, -60.0), (-50.0, -50.0), (-50.0, -50.0)])
+
+    def test_smoother_retried(self):
+        dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+        adv1 = blk.AdvertisementData('dev-001', {0xffff: b'data'}, {}, [], 0, -50, tuple())
+        adv2 = adv1._replace(rssi=-70)
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        self.stack.enter_context(fail_once(ResultQueryset, 'bulk_create'))
+        smoother = RssiSmoother(0.5)
+        with self.captureOnCommitCallbacks(execute=True):
+            CustomQueryset().create_data([(dev, adv1), (dev, adv2)], smoother=smoother)
+
+        # rolled back advertising data are not smoothed twice.
+        self.assertEqual(sorted(BleScanResult.objects.values_list('rssi_smoothed', flat=True)), [-60.0, -50.0])
+        self.assertEqual(smoother.update([('12:34:56:78:90:AB', -60.0)]), [-60.0])
+
+    def test_latest(self):
+        dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+        adv1 = blk.AdvertisementData('dev-001', {0xffff: b'data1'}, {}, [], 0, -50, tuple())
+        adv2 = blk.AdvertisementData('dev-002', {}, {'01234567-0123-0123-0123-0123456789ab': b'data2'},
+                                     ['01234567-0123-0123-0123-0123456789ab'], None, -60, tuple())
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True)])
+            )
+        )
+        dedup = Deduplicator(60.0)
+        qs = CustomQueryset()
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv1), (dev, adv2)], dedup=dedup, latest=True)
+        latest = BleDeviceLatest.objects.get()
+        self.assertEqual((latest.local_name, latest.company_code, latest.rssi), ('dev-002', None, -60))
+        self.assertEqual(bytes(latest.service_data), b'data2')
+
+        # advertising data suppressed by dedup still update the latest state.
+        with self.captureOnCommitCallbacks(execute=True):
+            qs.create_data([(dev, adv1)], dedup=dedup, latest=True)
+        latest = BleDeviceLatest.objects.get()
+        self.assertEqual((latest.company_code, bytes(latest.manufacturer_data), latest.service_uuid, latest.rssi),
+                         (0xffff, b'data1', None, -50))
+        self.assertEqual(BleScanResult.objects.count(), 2)
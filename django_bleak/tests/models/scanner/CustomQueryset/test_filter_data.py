@@ -8,10 +8,12 @@ from django_bleak.models.scanner import CustomQueryset
 
 class MockModel:
 
+    mac_addr = local_name = service_uuid = company_code = manufacturer_data = service_data = None
+
     def __init__(self, is_match):
         self.__is_match = is_match
 
-    def is_match(self, data):
+    def is_match(self, data, payload_hex=None):
         return self.__is_match
 
 
@@ -72,3 +74,15 @@ class Test(TestCase):
         ret = CustomQueryset().filter_data(data_list)
 
         self.assertEqual(ret, [(None, None)])
+
+    def test_is_match_multiple(self):
+        self.stack.enter_context(
+            patch(
+                'django_bleak.models.scanner.CustomQueryset.__iter__',
+                return_value=iter([MockModel(True), MockModel(True)])
+            )
+        )
+        data_list = [(None, None)]
+        ret = CustomQueryset().filter_data(data_list)
+
+        self.assertEqual(ret, [(None, None)])
@@ -0,0 +1,38 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models.scanner import (BleScanDecoded, BleScanDevice,
+                                         BleScanResult)
+from django_bleak.utils.decoders import EDDYSTONE_UUID, registry
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+IBEACON = bytes.fromhex('0215' 'e2c56db5dffb48d2b060d0f5a71096e0' '000c' '0002' 'c5')
+TLM = bytes.fromhex('20' '00' '0bb8' '1980' '00000064' '0000000a')
+
+
+class Test(TestCase):
+
+    def test_create_decoded(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        results = BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE, device=dev, rssi=-50, company_code=0x004c, manufacturer_data=IBEACON),
+            BleScanResult(received_at=BASE, device=dev, rssi=-50, service_uuid=EDDYSTONE_UUID, service_data=TLM),
+            BleScanResult(received_at=BASE, device=dev, rssi=-50, company_code=0xffff, manufacturer_data=b'\x00'),
+        ])
+        with self.assertNumQueries(1):
+            objs = BleScanDecoded.objects.create_decoded(results, registry)
+
+        self.assertEqual(len(objs), 4 + 4)
+        self.assertEqual(BleScanDecoded.objects.get(format='ibeacon', name='uuid').text,
+                         'e2c56db5dffb48d2b060d0f5a71096e0')
+        # query decoded fields in the database.
+        self.assertEqual(list(BleScanResult.objects.filter(decoded__format='ibeacon', decoded__name='major',
+                                                           decoded__value=12)),
+                         [results[0]])
+        self.assertEqual(BleScanDecoded.objects.get(format='eddystone_tlm', name='temperature').value, 25.5)
+
+    def test_no_id(self):
+        result = BleScanResult(received_at=BASE, rssi=-50, company_code=0x004c, manufacturer_data=IBEACON)
+        with self.assertLogs('ble_scanner', 'WARNING'):
+            self.assertEqual(BleScanDecoded.objects.create_decoded([result], registry), [])
@@ -0,0 +1,27 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models.scanner import (BleScanDecoded, BleScanDevice,
+                                         BleScanResult)
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_prune_orphans(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        results = BleScanResult.objects.bulk_create(
+            [BleScanResult(received_at=BASE, device=dev, rssi=-50) for _ in range(4)])
+        BleScanDecoded.objects.bulk_create(
+            [BleScanDecoded(result_id=r.id, format='ibeacon', name='major', value=1) for r in results])
+        # results deleted without prune, ex. by dropping partitions.
+        BleScanResult.objects.filter(id__lt=results[2].id)._raw_delete(BleScanResult.objects.db)
+
+        self.assertEqual(BleScanDecoded.objects.prune_orphans(), 2)
+        self.assertEqual(sorted(BleScanDecoded.objects.values_list('result_id', flat=True)),
+                         [results[2].id, results[3].id])
+
+        BleScanResult.objects.all()._raw_delete(BleScanResult.objects.db)
+        self.assertEqual(BleScanDecoded.objects.prune_orphans(), 2)
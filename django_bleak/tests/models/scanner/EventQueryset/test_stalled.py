@@ -0,0 +1,33 @@
+
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models import BleScanEvent
+
+
+class Test(TestCase):
+
+    def test_stalled(self):
+        now = timezone.now()
+        ago = lambda seconds: now - datetime.timedelta(seconds=seconds)  # noqa: E731
+        BleScanEvent.objects.create(name='Fresh', pid=1, interval=3.0, last_heartbeat=ago(5))
+        BleScanEvent.objects.create(name='Stale', pid=2, interval=3.0, last_heartbeat=ago(15))
+        BleScanEvent.objects.create(name='SlowInterval', pid=3, interval=10.0, last_heartbeat=ago(15))
+        BleScanEvent.objects.create(name='NoHeartbeat', pid=4, interval=3.0)
+        BleScanEvent.objects.create(name='Released', interval=3.0, last_heartbeat=ago(60))
+
+        with self.assertNumQueries(1):
+            stalled = BleScanEvent.objects.stalled(now)
+        self.assertEqual([event.name for event in stalled], ['Stale'])
+
+    def test_heartbeat(self):
+        BleScanEvent.objects.create(name='ScanEvent001', pid=1)
+        BleScanEvent.objects.create(name='ScanEvent002')
+
+        self.assertEqual(BleScanEvent.objects.heartbeat('ScanEvent001', 100, 5), 1)
+        event = BleScanEvent.objects.get(name='ScanEvent001')
+        self.assertTrue(event.is_beating())
+        self.assertEqual((event.processed, event.queue_depth), (100, 5))
+        # released scan events are not revived.
+        self.assertEqual(BleScanEvent.objects.heartbeat('ScanEvent002', 100, 5), 0)
@@ -0,0 +1,41 @@
+
+import bleak as blk
+
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanFilter, FilterMatcher
+
+
+class Test(TestCase):
+
+    dev = blk.BLEDevice(
+        '12:34:56:78:90:AB',
+        'dev-001',
+        None,
+        -50
+    )
+    adv = blk.AdvertisementData(
+        'dev-001',
+        {0xffff: b'manufacturer data'},
+        {},
+        [],
+        0,
+        -50,
+        tuple()
+    )
+
+    def test_index(self):
+        wildcard = BleScanFilter(rssi_min=-60)
+        mac_addr = BleScanFilter(mac_addr='12:34:56:78:90:AB', company_code=0x0000)
+        company_code = BleScanFilter(company_code=0xffff)
+        matcher = FilterMatcher([
+            wildcard,
+            mac_addr,
+            company_code,
+            BleScanFilter(mac_addr='FF:FF:FF:FF:FF:FF'),
+            BleScanFilter(local_name='dev-002'),
+            BleScanFilter(service_uuid='01234567-0123-0123-0123-0123456789AB'),
+            BleScanFilter(company_code=0x0000),
+        ])
+        ret = list(matcher.candidates((self.dev, self.adv)))
+
+        self.assertEqual(ret, [wildcard, mac_addr, company_code])
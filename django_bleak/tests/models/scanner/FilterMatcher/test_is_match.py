@@ -0,0 +1,80 @@
+
+import bleak as blk
+
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanFilter, FilterMatcher
+
+
+class Test(TestCase):
+
+    dev = blk.BLEDevice(
+        '12:34:56:78:90:AB',
+        'dev-001',
+        None,
+        -50
+    )
+    adv = blk.AdvertisementData(
+        'dev-001',
+        {0xffff: b'manufacturer data'},
+        {'01234567-0123-0123-0123-0123456789AB': b'service data'},
+        ['01234567-0123-0123-0123-0123456789AB'],
+        0,
+        -50,
+        tuple()
+    )
+
+    def assertSameAsFilter(self, f: BleScanFilter, expected: bool):
+        data = (self.dev, self.adv)
+        self.assertEqual(f.is_match(data), expected)
+        self.assertEqual(FilterMatcher([f]).is_match(data), expected)
+
+    def test_empty(self):
+        self.assertFalse(FilterMatcher([]).is_match((self.dev, self.adv)))
+
+    def test_wildcard(self):
+        self.assertSameAsFilter(BleScanFilter(), True)
+        self.assertSameAsFilter(BleScanFilter(rssi_max=-51), False)
+
+    def test_mac_addr(self):
+        self.assertSameAsFilter(BleScanFilter(mac_addr='12:34:56:78:90:AB'), True)
+        self.assertSameAsFilter(BleScanFilter(mac_addr='FF:FF:FF:FF:FF:FF'), False)
+        self.assertSameAsFilter(BleScanFilter(mac_addr='12:34:56:78:90:AB', local_name='dev-002'), False)
+
+    def test_local_name(self):
+        self.assertSameAsFilter(BleScanFilter(local_name='dev-001'), True)
+        self.assertSameAsFilter(BleScanFilter(local_name='dev-002'), False)
+
+    def test_service_uuid(self):
+        self.assertSameAsFilter(BleScanFilter(service_uuid='01234567-0123-0123-0123-0123456789AB'), True)
+        self.assertSameAsFilter(BleScanFilter(service_uuid='ffffffff-ffff-ffff-ffff-ffffffffffff'), False)
+        self.assertSameAsFilter(BleScanFilter(service_uuid='01234567-0123-0123-0123-0123456789AB',
+                                              service_data=r'^7365727669636520646174$'), False)
+
+    def test_company_code(self):
+        self.assertSameAsFilter(BleScanFilter(company_code=0xffff), True)
+        self.assertSameAsFilter(BleScanFilter(company_code=0x0000), False)
+        self.assertSameAsFilter(BleScanFilter(company_code=0xffff,
+                                              manufacturer_data=r'^6d616e7566616374757265722064617461$'), True)
+        self.assertSameAsFilter(BleScanFilter(company_code=0xffff, rssi_min=-49), False)
+
+    def test_any_filter(self):
+        matcher = FilterMatcher([BleScanFilter(mac_addr='FF:FF:FF:FF:FF:FF'),
+                                 BleScanFilter(company_code=0x0000),
+                                 BleScanFilter(local_name='dev-001')])
+
+        self.assertTrue(matcher.is_match((self.dev, self.adv)))
+
+    def test_hex_once(self):
+        class Payload(bytes):
+            calls = 0
+
+            def hex(self):
+                Payload.calls += 1
+                return super().hex()
+
+        adv = self.adv._replace(manufacturer_data={0xffff: Payload(b'manufacturer data')})
+        filters = [BleScanFilter(manufacturer_data=r'^00'),
+                   BleScanFilter(manufacturer_data=r'^01'),
+                   BleScanFilter(manufacturer_data=r'^6d61')]
+        self.assertTrue(FilterMatcher(filters).is_match((self.dev, adv)))
+        self.assertEqual(Payload.calls, 1)
@@ -0,0 +1,42 @@
+
+import datetime
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_bleak.models import BleDeviceLatest, BleScanDevice
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class Test(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.devs = [BleScanDevice.objects.create(mac_addr=f'12:34:56:78:90:{i:02X}') for i in range(10)]
+        BleDeviceLatest.objects.bulk_create([
+            BleDeviceLatest(device=dev, received_at=now - datetime.timedelta(seconds=i), rssi=-50 - i)
+            for i, dev in enumerate(self.devs[:8])
+        ])
+        caches['default'].clear()
+
+    def test_lookup(self):
+        addrs = [str(dev.mac_addr) for dev in self.devs]
+        with self.assertNumQueries(1):
+            latest = BleDeviceLatest.objects.lookup(addrs)
+        self.assertEqual(len(latest), 8)
+        self.assertEqual(latest['12:34:56:78:90:03'].rssi, -53)
+        # devices or formatted addresses.
+        self.assertEqual(list(BleDeviceLatest.objects.lookup([self.devs[1], '12-34-56-78-90-02'])),
+                         ['12:34:56:78:90:01', '12:34:56:78:90:02'])
+
+    def test_cache(self):
+        addrs = [str(dev.mac_addr) for dev in self.devs[:5]]
+        with self.assertNumQueries(1):
+            BleDeviceLatest.objects.lookup(addrs + ['12:34:56:78:90:09'], cache='default')
+        # cached, also devices never seen.
+        with self.assertNumQueries(0):
+            latest = BleDeviceLatest.objects.lookup(addrs[:3] + ['12:34:56:78:90:09'], cache='default')
+        self.assertEqual(list(latest), addrs[:3])
+        with self.assertNumQueries(1):
+            latest = BleDeviceLatest.objects.lookup(addrs[4:] + ['12:34:56:78:90:05'], cache='default')
+        self.assertEqual(latest['12:34:56:78:90:05'].rssi, -55)
@@ -0,0 +1,32 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import BleDeviceLatest, BleScanDevice
+
+BASE = datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_upsert(self):
+        devs = [BleScanDevice.objects.create(mac_addr=f'12:34:56:78:90:{i:02X}') for i in range(2)]
+        BleDeviceLatest.objects.upsert([BleDeviceLatest(device=devs[0], received_at=BASE, rssi=-50)])
+        with self.assertNumQueries(1):
+            BleDeviceLatest.objects.upsert([
+                BleDeviceLatest(device=devs[0], received_at=BASE - datetime.timedelta(seconds=1), rssi=-60),
+                BleDeviceLatest(device=devs[1], received_at=BASE, rssi=-70),
+            ])
+        self.assertEqual(sorted(BleDeviceLatest.objects.values_list('rssi', flat=True)), [-70, -60])
+
+    def test_skip_older(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleDeviceLatest.objects.upsert([BleDeviceLatest(device=dev, received_at=BASE, rssi=-50)])
+        saved = BleDeviceLatest.objects.upsert(
+            [BleDeviceLatest(device=dev, received_at=BASE - datetime.timedelta(seconds=1), rssi=-60)],
+            skip_older=True)
+        self.assertEqual(saved, [])
+        BleDeviceLatest.objects.upsert(
+            [BleDeviceLatest(device=dev, received_at=BASE + datetime.timedelta(seconds=1), rssi=-70)],
+            skip_older=True)
+        self.assertEqual(BleDeviceLatest.objects.get().rssi, -70)
@@ -0,0 +1,43 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import (BlePresence, BleScanDevice, BleScanEvent,
+                                 BleScanResult)
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_close_open(self):
+        BleScanEvent.objects.create(name='ScanEvent001')
+        BleScanEvent.objects.create(name='ScanEvent002')
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        for event in ('ScanEvent001', 'ScanEvent002'):
+            BlePresence.objects.create(event_id=event, device=dev, entered_at=BASE, rssi=-60, count=1)
+
+        self.assertEqual(BlePresence.objects.close_open('ScanEvent001'), 1)
+
+        # presences of other scan events are kept.
+        self.assertEqual(list(BlePresence.objects.present().values_list('event_id', flat=True)), ['ScanEvent002'])
+        self.assertEqual(BlePresence.objects.get(event_id='ScanEvent001').left_at, BASE)
+
+    def test_last_result(self):
+        BleScanEvent.objects.create(name='ScanEvent001')
+        dev1 = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        dev2 = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:CD')
+        for dev in (dev1, dev2):
+            BlePresence.objects.create(event_id='ScanEvent001', device=dev, entered_at=BASE, rssi=-60, count=1)
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=seconds), device=dev1, rssi=-60)
+            for seconds in (-10, 5, 20)
+        ] + [
+            # received before entered.
+            BleScanResult(received_at=BASE - datetime.timedelta(seconds=1), device=dev2, rssi=-60),
+        ])
+
+        self.assertEqual(BlePresence.objects.close_open('ScanEvent001'), 2)
+
+        self.assertEqual(BlePresence.objects.get(device=dev1).left_at, BASE + datetime.timedelta(seconds=20))
+        self.assertEqual(BlePresence.objects.get(device=dev2).left_at, BASE)
@@ -0,0 +1,27 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import BlePresence, BleScanDevice
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        for i, left in enumerate([10, 20, None]):
+            dev = BleScanDevice.objects.create(mac_addr=f'12:34:56:78:90:A{i}')
+            BlePresence.objects.create(device=dev, entered_at=BASE + datetime.timedelta(minutes=i * 5), rssi=-60,
+                                       count=1, left_at=None if left is None else BASE + datetime.timedelta(minutes=left))
+        return super().setUpTestData()
+
+    def devices(self, qs):
+        return sorted(str(p.device_id)[-2:] for p in qs)
+
+    def test_present(self):
+        self.assertEqual(self.devices(BlePresence.objects.present()), ['A2'])
+        self.assertEqual(self.devices(BlePresence.objects.present(BASE + datetime.timedelta(minutes=7))), ['A0', 'A1'])
+        self.assertEqual(self.devices(BlePresence.objects.present(BASE + datetime.timedelta(minutes=15))), ['A1', 'A2'])
+        self.assertEqual(self.devices(BlePresence.objects.present(BASE - datetime.timedelta(minutes=1))), [])
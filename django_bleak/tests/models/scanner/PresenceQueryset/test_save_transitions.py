@@ -0,0 +1,60 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models import BlePresence, BleScanDevice, BleScanEvent
+from django_bleak.utils.presence import PresenceTracker
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+T0 = BASE.timestamp()
+MAC1 = '12:34:56:78:90:AB'
+MAC2 = '12:34:56:78:90:AC'
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        BleScanEvent.objects.create(name='ScanEvent001')
+        BleScanDevice.objects.create(mac_addr=MAC1)
+        BleScanDevice.objects.create(mac_addr=MAC2)
+        return super().setUpTestData()
+
+    def test_enter_leave(self):
+        tracker = PresenceTracker(timeout=10.0, alpha=0.5, event='ScanEvent001')
+        BlePresence.objects.save_transitions(
+            tracker.observe([(MAC1, T0, -60.0), (MAC2, T0 + 1, -70.0), (MAC1, T0 + 2, -50.0)]), tracker.event)
+
+        self.assertEqual(BlePresence.objects.present().count(), 2)
+        obj = BlePresence.objects.get(device=MAC1)
+        self.assertEqual((obj.entered_at, obj.left_at, obj.rssi, obj.count), (BASE, None, -55.0, 2))
+        self.assertEqual(obj.event_id, 'ScanEvent001')
+
+        tracker.observe([(MAC1, T0 + 8, -40.0)])
+        # a leave updates the saved presence in one query.
+        with self.assertNumQueries(1):
+            BlePresence.objects.save_transitions(tracker.expire(T0 + 15), tracker.event)
+
+        obj.refresh_from_db()
+        self.assertEqual(obj.left_at, None)
+        left = BlePresence.objects.get(device=MAC2)
+        self.assertEqual((left.left_at, left.count), (BASE + datetime.timedelta(seconds=1), 1))
+
+    def test_enter_and_leave_in_batch(self):
+        tracker = PresenceTracker(timeout=10.0)
+        BlePresence.objects.save_transitions(tracker.observe([(MAC1, T0, -60.0), (MAC1, T0 + 20, -60.0)]))
+
+        self.assertEqual(list(BlePresence.objects.order_by('entered_at').values_list('entered_at', 'left_at')),
+                         [(BASE, BASE), (BASE + datetime.timedelta(seconds=20), None)])
+
+    def test_no_saved_id(self):
+        tracker = PresenceTracker(timeout=10.0)
+        transitions = tracker.observe([(MAC1, T0, -60.0)])
+        BlePresence.objects.save_transitions(transitions)
+        # as if the database can not return ids.
+        transitions[0].state.saved_id = None
+        tracker.observe([(MAC1, T0 + 3, -60.0)])
+        BlePresence.objects.save_transitions(tracker.leave_all())
+
+        obj = BlePresence.objects.get()
+        self.assertEqual((obj.left_at, obj.count), (BASE + datetime.timedelta(seconds=3), 2))
@@ -0,0 +1,54 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_empty(self):
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE), 0)
+
+    def test_cutoff(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        objs = BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=i), device=dev, rssi=-50)
+            for i in range(10)
+        ])
+        ids = [obj.id for obj in BleScanResult.objects.order_by('id')]
+        # make a gap of id.
+        BleScanResult.objects.filter(id__in=ids[3:6]).delete()
+
+        self.assertEqual(len(objs), 10)
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE), ids[0])
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE + datetime.timedelta(minutes=2)), ids[2])
+        # no result exists between ids[3] and ids[6].
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE + datetime.timedelta(minutes=4)), ids[3])
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE + datetime.timedelta(minutes=6)), ids[3])
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE + datetime.timedelta(minutes=7)), ids[7])
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE + datetime.timedelta(hours=1)), ids[-1] + 1)
+
+    def test_unordered(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=i), device=dev, rssi=-50)
+            for i in range(5)
+        ])
+        BleScanResult.objects.mark_unordered()
+        BleScanResult.objects.mark_unordered()
+        # imported results are older than saved ones.
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE - datetime.timedelta(minutes=i), device=dev, rssi=-50)
+            for i in range(1, 3)
+        ])
+        ids = [obj.id for obj in BleScanResult.objects.order_by('id')]
+
+        self.assertEqual(BleScanResult.objects.unordered_id(), ids[5])
+        # results received before are not bounded by ids.
+        self.assertEqual(BleScanResult.objects.cutoff_id(BASE), ids[-1] + 1)
+        # results received after are bounded by ids saved in order and the first unordered id.
+        self.assertEqual(BleScanResult.objects.start_id(BASE + datetime.timedelta(minutes=2)), ids[2])
+        self.assertEqual(BleScanResult.objects.start_id(BASE + datetime.timedelta(hours=1)), ids[5])
@@ -0,0 +1,57 @@
+import datetime
+import uuid
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    def test_empty(self):
+        self.assertEqual(BleScanResult.objects.insert([]), [])
+        self.assertEqual(BleScanResult.objects.count(), 0)
+
+    def test_insert(self):
+        dev1 = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        dev2 = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:CD')
+        service_uuid = uuid.UUID('0000fe9a-0000-1000-8000-00805f9b34fb')
+        objs = [
+            BleScanResult(received_at=BASE, device=dev1, local_name='name', company_code=76,
+                          manufacturer_data=b'\x01\x02', tx_power=-4.0, rssi=-50, rssi_smoothed=-51.5),
+            BleScanResult(received_at=BASE, device=dev2, service_uuid=str(service_uuid),
+                          service_data=bytearray(b'\x03'), rssi=-60),
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=1), device=dev1, company_code=76,
+                          manufacturer_data=b'\x01\x02', rssi=-50),
+        ]
+
+        ret = BleScanResult.objects.insert(objs)
+
+        self.assertIs(ret, objs)
+        self.assertIsNone(ret[0].id)
+        saved = list(BleScanResult.objects.order_by('id'))
+        self.assertEqual([(r.received_at, r.device_id, r.rssi) for r in saved],
+                         [(BASE, dev1.mac_addr, -50), (BASE, dev2.mac_addr, -60),
+                          (BASE + datetime.timedelta(seconds=1), dev1.mac_addr, -50)])
+        self.assertEqual(saved[0].local_name, 'name')
+        self.assertEqual(saved[0].company_code, 76)
+        self.assertEqual(bytes(saved[0].manufacturer_data), b'\x01\x02')
+        self.assertEqual(saved[0].tx_power, -4.0)
+        self.assertEqual(saved[0].rssi_smoothed, -51.5)
+        self.assertEqual(saved[1].service_uuid, service_uuid)
+        self.assertEqual(bytes(saved[1].service_data), b'\x03')
+        self.assertIsNone(saved[1].company_code)
+
+    def test_batch(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        objs = [BleScanResult(received_at=BASE, device=dev, rssi=-i) for i in range(5)]
+
+        with mock.patch.object(connection.ops, 'bulk_batch_size', return_value=2), \
+                self.assertNumQueries(3):
+            BleScanResult.objects.insert(objs)
+
+        self.assertEqual(list(BleScanResult.objects.order_by('id').values_list('rssi', flat=True)),
+                         [0, -1, -2, -3, -4])
@@ -0,0 +1,69 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models.scanner import (BleScanDecoded, BleScanDevice,
+                                         BleScanResult)
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=i), device=dev, rssi=-50)
+            for i in range(10)
+        ])
+        return super().setUpTestData()
+
+    def test_chunks(self):
+        # 7 queries to find chunks, and 4 queries per chunk (savepoint, decoded, results, release).
+        with self.assertNumQueries(7 + 4 * 3):
+            ret = BleScanResult.objects.prune(BASE + datetime.timedelta(minutes=7), chunk_size=3)
+
+        self.assertEqual(ret, 7)
+        self.assertEqual(BleScanResult.objects.count(), 3)
+        self.assertFalse(BleScanResult.objects.filter(received_at__lt=BASE + datetime.timedelta(minutes=7)).exists())
+
+    def test_max_chunks(self):
+        ret = BleScanResult.objects.prune(BASE + datetime.timedelta(minutes=7), chunk_size=3, max_chunks=1)
+
+        self.assertEqual(ret, 3)
+        self.assertEqual(BleScanResult.objects.count(), 7)
+
+    def test_archive(self):
+        archived = []
+        ret = BleScanResult.objects.prune(BASE + datetime.timedelta(minutes=5), chunk_size=2,
+                                          archive=lambda chunk: archived.extend(chunk))
+
+        self.assertEqual(ret, 5)
+        self.assertEqual([obj.received_at for obj in archived],
+                         [BASE + datetime.timedelta(minutes=i) for i in range(5)])
+
+    def test_nothing(self):
+        self.assertEqual(BleScanResult.objects.prune(BASE), 0)
+        self.assertEqual(BleScanResult.objects.count(), 10)
+
+    def test_decoded(self):
+        ids = list(BleScanResult.objects.order_by('id').values_list('id', flat=True))
+        BleScanDecoded.objects.bulk_create(
+            [BleScanDecoded(result_id=i, format='ibeacon', name='major', value=1) for i in ids])
+        BleScanResult.objects.prune(BASE + datetime.timedelta(minutes=7), chunk_size=3)
+
+        self.assertEqual(sorted(BleScanDecoded.objects.values_list('result_id', flat=True)), ids[7:])
+
+    def test_unordered(self):
+        dev = BleScanDevice.objects.get()
+        # imported results are older than saved ones.
+        BleScanResult.objects.mark_unordered()
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE - datetime.timedelta(minutes=i), device=dev, rssi=-50)
+            for i in range(1, 4)
+        ])
+        ret = BleScanResult.objects.prune(BASE + datetime.timedelta(minutes=2), chunk_size=3)
+
+        self.assertEqual(ret, 5)
+        self.assertFalse(BleScanResult.objects.filter(received_at__lt=BASE + datetime.timedelta(minutes=2)).exists())
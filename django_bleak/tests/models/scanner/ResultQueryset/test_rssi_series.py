@@ -0,0 +1,40 @@
+
+import datetime
+import unittest
+
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+from django_bleak.utils.rssi import distance, kalman
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+@unittest.skipIf(np is None, 'numpy is not installed.')
+class Test(TestCase):
+
+    def test_rssi_series(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        other = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AC')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=2), device=dev, rssi=-61, tx_power=0),
+            BleScanResult(received_at=BASE, device=dev, rssi=-59),
+            BleScanResult(received_at=BASE + datetime.timedelta(seconds=1), device=other, rssi=-40),
+        ])
+
+        received_at, rssi, tx_power = BleScanResult.objects.filter(device=dev).rssi_series()
+
+        # ordered by received datetime.
+        np.testing.assert_array_equal(received_at, [BASE.timestamp(), BASE.timestamp() + 2])
+        np.testing.assert_array_equal(rssi, [-59, -61])
+        np.testing.assert_array_equal(np.isnan(tx_power), [True, False])
+        np.testing.assert_allclose(distance(rssi, tx_power), [1.0, 10.0])
+        self.assertEqual(len(kalman(rssi)), 2)
+
+    def test_empty(self):
+        received_at, rssi, tx_power = BleScanResult.objects.rssi_series()
+        self.assertEqual((len(received_at), len(rssi), len(tx_power)), (0, 0, 0))
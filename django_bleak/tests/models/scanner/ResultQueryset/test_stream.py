@@ -0,0 +1,38 @@
+
+import datetime
+
+from django.test import TestCase
+from django_bleak.models.scanner import BleScanDevice, BleScanResult
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+        BleScanResult.objects.bulk_create([
+            BleScanResult(received_at=BASE + datetime.timedelta(minutes=i), device=dev, rssi=-i)
+            for i in range(5)
+        ])
+        return super().setUpTestData()
+
+    def test_chunks(self):
+        ids = list(BleScanResult.objects.order_by('id').values_list('id', flat=True))
+        with self.assertNumQueries(3):
+            ret = list(BleScanResult.objects.stream(chunk_size=2))
+
+        self.assertEqual([[row['id'] for row in rows] for rows in ret], [ids[0:2], ids[2:4], ids[4:5]])
+        self.assertEqual(ret[0][0]['device_id'], '12:34:56:78:90:AB')
+
+    def test_after_id(self):
+        ids = list(BleScanResult.objects.order_by('id').values_list('id', flat=True))
+        ret = list(BleScanResult.objects.stream(after_id=ids[2], chunk_size=2, fields=('rssi', )))
+
+        self.assertEqual(ret, [[{'id': ids[3], 'rssi': -3}, {'id': ids[4], 'rssi': -4}]])
+
+    def test_filtered(self):
+        ret = list(BleScanResult.objects.filter(rssi__lt=-2).stream(fields=('rssi', )))
+
+        self.assertEqual([row['rssi'] for row in ret[0]], [-3, -4])
@@ -0,0 +1,18 @@
+
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from django_bleak.models import BleScanCommand
+
+
+class Test(TestCase):
+
+    def test_is_stale(self):
+        self.assertFalse(BleScanCommand.objects.is_stale())
+        command = BleScanCommand.objects.enqueue(BleScanCommand.Action.START, ['ScanEvent001'])
+        self.assertFalse(BleScanCommand.objects.is_stale())
+        BleScanCommand.objects.filter(id=command.id).update(created_at=timezone.now() - datetime.timedelta(minutes=1))
+        self.assertTrue(BleScanCommand.objects.is_stale())
+        command.finish()
+        self.assertFalse(BleScanCommand.objects.is_stale())
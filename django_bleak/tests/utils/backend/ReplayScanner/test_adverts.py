@@ -0,0 +1,53 @@
+
+import asyncio
+import os
+import tempfile
+
+import bleak as blk
+from asgiref.sync import async_to_sync
+
+from django.test import SimpleTestCase
+from django_bleak.utils.backend import ReplayScanner
+from django_bleak.utils.capture import CaptureWriter
+
+
+class Test(SimpleTestCase):
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        with CaptureWriter(self.path) as writer:
+            for i in range(100):
+                dev = blk.BLEDevice(f'12:34:56:78:90:{i:02X}', None, None, -50)
+                adv = blk.AdvertisementData(None, {0xffff: bytes([i])}, {}, [], None, -50, tuple())
+                writer.write(1672531200.0 + i * 0.001, (dev, adv))
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+        return super().tearDown()
+
+    def replay(self, seconds: float, **options):
+        scanner_class = ReplayScanner.configure(path=self.path, **options)
+        received = []
+
+        async def main():
+            async with scanner_class(lambda dev, adv: received.append((dev, adv))):
+                await asyncio.sleep(seconds)
+
+        async_to_sync(main)()
+        return received
+
+    def test_replay(self):
+        received = self.replay(0.2, speed=0)
+        self.assertEqual([adv.manufacturer_data[0xffff] for _, adv in received],
+                         [bytes([i]) for i in range(100)])
+
+    def test_speed(self):
+        # 0.1 seconds are recorded, so 2x speed takes 0.05 seconds.
+        received = self.replay(0.02, speed=2.0)
+        self.assertLess(len(received), 100)
+
+    def test_repeat(self):
+        received = self.replay(0.2, speed=0, repeat=True)
+        self.assertGreater(len(received), 100)
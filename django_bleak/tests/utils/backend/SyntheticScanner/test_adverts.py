@@ -0,0 +1,40 @@
+
+import asyncio
+
+from asgiref.sync import async_to_sync
+
+from django.test import SimpleTestCase
+from django_bleak.utils.backend import SyntheticScanner
+
+
+class Test(SimpleTestCase):
+
+    def test_rate(self):
+        scanner_class = SyntheticScanner.configure(devices=10, rate=2000.0, seed=0)
+        received = []
+
+        async def main():
+            async with scanner_class(lambda dev, adv: received.append((dev, adv)), adapter='hci0'):
+                await asyncio.sleep(0.5)
+
+        async_to_sync(main)()
+
+        self.assertGreater(len(received), 500)
+        self.assertLess(len(received), 1500)
+        self.assertEqual(len({dev.address for dev, _ in received}), 10)
+        for dev, adv in received:
+            self.assertTrue(-100 <= adv.rssi <= 0)
+            self.assertEqual(len(adv.manufacturer_data) + len(adv.service_data), 1)
+
+    def test_discover(self):
+        scanner_class = SyntheticScanner.configure(devices=5, rate=1000.0, manufacturer=1.0)
+        found = async_to_sync(scanner_class.discover)(timeout=0.1, return_adv=True)
+        self.assertEqual(len(found), 5)
+        for dev, adv in found.values():
+            self.assertIn(SyntheticScanner.COMPANY_CODE, adv.manufacturer_data)
+
+    def test_configure(self):
+        scanner_class = SyntheticScanner.configure(devices=5)
+        self.assertEqual(scanner_class.options['devices'], 5)
+        self.assertEqual(scanner_class.options['rate'], SyntheticScanner.options['rate'])
+        self.assertEqual(SyntheticScanner.options['devices'], 100)
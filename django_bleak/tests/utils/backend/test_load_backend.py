@@ -0,0 +1,31 @@
+
+import bleak as blk
+
+from django.test import SimpleTestCase
+from django_bleak.utils.backend import (ReplayScanner, SyntheticScanner,
+                                        load_backend)
+
+
+class Test(SimpleTestCase):
+
+    def test_load_backend(self):
+        self.assertIs(load_backend('bleak'), blk.BleakScanner)
+
+        scanner_class = load_backend('synthetic:devices=1000,rate=10000,seed=1')
+        self.assertTrue(issubclass(scanner_class, SyntheticScanner))
+        self.assertEqual(scanner_class.options['devices'], 1000)
+        self.assertEqual(scanner_class.options['rate'], 10000)
+        self.assertEqual(scanner_class.options['seed'], 1)
+
+        scanner_class = load_backend('replay:path=/tmp/capture.bin,speed=0')
+        self.assertTrue(issubclass(scanner_class, ReplayScanner))
+        self.assertEqual(scanner_class.options['path'], '/tmp/capture.bin')
+        self.assertEqual(scanner_class.options['speed'], 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            load_backend('unknown')
+        with self.assertRaises(ValueError):
+            load_backend('synthetic:unknown=1')
+        with self.assertRaises(ValueError):
+            load_backend('bleak:adapter=hci0')
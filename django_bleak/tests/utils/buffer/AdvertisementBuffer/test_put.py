@@ -0,0 +1,41 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils import AdvertisementBuffer
+
+
+async def flush(data_list):
+    pass
+
+
+class Test(SimpleTestCase):
+
+    def test_ready(self):
+        buffer = AdvertisementBuffer(flush, batch_size=2, capacity=4)
+        self.assertTrue(buffer.put(1))
+        self.assertFalse(buffer._ready.is_set())
+        self.assertTrue(buffer.put(2))
+        self.assertTrue(buffer._ready.is_set())
+
+    def test_drop_oldest(self):
+        buffer = AdvertisementBuffer(flush, batch_size=2, capacity=3)
+        for data in range(5):
+            self.assertTrue(buffer.put(data))
+
+        self.assertEqual(list(buffer._queue), [2, 3, 4])
+        self.assertEqual(buffer.received, 5)
+        self.assertEqual(buffer.dropped, 2)
+
+    def test_drop_newest(self):
+        buffer = AdvertisementBuffer(flush, batch_size=2, capacity=3,
+                                     drop_policy=AdvertisementBuffer.DropPolicy.NEWEST)
+        ret = [buffer.put(data) for data in range(5)]
+
+        self.assertEqual(ret, [True, True, True, False, False])
+        self.assertEqual(list(buffer._queue), [0, 1, 2])
+        self.assertEqual(buffer.dropped, 2)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            AdvertisementBuffer(flush, batch_size=0)
+        with self.assertRaises(ValueError):
+            AdvertisementBuffer(flush, batch_size=10, capacity=5)
@@ -0,0 +1,71 @@
+
+import asyncio
+
+from django.test import SimpleTestCase
+from django_bleak.utils import AdvertisementBuffer
+
+
+class Test(SimpleTestCase):
+
+    def test_batch_size(self):
+        batches = []
+
+        async def flush(data_list):
+            batches.append(data_list)
+
+        async def main():
+            async_event = asyncio.Event()
+            buffer = AdvertisementBuffer(flush, batch_size=3, batch_wait=60)
+            task = asyncio.create_task(buffer.run(async_event))
+            for data in range(7):
+                buffer.put(data)
+            await asyncio.sleep(0.01)
+            flushed = list(batches)
+            async_event.set()
+            await task
+            return flushed
+
+        flushed = asyncio.run(main())
+
+        # flushed by batch_size before batch_wait.
+        self.assertEqual(flushed, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_batch_wait(self):
+        batches = []
+
+        async def flush(data_list):
+            batches.append(data_list)
+
+        async def main():
+            async_event = asyncio.Event()
+            buffer = AdvertisementBuffer(flush, batch_size=100, batch_wait=0.01)
+            task = asyncio.create_task(buffer.run(async_event))
+            buffer.put(0)
+            buffer.put(1)
+            await asyncio.sleep(0.1)
+            flushed = list(batches)
+            async_event.set()
+            await task
+            return flushed
+
+        self.assertEqual(asyncio.run(main()), [[0, 1]])
+
+    def test_flush_failed(self):
+        async def flush(data_list):
+            raise RuntimeError('db error')
+
+        async def main():
+            async_event = asyncio.Event()
+            buffer = AdvertisementBuffer(flush, batch_size=2)
+            buffer.put(0)
+            buffer.put(1)
+            buffer.put(2)
+            async_event.set()
+            with self.assertLogs('ble_scanner', 'ERROR'):
+                await buffer.run(async_event)
+            return buffer
+
+        buffer = asyncio.run(main())
+
+        self.assertEqual(buffer.failed, 3)
+        self.assertEqual(buffer.flushed, 0)
@@ -0,0 +1,26 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils import DeviceCache
+
+
+class Test(SimpleTestCase):
+
+    def test_lru(self):
+        cache = DeviceCache(maxsize=2)
+        cache.add(['a', 'b'])
+        # 'a' is used recently.
+        cache.missing(['a'])
+        cache.add(['c'])
+
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_discard(self):
+        cache = DeviceCache()
+        cache.add(['a'])
+        cache.discard('a')
+        cache.discard('b')
+
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,19 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils import DeviceCache
+
+
+class Test(SimpleTestCase):
+
+    def test_counter(self):
+        cache = DeviceCache()
+        cache.add(['a', 'b'])
+        ret = cache.missing(['a', 'b', 'c'])
+
+        self.assertEqual(ret, {'c'})
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 1)
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+    def test_hit_rate_empty(self):
+        self.assertEqual(DeviceCache().hit_rate, 0.0)
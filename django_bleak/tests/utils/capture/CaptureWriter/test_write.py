@@ -0,0 +1,49 @@
+
+import glob
+import os
+import shutil
+import tempfile
+
+import bleak as blk
+
+from django.test import SimpleTestCase
+from django_bleak.utils.capture import CaptureWriter, read_capture
+
+
+class Test(SimpleTestCase):
+
+    dev = blk.BLEDevice('12:34:56:78:90:AB', None, None, -50)
+
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'capture.bin')
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir)
+        return super().tearDown()
+
+    def adv(self, i: int):
+        return blk.AdvertisementData(None, {0xffff: i.to_bytes(2, 'big')}, {}, [], None, -50, tuple())
+
+    def test_write(self):
+        with CaptureWriter(self.path) as writer:
+            for i in range(10):
+                writer.write(float(i), (self.dev, self.adv(i)))
+        # appended to existing file.
+        with CaptureWriter(self.path) as writer:
+            writer.write(10.0, (self.dev, self.adv(10)))
+        self.assertEqual([t for t, _ in read_capture(self.path)], [float(i) for i in range(11)])
+
+    def test_rotate(self):
+        with CaptureWriter(self.path, max_bytes=200) as writer:
+            for i in range(50):
+                writer.write(float(i), (self.dev, self.adv(i)))
+        rotated = sorted(glob.glob(f'{self.path}.*'))
+        self.assertEqual(len(rotated), writer.rotated)
+        self.assertGreater(writer.rotated, 1)
+        for path in rotated:
+            self.assertLessEqual(os.path.getsize(path), 200)
+        # no record is lost and files are sorted in written order.
+        timestamps = [t for path in rotated + [self.path] for t, _ in read_capture(path)]
+        self.assertEqual(timestamps, [float(i) for i in range(50)])
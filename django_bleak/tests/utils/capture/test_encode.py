@@ -0,0 +1,46 @@
+
+import io
+
+import bleak as blk
+
+from django.test import SimpleTestCase
+from django_bleak.utils.capture import decode, encode, iter_records
+
+
+class Test(SimpleTestCase):
+
+    dev = blk.BLEDevice('12:34:56:78:90:AB', 'dev-001', None, -50)
+    adv = blk.AdvertisementData(
+        'dev-001',
+        {0xffff: b'manufacturer data', 0x004c: b'\x02\x15'},
+        {'0000feaa-0000-1000-8000-00805f9b34fb': b'service data'},
+        ['0000feaa-0000-1000-8000-00805f9b34fb'],
+        -4,
+        -50,
+        tuple()
+    )
+
+    def test_encode(self):
+        record = encode(1672531200.5, (self.dev, self.adv))
+        timestamp, (dev, adv) = decode(record[4:])
+        self.assertEqual(timestamp, 1672531200.5)
+        self.assertEqual(dev.address, '12:34:56:78:90:AB')
+        self.assertEqual(adv.local_name, 'dev-001')
+        self.assertEqual(adv.manufacturer_data, self.adv.manufacturer_data)
+        self.assertEqual(adv.service_data, self.adv.service_data)
+        self.assertEqual(adv.service_uuids, self.adv.service_uuids)
+        self.assertEqual(adv.tx_power, -4)
+        self.assertEqual(adv.rssi, -50)
+
+    def test_encode_empty(self):
+        adv = blk.AdvertisementData(None, {}, {}, [], None, -100, tuple())
+        _, (dev, adv) = decode(encode(0.0, (self.dev, adv))[4:])
+        self.assertIsNone(adv.local_name)
+        self.assertIsNone(adv.tx_power)
+        self.assertEqual(adv.manufacturer_data, {})
+        self.assertEqual(adv.service_data, {})
+
+    def test_truncated(self):
+        record = encode(0.0, (self.dev, self.adv))
+        fp = io.BytesIO(record * 2 + record[:-1])
+        self.assertEqual(len(list(iter_records(fp))), 2)
@@ -0,0 +1,63 @@
+
+import datetime
+import uuid
+
+from django.test import SimpleTestCase
+from django_bleak.utils.columnar import (decode_floats, decode_varints,
+                                         encode_floats, encode_varints, pack,
+                                         unpack)
+
+BASE = datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc)
+UUID = uuid.UUID('0000feaa-0000-1000-8000-00805f9b34fb')
+
+
+def row(id, micros, rssi, **kwargs):
+    values = {'local_name': None, 'company_code': 0x004c, 'manufacturer_data': b'\x02\x15',
+              'service_uuid': None, 'service_data': None, 'tx_power': None, 'rssi_smoothed': None, **kwargs}
+    return (id, BASE + datetime.timedelta(microseconds=micros), values['local_name'], values['company_code'],
+            values['manufacturer_data'], values['service_uuid'], values['service_data'], values['tx_power'],
+            rssi, values['rssi_smoothed'])
+
+
+class Test(SimpleTestCase):
+
+    def test_pack(self):
+        rows = [
+            row(10, 0, -50.0),
+            row(12, 1500, -51.0),
+            # saved out of order by the writer.
+            row(11, 1000, -52.0, local_name='dev-001', tx_power=-8.0),
+            row(13, 59_999_999, -53.0, company_code=None, manufacturer_data=None,
+                service_uuid=UUID, service_data=b'\x00\x01'),
+        ]
+        unpacked = unpack(pack(rows, BASE), BASE)
+        self.assertEqual(unpacked, sorted(rows, key=lambda r: (r[1], r[0])))
+
+    def test_floats(self):
+        rows = [row(1, 0, -50.5, rssi_smoothed=-50.25), row(2, 1, -50.0)]
+        unpacked = unpack(pack(rows, BASE), BASE)
+        self.assertEqual([(r[8], r[9]) for r in unpacked], [(-50.5, -50.25), (-50.0, None)])
+
+    def test_memoryview(self):
+        # BinaryField of PostgreSQL
+        rows = [row(1, 0, -50.0, manufacturer_data=memoryview(b'\x01'))]
+        self.assertEqual(unpack(pack(rows, BASE), BASE)[0][4], b'\x01')
+
+    def test_size(self):
+        # one advert per second of a beacon.
+        rows = [row(1000 + i * 37, i * 1_000_000 + i * 7, -60.0 - i % 10) for i in range(60)]
+        packed = pack(rows, BASE)
+        self.assertLess(len(packed) / len(rows), 8)
+        self.assertEqual(unpack(packed, BASE), rows)
+
+    def test_varints(self):
+        values = [0, 1, -1, 63, -64, 64, 2 ** 40, -(2 ** 40)]
+        encoded = encode_varints(values)
+        self.assertEqual(len(encode_varints([63, -64])), 2)
+        self.assertEqual(decode_varints(memoryview(encoded), len(values)), (values, len(encoded)))
+
+    def test_encode_floats(self):
+        self.assertEqual(encode_floats([None, None]), b'n')
+        self.assertEqual(encode_floats([-50.0, 4.0]), b'b\xce\x04')
+        self.assertEqual(len(encode_floats([-50.0, None])), 17)
+        self.assertEqual(decode_floats(memoryview(encode_floats([-50.0, None])), 2), ([-50.0, None], 17))
@@ -0,0 +1,31 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.decoders import (EDDYSTONE_UUID, DecoderRegistry,
+                                         EddystoneTlm, EddystoneUid, IBeacon,
+                                         registry)
+
+IBEACON = bytes.fromhex('0215' 'e2c56db5dffb48d2b060d0f5a71096e0' '0001' '0002' 'c5')
+UID = bytes.fromhex('00' 'ee' '00112233445566778899' 'aabbccddeeff')
+TLM = bytes.fromhex('20' '00' '0bb8' '1980' '00000064' '0000000a')
+
+
+class Test(SimpleTestCase):
+
+    def test_decode(self):
+        ret = registry.decode([
+            (0x004c, None, IBEACON),
+            (None, EDDYSTONE_UUID.upper(), UID),
+            (None, EDDYSTONE_UUID, TLM),
+            (0xffff, None, IBEACON),
+            (None, '01234567-0123-0123-0123-0123456789ab', UID),
+        ])
+        self.assertEqual([[name for name, _ in decoded] for decoded in ret],
+                         [['ibeacon'], ['eddystone_uid'], ['eddystone_tlm'], [], []])
+        self.assertEqual(ret[0][0][1]['major'], 1)
+
+    def test_register(self):
+        decoders = DecoderRegistry([IBeacon()])
+        self.assertEqual(decoders.decode([(None, EDDYSTONE_UUID, UID)]), [[]])
+        decoders.register(EddystoneUid())
+        decoders.register(EddystoneTlm())
+        self.assertEqual(decoders.decode([(None, EDDYSTONE_UUID, UID)])[0][0][0], 'eddystone_uid')
@@ -0,0 +1,16 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.decoders import EddystoneTlm
+
+
+class Test(SimpleTestCase):
+
+    def test_decode_batch(self):
+        payload = bytes.fromhex('20' '00' '0bb8' '1980' '00000064' '0000000a')
+        ret = EddystoneTlm().decode_batch([payload])
+        self.assertEqual(ret[0], {'battery': 3000, 'temperature': 25.5, 'adv_count': 100, 'uptime': 1.0})
+
+    def test_not_supported(self):
+        payload = bytes.fromhex('20' '00' '0000' '8000' '00000064' '0000000a')
+        ret = EddystoneTlm().decode_batch([payload])
+        self.assertEqual(ret[0], {'adv_count': 100, 'uptime': 1.0})
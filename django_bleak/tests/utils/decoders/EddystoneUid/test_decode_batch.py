@@ -0,0 +1,12 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.decoders import EddystoneUid
+
+
+class Test(SimpleTestCase):
+
+    def test_decode_batch(self):
+        payload = bytes.fromhex('00' 'ee' '00112233445566778899' 'aabbccddeeff' '0000')
+        ret = EddystoneUid().decode_batch([payload, bytes.fromhex('20') + payload[1:]])
+        self.assertEqual(ret[0], {'namespace': '00112233445566778899', 'instance': 'aabbccddeeff', 'tx_power': -18})
+        self.assertIsNone(ret[1])
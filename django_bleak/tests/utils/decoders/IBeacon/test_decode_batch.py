@@ -0,0 +1,19 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.decoders import IBeacon
+
+PAYLOAD = bytes.fromhex('0215' 'e2c56db5dffb48d2b060d0f5a71096e0' '0001' '0002' 'c5')
+
+
+class Test(SimpleTestCase):
+
+    def test_decode_batch(self):
+        ret = IBeacon().decode_batch([PAYLOAD, b'\x02\x15', bytes.fromhex('0115') + PAYLOAD[2:], PAYLOAD])
+        self.assertEqual(ret[0], {'uuid': 'e2c56db5dffb48d2b060d0f5a71096e0', 'major': 1, 'minor': 2, 'tx_power': -59})
+        # too short or other prefix.
+        self.assertIsNone(ret[1])
+        self.assertIsNone(ret[2])
+        self.assertEqual(ret[3], ret[0])
+
+    def test_empty(self):
+        self.assertEqual(IBeacon().decode_batch([]), [])
@@ -0,0 +1,23 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.decoders import RuuviRawV2
+
+
+class Test(SimpleTestCase):
+
+    def test_decode_batch(self):
+        # test vector of RuuviTag data format 5.
+        payload = bytes.fromhex('0512FC5394C37C0004FFFC040CAC364200CDCBB8334C884F')
+        fields = RuuviRawV2().decode_batch([payload])[0]
+        self.assertAlmostEqual(fields.pop('temperature'), 24.3)
+        self.assertAlmostEqual(fields.pop('humidity'), 53.49)
+        self.assertEqual(fields, {'pressure': 100044, 'acc_x': 4, 'acc_y': -4, 'acc_z': 1036,
+                                  'battery': 2977, 'tx_power': 4, 'movement': 66, 'seq': 205,
+                                  'mac': 'cbb8334c884f'})
+
+    def test_invalid(self):
+        payload = bytes.fromhex('058000FFFFFFFF800080008000FFFFFFFFFFFFFFFFFFFFFF')
+        fields = RuuviRawV2().decode_batch([payload])[0]
+        self.assertNotIn('temperature', fields)
+        self.assertNotIn('humidity', fields)
+        self.assertNotIn('pressure', fields)
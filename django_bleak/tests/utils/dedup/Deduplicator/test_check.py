@@ -0,0 +1,43 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils import Deduplicator
+
+
+class Test(SimpleTestCase):
+
+    def test_window(self):
+        dedup = Deduplicator(10.0)
+        keeps, staged = dedup.check([('a', b'1', -50), ('a', b'1', -50), ('b', b'1', -50)], 0.0)
+        dedup.commit(keeps, staged)
+        self.assertEqual(keeps, [True, False, True])
+
+        # repeated in window
+        keeps, staged = dedup.check([('a', b'1', -50)], 9.9)
+        dedup.commit(keeps, staged)
+        self.assertEqual(keeps, [False])
+
+        # keepalive
+        keeps, staged = dedup.check([('a', b'1', -50)], 10.0)
+        dedup.commit(keeps, staged)
+        self.assertEqual(keeps, [True])
+
+    def test_payload_changed(self):
+        dedup = Deduplicator(10.0)
+        dedup.commit(*dedup.check([('a', b'1', -50)], 0.0))
+        keeps, _ = dedup.check([('a', b'2', -50), ('a', b'2', -50), ('a', b'1', -50)], 1.0)
+
+        self.assertEqual(keeps, [True, False, True])
+
+    def test_rssi_threshold(self):
+        dedup = Deduplicator(10.0, rssi_threshold=5.0)
+        dedup.commit(*dedup.check([('a', b'1', -50)], 0.0))
+        keeps, _ = dedup.check([('a', b'1', -54), ('a', b'1', -55)], 1.0)
+
+        self.assertEqual(keeps, [False, True])
+
+    def test_not_committed(self):
+        dedup = Deduplicator(10.0)
+        dedup.check([('a', b'1', -50)], 0.0)
+        keeps, _ = dedup.check([('a', b'1', -50)], 1.0)
+
+        self.assertEqual(keeps, [True])
@@ -0,0 +1,21 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils import Deduplicator
+
+
+class Test(SimpleTestCase):
+
+    def test_reset(self):
+        dedup = Deduplicator(10.0)
+        dedup.commit(*dedup.check([('a', b'1', -50), ('a', b'1', -50), ('a', b'1', -50)], 0.0))
+
+        self.assertEqual(dedup.report(), (1, 2))
+        self.assertEqual(dedup.report(), (0, 0))
+
+    def test_maxsize(self):
+        dedup = Deduplicator(10.0, maxsize=1)
+        dedup.commit(*dedup.check([('a', b'1', -50), ('b', b'1', -50)], 0.0))
+        # 'a' is evicted.
+        keeps, _ = dedup.check([('a', b'1', -50), ('b', b'1', -50)], 1.0)
+
+        self.assertEqual(keeps, [True, False])
@@ -0,0 +1,31 @@
+
+import datetime
+import uuid
+from io import StringIO
+
+from django.test import SimpleTestCase
+from django_bleak.utils.export import CsvWriter
+
+
+class Test(SimpleTestCase):
+
+    def test_write(self):
+        fp = StringIO()
+        writer = CsvWriter(fp, ('id', 'received_at', 'manufacturer_data', 'service_uuid', 'tx_power'))
+        writer.write([{'id': 1, 'received_at': datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc),
+                       'manufacturer_data': memoryview(b'\x01\x02'),
+                       'service_uuid': uuid.UUID('01234567-0123-0123-0123-0123456789ab'),
+                       'tx_power': None}])
+
+        self.assertEqual(fp.getvalue().splitlines(), [
+            'id,received_at,manufacturer_data,service_uuid,tx_power',
+            '1,2023-01-01T00:00:00+00:00,0102,01234567-0123-0123-0123-0123456789ab,',
+        ])
+
+    def test_append(self):
+        fp = StringIO()
+        fp.write('id\r\n1\r\n')
+        writer = CsvWriter(fp, ('id', ))
+        writer.write([{'id': 2}])
+
+        self.assertEqual(fp.getvalue().splitlines(), ['id', '1', '2'])
@@ -0,0 +1,17 @@
+
+import json
+from io import StringIO
+
+from django.test import SimpleTestCase
+from django_bleak.utils.export import JsonLinesWriter
+
+
+class Test(SimpleTestCase):
+
+    def test_write(self):
+        fp = StringIO()
+        writer = JsonLinesWriter(fp, ('id', 'service_data'))
+        writer.write([{'id': 1, 'service_data': b'\x01', 'rssi': -50}, {'id': 2, 'service_data': None}])
+
+        self.assertEqual([json.loads(line) for line in fp.getvalue().splitlines()],
+                         [{'id': 1, 'service_data': '01'}, {'id': 2, 'service_data': None}])
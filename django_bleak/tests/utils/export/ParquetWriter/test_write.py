@@ -0,0 +1,42 @@
+
+import datetime
+import unittest
+import uuid
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from django_bleak.utils.export import FIELDS, ParquetWriter
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+@unittest.skipIf(pq is None, 'pyarrow is not installed.')
+class Test(SimpleTestCase):
+
+    def test_write(self):
+        row = {
+            'id': 1,
+            'received_at': datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc),
+            'device_id': '12:34:56:78:90:AB',
+            'local_name': None,
+            'company_code': 0xffff,
+            'manufacturer_data': memoryview(b'\x01'),
+            'service_uuid': uuid.UUID('01234567-0123-0123-0123-0123456789ab'),
+            'service_data': None,
+            'tx_power': None,
+            'rssi': -50.0,
+        }
+        fp = BytesIO()
+        writer = ParquetWriter(fp, FIELDS)
+        writer.write([row])
+        writer.write([dict(row, id=2)])
+        writer.close()
+        table = pq.read_table(BytesIO(fp.getvalue()))
+
+        self.assertEqual(table.column('id').to_pylist(), [1, 2])
+        self.assertEqual(table.column('manufacturer_data').to_pylist(), [b'\x01', b'\x01'])
+        self.assertEqual(table.column('service_uuid').to_pylist()[0], '01234567-0123-0123-0123-0123456789ab')
+        self.assertEqual(table.column('received_at').to_pylist()[0], row['received_at'])
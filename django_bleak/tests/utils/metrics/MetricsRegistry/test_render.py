@@ -0,0 +1,43 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.metrics import MetricsRegistry
+
+
+class Test(SimpleTestCase):
+
+    def test_render(self):
+        registry = MetricsRegistry('test_')
+        counter = registry.counter('adverts_total', 'adverts.')
+        histogram = registry.histogram('seconds', 'seconds.', (0.1, 1.0))
+        registry.func('depth', 'depth.', lambda: 3)
+        # same name is the same metric.
+        self.assertIs(registry.counter('adverts_total', 'adverts.'), counter)
+
+        counter.inc()
+        counter.inc(2)
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(registry.render(), '\n'.join([
+            '# HELP test_adverts_total adverts.',
+            '# TYPE test_adverts_total counter',
+            'test_adverts_total 3',
+            '# HELP test_seconds seconds.',
+            '# TYPE test_seconds histogram',
+            'test_seconds_bucket{le="0.1"} 2',
+            'test_seconds_bucket{le="1.0"} 3',
+            'test_seconds_bucket{le="+Inf"} 4',
+            'test_seconds_sum 2.65',
+            'test_seconds_count 4',
+            '# HELP test_depth depth.',
+            '# TYPE test_depth gauge',
+            'test_depth 3',
+        ]) + '\n')
+        self.assertEqual(registry.summary(), 'adverts_total=3 seconds=4/0.6625 depth=3')
+
+    def test_func_error(self):
+        registry = MetricsRegistry('test_')
+        registry.func('broken', 'broken.', lambda: 1 / 0)
+        registry.counter('ok_total', 'ok.')
+        with self.assertLogs('ble_scanner', 'ERROR'):
+            self.assertEqual(registry.render(), '# HELP test_ok_total ok.\n# TYPE test_ok_total counter\ntest_ok_total 0\n')
@@ -0,0 +1,29 @@
+
+import urllib.error
+import urllib.request
+
+from django.test import SimpleTestCase
+from django_bleak.utils.metrics import MetricsRegistry, PrometheusSink
+
+
+class Test(SimpleTestCase):
+
+    def test_start(self):
+        registry = MetricsRegistry('test_')
+        registry.counter('adverts_total', 'adverts.').inc(5)
+        sink = PrometheusSink(registry, port=0)
+        sink.start()
+        self.addCleanup(sink.stop)
+        self.assertTrue(registry.enabled)
+
+        with urllib.request.urlopen(f'http://127.0.0.1:{sink.port}/metrics', timeout=5) as res:
+            self.assertEqual(res.status, 200)
+            self.assertTrue(res.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+            self.assertIn('test_adverts_total 5\n', res.read().decode())
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            urllib.request.urlopen(f'http://127.0.0.1:{sink.port}/unknown', timeout=5)
+        self.assertEqual(cm.exception.code, 404)
+
+        sink.stop()
+        self.assertFalse(registry.enabled)
+        self.assertIsNone(sink.server)
@@ -0,0 +1,18 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.metrics import LogSink, PrometheusSink, load_sink
+
+
+class Test(SimpleTestCase):
+
+    def test_load_sink(self):
+        self.assertIsInstance(load_sink('log'), LogSink)
+        sink = load_sink('prometheus:addr=0.0.0.0,port=9100')
+        self.assertIsInstance(sink, PrometheusSink)
+        self.assertEqual(sink.options, {'addr': '0.0.0.0', 'port': 9100})
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            load_sink('unknown')
+        with self.assertRaises(ValueError):
+            load_sink('prometheus:unknown=1')
@@ -0,0 +1,57 @@
+import datetime
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django_bleak.models import BleScanResult
+from django_bleak.utils.partition import convert_sql
+
+UTC = datetime.timezone.utc
+TABLE = '"django_bleak_blescanresult"'
+
+
+class Test(SimpleTestCase):
+
+    def test_convert_sql(self):
+        res = convert_sql(connection, BleScanResult,
+                          datetime.datetime(2022, 12, 15, tzinfo=UTC), datetime.datetime(2023, 2, 1, tzinfo=UTC))
+
+        self.assertEqual(res[:4], [
+            f'ALTER TABLE {TABLE} RENAME TO "django_bleak_blescanresult_old"',
+            f'CREATE TABLE {TABLE} (LIKE "django_bleak_blescanresult_old" INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE ("received_at")',
+            f'ALTER TABLE {TABLE} ALTER COLUMN "id" DROP DEFAULT',
+            f'ALTER TABLE {TABLE} ALTER COLUMN "id" ADD GENERATED BY DEFAULT AS IDENTITY',
+        ])
+        # every month from start to end.
+        self.assertEqual(res[4:7], [
+            f'CREATE TABLE "django_bleak_blescanresult_p202212" PARTITION OF {TABLE} '
+            "FOR VALUES FROM ('2022-12-01T00:00:00+00:00') TO ('2023-01-01T00:00:00+00:00')",
+            f'CREATE TABLE "django_bleak_blescanresult_p202301" PARTITION OF {TABLE} '
+            "FOR VALUES FROM ('2023-01-01T00:00:00+00:00') TO ('2023-02-01T00:00:00+00:00')",
+            f'CREATE TABLE "django_bleak_blescanresult_p202302" PARTITION OF {TABLE} '
+            "FOR VALUES FROM ('2023-02-01T00:00:00+00:00') TO ('2023-03-01T00:00:00+00:00')",
+        ])
+        self.assertEqual(res[7:12], [
+            f'INSERT INTO {TABLE} SELECT * FROM "django_bleak_blescanresult_old"',
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), COALESCE(MAX(\"id\"), 0) + 1, false) FROM {TABLE}",
+            'DROP TABLE "django_bleak_blescanresult_old"',
+            # primary key must include the partition key.
+            f'ALTER TABLE {TABLE} ADD PRIMARY KEY ("id", "received_at")',
+            f'ALTER TABLE {TABLE} ADD FOREIGN KEY ("device_id") '
+            'REFERENCES "django_bleak_blescandevice" ("mac_addr") DEFERRABLE INITIALLY DEFERRED',
+        ])
+        # indexes of the model are created after copying rows.
+        indexes = res[12:]
+        self.assertTrue(all(sql.startswith('CREATE INDEX') for sql in indexes))
+        for index in BleScanResult._meta.indexes:
+            self.assertIn(f'"{index.name}"', ''.join(indexes))
+        self.assertTrue(any('("device_id")' in sql for sql in indexes))
+
+    def test_one_month(self):
+        res = convert_sql(connection, BleScanResult,
+                          datetime.datetime(2023, 1, 15, tzinfo=UTC), datetime.datetime(2023, 1, 20, tzinfo=UTC))
+
+        self.assertEqual([sql for sql in res if 'PARTITION OF' in sql], [
+            f'CREATE TABLE "django_bleak_blescanresult_p202301" PARTITION OF {TABLE} '
+            "FOR VALUES FROM ('2023-01-01T00:00:00+00:00') TO ('2023-02-01T00:00:00+00:00')",
+        ])
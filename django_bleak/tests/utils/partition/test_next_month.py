@@ -0,0 +1,25 @@
+
+import datetime
+
+from django.test import SimpleTestCase
+from django_bleak.utils.partition import (month_start, next_month,
+                                          partition_name)
+
+UTC = datetime.timezone.utc
+
+
+class Test(SimpleTestCase):
+
+    def test_next_month(self):
+        self.assertEqual(next_month(datetime.datetime(2023, 1, 31, 12, tzinfo=UTC)),
+                         datetime.datetime(2023, 2, 1, tzinfo=UTC))
+        self.assertEqual(next_month(datetime.datetime(2023, 12, 1, tzinfo=UTC)),
+                         datetime.datetime(2024, 1, 1, tzinfo=UTC))
+
+    def test_month_start_utc(self):
+        jst = datetime.timezone(datetime.timedelta(hours=9))
+        self.assertEqual(month_start(datetime.datetime(2023, 2, 1, 3, tzinfo=jst)),
+                         datetime.datetime(2023, 1, 1, tzinfo=UTC))
+
+    def test_partition_name(self):
+        self.assertEqual(partition_name('tbl', datetime.datetime(2023, 2, 1, tzinfo=UTC)), 'tbl_p202302')
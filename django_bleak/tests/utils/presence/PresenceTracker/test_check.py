@@ -0,0 +1,56 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.presence import PresenceTracker, Transition
+
+ENTER = Transition.Kind.ENTER
+LEAVE = Transition.Kind.LEAVE
+
+
+class Test(SimpleTestCase):
+
+    def test_check(self):
+        tracker = PresenceTracker(timeout=10.0, alpha=0.5)
+        tracker.observe([('a', 0.0, -60.0)])
+        before = tracker.get('a')
+        ret, staged = tracker.check([('a', 2.0, -50.0), ('b', 3.0, -70.0)])
+
+        # states are not updated until committed, ex. saving transitions is rolled back.
+        self.assertEqual([(t.kind, t.key) for t in ret], [(ENTER, 'b')])
+        self.assertNotIn('b', tracker)
+        self.assertIs(tracker.get('a'), before)
+        self.assertEqual((before.count, before.last_seen, before.rssi), (1, 0.0, -60.0))
+        # checked again against the same states.
+        self.assertEqual([(t.kind, t.key) for t in tracker.check([('b', 3.0, -70.0)])[0]], [(ENTER, 'b')])
+
+        tracker.commit(staged)
+        state = tracker.get('a')
+        self.assertEqual((state.count, state.last_seen, state.rssi), (2, 2.0, -55.0))
+        self.assertIn('b', tracker)
+
+    def test_reenter(self):
+        tracker = PresenceTracker(timeout=10.0)
+        first = tracker.observe([('a', 0.0, -60.0)])[0].state
+        first.saved_id = 1
+        ret, staged = tracker.check([('a', 20.0, -60.0)])
+
+        self.assertEqual([(t.kind, t.key) for t in ret], [(LEAVE, 'a'), (ENTER, 'a')])
+        self.assertIs(ret[0].state, first)
+        self.assertIs(tracker.get('a'), first)
+        tracker.commit(staged)
+        self.assertIs(tracker.get('a'), ret[1].state)
+
+    def test_expired_after_check(self):
+        tracker = PresenceTracker(timeout=10.0)
+        tracker.observe([('a', 0.0, -60.0), ('b', 5.0, -60.0)])
+        ret, staged = tracker.check([('a', 8.0, -60.0), ('b', 8.0, -60.0), ('c', 8.0, -60.0)])
+        # expired by another thread before commit.
+        left = tracker.expire(10.5)
+
+        self.assertEqual([(t.kind, t.key) for t in ret], [(ENTER, 'c')])
+        self.assertEqual([t.key for t in left], ['a'])
+        tracker.commit(staged)
+        # the leave of 'a' is saved, so it enters again by next advertising data.
+        self.assertNotIn('a', tracker)
+        self.assertEqual(tracker.get('b').last_seen, 8.0)
+        self.assertIn('c', tracker)
+        self.assertEqual([(t.kind, t.key) for t in tracker.observe([('a', 11.0, -60.0)])], [(ENTER, 'a')])
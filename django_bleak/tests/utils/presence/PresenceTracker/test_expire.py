@@ -0,0 +1,26 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.presence import PresenceTracker, Transition
+
+
+class Test(SimpleTestCase):
+
+    def test_expire(self):
+        tracker = PresenceTracker(timeout=10.0)
+        tracker.observe([('a', 0.0, -60.0), ('b', 1.0, -60.0), ('c', 2.0, -60.0), ('a', 5.0, -60.0)])
+
+        self.assertEqual(tracker.expire(10.0), [])
+        ret = tracker.expire(12.5)
+
+        # least recently seen devices leave.
+        self.assertEqual([(t.kind, t.key) for t in ret], [(Transition.Kind.LEAVE, 'b'), (Transition.Kind.LEAVE, 'c')])
+        self.assertEqual(ret[0].state.last_seen, 1.0)
+        self.assertEqual(len(tracker), 1)
+        self.assertIn('a', tracker)
+
+    def test_leave_all(self):
+        tracker = PresenceTracker(timeout=10.0)
+        tracker.observe([('a', 0.0, -60.0), ('b', 1.0, -60.0)])
+
+        self.assertEqual([t.key for t in tracker.leave_all()], ['a', 'b'])
+        self.assertEqual(len(tracker), 0)
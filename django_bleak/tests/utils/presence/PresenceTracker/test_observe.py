@@ -0,0 +1,43 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.presence import PresenceTracker, Transition
+
+ENTER = Transition.Kind.ENTER
+LEAVE = Transition.Kind.LEAVE
+
+
+class Test(SimpleTestCase):
+
+    def test_observe(self):
+        tracker = PresenceTracker(timeout=10.0, alpha=0.5)
+        ret = tracker.observe([('a', 0.0, -60.0), ('b', 1.0, -70.0), ('a', 2.0, -50.0)])
+
+        # only transitions are returned.
+        self.assertEqual([(t.kind, t.key) for t in ret], [(ENTER, 'a'), (ENTER, 'b')])
+        state = tracker.get('a')
+        self.assertEqual((state.first_seen, state.last_seen, state.count), (0.0, 2.0, 2))
+        self.assertEqual(state.rssi, -55.0)
+        self.assertEqual(len(tracker), 2)
+
+    def test_reenter(self):
+        tracker = PresenceTracker(timeout=10.0)
+        first = tracker.observe([('a', 0.0, -60.0)])[0].state
+        # seen again after timeout before expired.
+        ret = tracker.observe([('a', 20.0, -60.0)])
+
+        self.assertEqual([(t.kind, t.key) for t in ret], [(LEAVE, 'a'), (ENTER, 'a')])
+        self.assertIs(ret[0].state, first)
+        self.assertEqual(tracker.get('a').first_seen, 20.0)
+
+    def test_out_of_order(self):
+        tracker = PresenceTracker(timeout=10.0)
+        tracker.observe([('a', 5.0, -60.0), ('a', 3.0, -60.0)])
+
+        self.assertEqual(tracker.get('a').last_seen, 5.0)
+        self.assertEqual(tracker.get('a').count, 2)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            PresenceTracker(timeout=0)
+        with self.assertRaises(ValueError):
+            PresenceTracker(alpha=0)
@@ -0,0 +1,27 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.rssi import RssiSmoother
+
+
+class Test(SimpleTestCase):
+
+    def test_check(self):
+        smoother = RssiSmoother(alpha=0.5)
+        smoother.update([('a', -60.0)])
+        ret, staged = smoother.check([('a', -70.0), ('b', -80.0), ('a', -75.0)])
+
+        self.assertEqual(ret, [-65.0, -80.0, -70.0])
+        # state is not updated until committed, ex. saving results is rolled back.
+        self.assertEqual(len(smoother), 1)
+        self.assertEqual(smoother.check([('a', -70.0)])[0], [-65.0])
+
+        smoother.commit(staged)
+        self.assertEqual(len(smoother), 2)
+        self.assertEqual(smoother.update([('a', -70.0)]), [-70.0])
+
+    def test_maxsize(self):
+        smoother = RssiSmoother(alpha=0.5, maxsize=2)
+        smoother.commit(smoother.check([('a', -60.0), ('b', -60.0), ('a', -70.0), ('c', -60.0)])[1])
+
+        # least recently updated device is evicted.
+        self.assertEqual(smoother.update([('b', -80.0)]), [-80.0])
@@ -0,0 +1,25 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.rssi import RssiSmoother
+
+
+class Test(SimpleTestCase):
+
+    def test_update(self):
+        smoother = RssiSmoother(alpha=0.5)
+
+        self.assertEqual(smoother.update([('a', -60.0), ('b', -80.0), ('a', -70.0)]), [-60.0, -80.0, -65.0])
+        # continued from the last batch.
+        self.assertEqual(smoother.update([('a', -65.0), ('b', -60.0)]), [-65.0, -70.0])
+
+    def test_maxsize(self):
+        smoother = RssiSmoother(alpha=0.5, maxsize=2)
+        smoother.update([('a', -60.0), ('b', -60.0), ('c', -60.0)])
+
+        self.assertEqual(len(smoother), 2)
+        # evicted device starts again.
+        self.assertEqual(smoother.update([('a', -80.0)]), [-80.0])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RssiSmoother(alpha=1.5)
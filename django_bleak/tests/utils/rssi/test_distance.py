@@ -0,0 +1,22 @@
+
+import unittest
+
+from django.test import SimpleTestCase
+from django_bleak.utils.rssi import distance
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, 'numpy is not installed.')
+class Test(SimpleTestCase):
+
+    def test_measured_power(self):
+        np.testing.assert_allclose(distance([-59.0, -79.0, -39.0]), [1.0, 10.0, 0.1])
+        np.testing.assert_allclose(distance([-79.0], measured_power=-59.0, path_loss_exponent=4.0), [10 ** 0.5])
+
+    def test_tx_power(self):
+        # measured power is tx_power - 41 if tx_power is given.
+        np.testing.assert_allclose(distance([-41.0, -59.0, -61.0], tx_power=[0.0, None, 0.0]), [1.0, 1.0, 10.0])
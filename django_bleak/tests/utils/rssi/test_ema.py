@@ -0,0 +1,40 @@
+
+import random
+import unittest
+
+from django.test import SimpleTestCase
+from django_bleak.utils.rssi import ema
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def python_ema(rssi, alpha, initial=None):
+    res = []
+    last = rssi[0] if initial is None else initial
+    for value in rssi:
+        last += alpha * (value - last)
+        res.append(last)
+    return res
+
+
+@unittest.skipIf(np is None, 'numpy is not installed.')
+class Test(SimpleTestCase):
+
+    def test_ema(self):
+        rand = random.Random(0)
+        rssi = [rand.gauss(-70, 8) for _ in range(10000)]
+        for alpha in (0.01, 0.3, 0.9, 1.0):
+            np.testing.assert_allclose(ema(rssi, alpha), python_ema(rssi, alpha), rtol=1e-9)
+
+    def test_initial(self):
+        np.testing.assert_allclose(ema([-60.0, -80.0], 0.5, initial=-40.0), [-50.0, -65.0])
+
+    def test_empty(self):
+        self.assertEqual(len(ema([])), 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ema([-60.0], 0.0)
@@ -0,0 +1,51 @@
+
+import random
+import unittest
+
+from django.test import SimpleTestCase
+from django_bleak.utils.rssi import kalman
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def python_kalman(rssi, q, r, initial=None):
+    res = []
+    if initial is None:
+        x, p = rssi[0], r
+        res.append(x)
+        rssi = rssi[1:]
+    else:
+        x, p = initial, r
+    for value in rssi:
+        p += q
+        k = p / (p + r)
+        x += k * (value - x)
+        p *= 1 - k
+        res.append(x)
+    return res
+
+
+@unittest.skipIf(np is None, 'numpy is not installed.')
+class Test(SimpleTestCase):
+
+    def test_kalman(self):
+        rand = random.Random(0)
+        rssi = [rand.gauss(-70, 8) for _ in range(10000)]
+        for q, r in ((0.008, 4.0), (1.0, 1.0), (0.0001, 16.0)):
+            np.testing.assert_allclose(kalman(rssi, q, r), python_kalman(rssi, q, r), rtol=1e-9)
+
+    def test_initial(self):
+        rssi = [-60.0, -80.0, -70.0]
+        np.testing.assert_allclose(kalman(rssi, 0.5, 2.0, initial=-40.0), python_kalman(rssi, 0.5, 2.0, -40.0))
+
+    def test_smooth(self):
+        rand = random.Random(0)
+        rssi = [rand.gauss(-70, 8) for _ in range(1000)]
+        smoothed = kalman(rssi)
+
+        # converged near the true rssi with less noise.
+        self.assertLess(abs(smoothed[-100:].mean() + 70), 2)
+        self.assertLess(smoothed[100:].std(), np.std(rssi) / 4)
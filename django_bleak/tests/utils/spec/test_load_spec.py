@@ -0,0 +1,32 @@
+
+from django.test import SimpleTestCase
+from django_bleak.utils.spec import load_spec
+
+
+class Plain:
+    pass
+
+
+class WithOptions:
+    options = {'path': None, 'rate': 1000, 'repeat': False}
+
+
+class Test(SimpleTestCase):
+
+    CLASSES = {'plain': Plain, 'options': WithOptions}
+
+    def test_load_spec(self):
+        self.assertEqual(load_spec('plain', self.CLASSES, 'backend'), (Plain, {}))
+        self.assertEqual(load_spec('options:', self.CLASSES, 'backend'), (WithOptions, {}))
+        # literals, or strings if not.
+        self.assertEqual(load_spec('options:path=capture.bin,rate=10000,repeat=True', self.CLASSES, 'backend'),
+                         (WithOptions, {'path': 'capture.bin', 'rate': 10000, 'repeat': True}))
+        self.assertEqual(load_spec('options:path=1.5', self.CLASSES, 'backend'), (WithOptions, {'path': 1.5}))
+
+    def test_invalid(self):
+        with self.assertRaisesMessage(ValueError, 'unknown backend unknown. choose from plain, options.'):
+            load_spec('unknown', self.CLASSES, 'backend')
+        with self.assertRaisesMessage(ValueError, 'unknown option rate of plain backend.'):
+            load_spec('plain:rate=1', self.CLASSES, 'backend')
+        with self.assertRaisesMessage(ValueError, 'unknown option unknown of options metrics sink.'):
+            load_spec('options:unknown=1', self.CLASSES, 'metrics sink')
@@ -0,0 +1,32 @@
+
+import asyncio
+import datetime
+
+from django.test import TransactionTestCase
+from django_bleak.models import BleScanDevice, BleScanResult
+from django_bleak.utils import BatchWriter
+
+BASE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class Test(TransactionTestCase):
+
+    def test_stop(self):
+        dev = BleScanDevice.objects.create(mac_addr='12:34:56:78:90:AB')
+
+        def write(batch):
+            BleScanResult.objects.bulk_create([BleScanResult(received_at=BASE, device=dev, rssi=rssi) for rssi in batch])
+
+        async def main():
+            writer = BatchWriter(write)
+            writer.start()
+            for i in range(3):
+                await writer.submit([-50 - i] * 10)
+            # all submitted batches are written before the thread stops.
+            await writer.stop()
+            return writer
+
+        writer = asyncio.run(main())
+
+        self.assertEqual(writer.written, 30)
+        self.assertEqual(BleScanResult.objects.count(), 30)
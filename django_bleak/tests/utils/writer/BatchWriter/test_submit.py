@@ -0,0 +1,121 @@
+
+import asyncio
+import threading
+import time
+
+from django.test import SimpleTestCase
+from django_bleak.utils import BatchWriter
+
+
+class Test(SimpleTestCase):
+
+    def test_submit(self):
+        batches = []
+
+        def write(batch):
+            batches.append((threading.get_ident(), batch))
+
+        async def main():
+            writer = BatchWriter(write)
+            writer.start()
+            for i in range(5):
+                await writer.submit([i, i])
+            await writer.stop()
+            return writer
+
+        writer = asyncio.run(main())
+
+        # written in order by one thread other than the event loop.
+        self.assertEqual([batch for _, batch in batches], [[i, i] for i in range(5)])
+        self.assertEqual(len({ident for ident, _ in batches}), 1)
+        self.assertNotEqual(batches[0][0], threading.get_ident())
+        self.assertEqual(writer.written, 10)
+        self.assertEqual(writer.depth, 0)
+        self.assertFalse(writer.is_running)
+
+    def test_max_pending(self):
+        release = threading.Event()
+
+        def write(batch):
+            release.wait(1.0)
+
+        async def main():
+            writer = BatchWriter(write, max_pending=2)
+            writer.start()
+            await writer.submit([0])
+            await writer.submit([1])
+            # the third batch waits until a batch is written.
+            third = asyncio.ensure_future(writer.submit([2]))
+            await asyncio.sleep(0.05)
+            blocked = not third.done()
+            depth, pending = writer.depth, writer.pending
+            release.set()
+            await asyncio.wait_for(third, 1.0)
+            await writer.stop()
+            return blocked, depth, pending, writer
+
+        blocked, depth, pending, writer = asyncio.run(main())
+
+        self.assertTrue(blocked)
+        self.assertEqual((depth, pending), (2, 2))
+        self.assertEqual(writer.written, 3)
+
+    def test_event_loop_not_blocked(self):
+        def write(batch):
+            time.sleep(0.2)
+
+        async def main():
+            writer = BatchWriter(write)
+            writer.start()
+            started = time.monotonic()
+            await writer.submit([0])
+            submitted = time.monotonic() - started
+            await writer.stop()
+            return submitted
+
+        self.assertLess(asyncio.run(main()), 0.1)
+
+    def test_write_failed(self):
+        def write(batch):
+            if batch[0] == 1:
+                raise RuntimeError('db error')
+
+        async def main():
+            writer = BatchWriter(write)
+            writer.start()
+            for i in range(3):
+                await writer.submit([i, i, i])
+            with self.assertLogs('ble_scanner', 'ERROR'):
+                await writer.stop()
+            return writer
+
+        writer = asyncio.run(main())
+
+        # next batches are written after a failure.
+        self.assertEqual((writer.written, writer.failed), (6, 3))
+
+    def test_report(self):
+        def write(batch):
+            time.sleep(0.01)
+
+        async def main():
+            writer = BatchWriter(write)
+            writer.start()
+            for i in range(4):
+                await writer.submit([i])
+            await writer.stop()
+            return writer
+
+        writer = asyncio.run(main())
+        report = writer.report()
+
+        self.assertEqual((report.depth, report.pending, report.written, report.failed), (0, 0, 4, 0))
+        self.assertGreaterEqual(report.write_mean, 0.01)
+        self.assertGreaterEqual(report.latency_mean, report.write_mean)
+        self.assertGreaterEqual(report.latency_max, report.latency_mean)
+        # counters since last report.
+        self.assertEqual(writer.report().written, 0)
+
+    def test_invalid_max_pending(self):
+        with self.assertRaises(ValueError):
+            BatchWriter(lambda batch: None, max_pending=0)
@@ -0,0 +1,12 @@
+
+from .buffer import AdvertisementBuffer
+from .cache import DeviceCache
+from .dedup import Deduplicator
+from .writer import BatchWriter
+
+__all__ = [
+    'AdvertisementBuffer',
+    'BatchWriter',
+    'DeviceCache',
+    'Deduplicator',
+]
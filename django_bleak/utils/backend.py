@@ -0,0 +1,213 @@
+
+import asyncio
+import logging
+import random
+import time
+import typing as typ
+
+import bleak as blk
+
+from .capture import Advertisement, read_capture
+from .spec import load_spec
+
+logger = logging.getLogger('ble_scanner')
+
+Callback = typ.Callable[[blk.BLEDevice, blk.AdvertisementData], typ.Any]
+
+
+class ScannerBackend:
+    """Fake scanner which has the same interface as bleak.BleakScanner.
+
+    Subclasses yield advertising data from adverts(), and the data is
+    given to the detection callback while the scanner is started.
+    """
+
+    # keyword arguments given by configure().
+    # startup is seconds start() takes, like starting discovery of BlueZ.
+    options: typ.Dict[str, typ.Any] = {'startup': 0.0}
+
+    def __init__(self, detection_callback: typ.Optional[Callback] = None, **kwargs):
+        self.detection_callback = detection_callback
+        # bleak arguments like adapter are accepted and ignored.
+        self.kwargs = kwargs
+        self.emitted = 0
+        self._task: typ.Optional[asyncio.Future] = None
+
+    @classmethod
+    def configure(cls, **options) -> typ.Type['ScannerBackend']:
+        """scanner class whose adverts() uses options
+
+        Returns:
+            typ.Type[ScannerBackend]: subclass of cls
+        """
+        return type(cls.__name__, (cls,), {'options': {**cls.options, **options}})
+
+    async def adverts(self) -> typ.AsyncIterator[Advertisement]:
+        raise NotImplementedError
+        yield
+
+    async def _run(self):
+        async for dev, adv in self.adverts():
+            self.emitted += 1
+            if self.detection_callback is not None:
+                ret = self.detection_callback(dev, adv)
+                if asyncio.iscoroutine(ret):
+                    await ret
+
+    async def start(self):
+        if self.options['startup'] > 0:
+            await asyncio.sleep(self.options['startup'])
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> 'ScannerBackend':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    @classmethod
+    async def discover(cls, timeout: float = 5.0, return_adv: bool = False, **kwargs):
+        """scan for timeout seconds like bleak.BleakScanner.discover
+
+        Returns:
+            dict or list: {address: (device, advertising data)} if return_adv, else devices
+        """
+        found: typ.Dict[str, Advertisement] = {}
+
+        def callback(dev: blk.BLEDevice, adv: blk.AdvertisementData):
+            found[dev.address] = (dev, adv)
+
+        async with cls(callback, **kwargs):
+            await asyncio.sleep(timeout)
+        if return_adv:
+            return found
+        return [dev for dev, _ in found.values()]
+
+
+class SyntheticScanner(ScannerBackend):
+    """Generate advertising data of virtual devices at a constant rate.
+
+    Options:
+        devices (int): number of devices
+        rate (float): advertising data per second
+        manufacturer (float): ratio of devices sending manufacturer data.
+            the others send service data.
+        payload_size (int): bytes of manufacturer/service data (>= 6)
+        rssi_mean (float): mean of rssi[dBm]
+        rssi_std (float): standard deviation of rssi[dBm]
+        seed (int): random seed
+        startup (float): seconds start() takes
+    """
+
+    options = {
+        **ScannerBackend.options,
+        'devices': 100,
+        'rate': 1000.0,
+        'manufacturer': 0.5,
+        'payload_size': 8,
+        'rssi_mean': -70.0,
+        'rssi_std': 8.0,
+        'seed': None,
+    }
+    COMPANY_CODE = 0xffff
+    SERVICE_UUID = '0000feaa-0000-1000-8000-00805f9b34fb'
+    # seconds between bursts
+    TICK = 0.01
+
+    @staticmethod
+    def address(index: int) -> str:
+        return ':'.join(f'{b:02X}' for b in (0xC0 << 40 | index).to_bytes(6, 'big'))
+
+    async def adverts(self) -> typ.AsyncIterator[Advertisement]:
+        opts = self.options
+        rand = random.Random(opts['seed'])
+        devices = [(self.address(i), f'dev-{i:06d}', rand.random() < opts['manufacturer'])
+                   for i in range(opts['devices'])]
+        padding = bytes(max(0, opts['payload_size'] - 6))
+        started = time.monotonic()
+        seq = 0
+        while True:
+            due = int((time.monotonic() - started) * opts['rate'])
+            for _ in range(due - seq):
+                address, name, manufacturer = devices[seq % len(devices)]
+                rssi = max(-100, min(0, int(rand.gauss(opts['rssi_mean'], opts['rssi_std']))))
+                payload = (seq // len(devices)).to_bytes(6, 'big') + padding
+                manufacturer_data = {self.COMPANY_CODE: payload} if manufacturer else {}
+                service_data = {} if manufacturer else {self.SERVICE_UUID: payload}
+                adv = blk.AdvertisementData(name, manufacturer_data, service_data,
+                                            list(service_data.keys()), None, rssi,
+                                            (time.monotonic(),))
+                seq += 1
+                yield blk.BLEDevice(address, name, None, rssi), adv
+            await asyncio.sleep(self.TICK)
+
+
+class ReplayScanner(ScannerBackend):
+    """Replay advertising data recorded in a capture file.
+
+    Options:
+        path (str): capture file path
+        speed (float): replay speed. 0 is as fast as possible.
+        repeat (bool): replay from the start again at the end
+        startup (float): seconds start() takes
+    """
+
+    options = {
+        **ScannerBackend.options,
+        'path': None,
+        'speed': 1.0,
+        'repeat': False,
+    }
+
+    async def adverts(self) -> typ.AsyncIterator[Advertisement]:
+        opts = self.options
+        if not opts['path']:
+            raise ValueError('path option is required.')
+        while True:
+            started = time.monotonic()
+            first = None
+            for i, (timestamp, (dev, adv)) in enumerate(read_capture(opts['path'])):
+                first = timestamp if first is None else first
+                if opts['speed'] > 0:
+                    wait = (timestamp - first) / opts['speed'] - (time.monotonic() - started)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                elif i % 1000 == 0:
+                    # let other tasks run.
+                    await asyncio.sleep(0)
+                adv = adv._replace(platform_data=(time.monotonic(),))
+                yield dev, adv
+            if not opts['repeat'] or first is None:
+                break
+        logger.info(f'replay finish. -> {opts["path"]}')
+
+
+BACKENDS = {
+    'synthetic': SyntheticScanner,
+    'replay': ReplayScanner,
+}
+
+
+def load_backend(spec: str) -> typ.Type:
+    """scanner class from backend spec
+
+    Args:
+        spec (str): "bleak", "synthetic:devices=1000,rate=10000" or "replay:path=capture.bin,speed=0"
+
+    Returns:
+        typ.Type: bleak.BleakScanner or configured ScannerBackend
+    """
+    cls, options = load_spec(spec, {'bleak': blk.BleakScanner, **BACKENDS}, 'backend')
+    if cls is blk.BleakScanner:
+        return cls
+    return cls.configure(**options)
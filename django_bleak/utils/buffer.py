@@ -0,0 +1,111 @@
+
+import asyncio
+import logging
+import typing as typ
+from collections import deque
+from enum import Enum
+
+logger = logging.getLogger('ble_scanner')
+
+T = typ.TypeVar('T')
+
+
+class AdvertisementBuffer(typ.Generic[T]):
+    """Bounded ring buffer which flushes advertising data in batches.
+
+    Buffered data is flushed when batch_size items are buffered or
+    batch_wait seconds passed. When the buffer is full because flushing
+    falls behind, the data is dropped by drop_policy.
+    """
+
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_BATCH_WAIT = 0.25
+    DEFAULT_CAPACITY = 10000
+
+    class DropPolicy(str, Enum):
+        OLDEST = 'oldest'
+        NEWEST = 'newest'
+
+    def __init__(self,
+                 flush: typ.Callable[[typ.List[T]], typ.Awaitable[typ.Any]],
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 batch_wait: float = DEFAULT_BATCH_WAIT,
+                 capacity: int = DEFAULT_CAPACITY,
+                 drop_policy: 'DropPolicy' = DropPolicy.OLDEST):
+        if batch_size < 1 or capacity < batch_size:
+            raise ValueError('1 <= batch_size <= capacity is required.')
+        self._flush = flush
+        self._queue: typ.Deque[T] = deque()
+        self._ready = asyncio.Event()
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.capacity = capacity
+        self.drop_policy = self.DropPolicy(drop_policy)
+        # counters
+        self.received = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._reported_dropped = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def put(self, data: T) -> bool:
+        """buffer advertising data without blocking
+
+        Args:
+            data (T): advertising data
+
+        Returns:
+            bool: False if data is dropped
+        """
+        self.received += 1
+        if len(self._queue) >= self.capacity:
+            self.dropped += 1
+            if self.drop_policy is self.DropPolicy.NEWEST:
+                return False
+            self._queue.popleft()
+        self._queue.append(data)
+        if len(self._queue) >= self.batch_size:
+            self._ready.set()
+        return True
+
+    async def flush(self):
+        """flush all buffered data in batches of batch_size"""
+        self._ready.clear()
+        while self._queue:
+            batch = [self._queue.popleft()
+                     for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await self._flush(batch)
+                self.flushed += len(batch)
+            except Exception:
+                self.failed += len(batch)
+                logger.exception(f'flush failed. {len(batch)} data discarded.')
+        if self.dropped != self._reported_dropped:
+            logger.warning(f'buffer is full. {self.dropped - self._reported_dropped} data dropped.')
+            self._reported_dropped = self.dropped
+
+    async def run(self, async_event: asyncio.Event):
+        """flush buffered data until async_event is set
+
+        Args:
+            async_event (asyncio.Event): stop event
+        """
+        logger.info('buffer_task wait until set async event.')
+        # wake up immediately when async_event is set.
+        stop = asyncio.ensure_future(async_event.wait())
+        stop.add_done_callback(lambda _: self._ready.set())
+        try:
+            while not async_event.is_set():
+                try:
+                    await asyncio.wait_for(self._ready.wait(), self.batch_wait)
+                except asyncio.TimeoutError:
+                    pass
+                await self.flush()
+        finally:
+            stop.cancel()
+        await self.flush()
+        logger.info(f'buffer_task finish. received={self.received} flushed={self.flushed} '
+                    f'dropped={self.dropped} failed={self.failed}')
@@ -0,0 +1,83 @@
+
+import threading
+import typing as typ
+from collections import OrderedDict
+
+K = typ.TypeVar('K', bound=typ.Hashable)
+
+
+class DeviceCache(typ.Generic[K]):
+    """LRU set of keys known to exist in the database.
+
+    It counts hits and misses of lookups, and is thread safe.
+    """
+
+    DEFAULT_MAXSIZE = 10000
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._keys: 'OrderedDict[K, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: K):
+        return key in self._keys
+
+    @property
+    def hit_rate(self) -> float:
+        """hit rate of lookups, 0.0 if never looked up"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def missing(self, keys: typ.Iterable[K]) -> typ.Set[K]:
+        """get keys not cached
+
+        Args:
+            keys (typ.Iterable[K]): lookup keys
+
+        Returns:
+            typ.Set[K]: keys not cached
+        """
+        res = set()
+        with self._lock:
+            for key in keys:
+                if key in self._keys:
+                    self._keys.move_to_end(key)
+                    self.hits += 1
+                else:
+                    res.add(key)
+                    self.misses += 1
+        return res
+
+    def add(self, keys: typ.Iterable[K]):
+        """cache keys, and evict least recently used keys over maxsize
+
+        Args:
+            keys (typ.Iterable[K]): keys known to exist
+        """
+        with self._lock:
+            for key in keys:
+                self._keys[key] = None
+                self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+
+    def discard(self, key: K):
+        """remove key if cached
+
+        Args:
+            key (K): removed key
+        """
+        with self._lock:
+            self._keys.pop(key, None)
+
+    def clear(self):
+        """remove all keys and reset counters"""
+        with self._lock:
+            self._keys.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,200 @@
+
+import os
+import struct
+import time
+import typing as typ
+import uuid
+
+import bleak as blk
+
+Advertisement = typ.Tuple[blk.BLEDevice, blk.AdvertisementData]
+
+# record := u32 length | body
+# body := timestamp(f64) rssi(i8) tx_power(i8) | address | local_name
+#         | count(u8) (company_code(u16) data)* | count(u8) (service_uuid(16 bytes) data)*
+# text is u8 length and utf-8, data is u16 length and bytes.
+LENGTH = struct.Struct('!I')
+HEADER = struct.Struct('!dbb')
+TEXT = struct.Struct('!B')
+DATA = struct.Struct('!H')
+COMPANY = struct.Struct('!H')
+NO_TEXT = 0xff
+NO_TX_POWER = -128
+
+
+def _clamp(value: float) -> int:
+    return max(-127, min(127, int(round(value))))
+
+
+def encode(timestamp: float, data: Advertisement) -> bytes:
+    """encode advertising data to a length-prefixed record
+
+    Args:
+        timestamp (float): received unix time
+        data (Advertisement): advertising data
+
+    Returns:
+        bytes: record
+    """
+    dev, adv = data
+    tx_power = NO_TX_POWER if adv.tx_power is None else _clamp(adv.tx_power)
+    parts = [HEADER.pack(timestamp, _clamp(adv.rssi), tx_power)]
+    for text in (dev.address, adv.local_name):
+        if text is None:
+            parts.append(TEXT.pack(NO_TEXT))
+        else:
+            raw = text.encode()[:NO_TEXT - 1]
+            parts += [TEXT.pack(len(raw)), raw]
+    parts.append(TEXT.pack(len(adv.manufacturer_data)))
+    for code, value in adv.manufacturer_data.items():
+        parts += [COMPANY.pack(code), DATA.pack(len(value)), bytes(value)]
+    parts.append(TEXT.pack(len(adv.service_data)))
+    for key, value in adv.service_data.items():
+        parts += [uuid.UUID(key).bytes, DATA.pack(len(value)), bytes(value)]
+    body = b''.join(parts)
+    return LENGTH.pack(len(body)) + body
+
+
+def decode(body: bytes) -> typ.Tuple[float, Advertisement]:
+    """decode a record body
+
+    Args:
+        body (bytes): record without length prefix
+
+    Returns:
+        typ.Tuple[float, Advertisement]: received unix time and advertising data
+    """
+    view = memoryview(body)
+    timestamp, rssi, tx_power = HEADER.unpack_from(view)
+    pos = HEADER.size
+    texts = []
+    for _ in range(2):
+        size, = TEXT.unpack_from(view, pos)
+        pos += TEXT.size
+        if size == NO_TEXT:
+            texts.append(None)
+        else:
+            texts.append(bytes(view[pos:pos + size]).decode())
+            pos += size
+    address, local_name = texts
+    manufacturer_data = {}
+    count, = TEXT.unpack_from(view, pos)
+    pos += TEXT.size
+    for _ in range(count):
+        code, = COMPANY.unpack_from(view, pos)
+        size, = DATA.unpack_from(view, pos + COMPANY.size)
+        pos += COMPANY.size + DATA.size
+        manufacturer_data[code] = bytes(view[pos:pos + size])
+        pos += size
+    service_data = {}
+    count, = TEXT.unpack_from(view, pos)
+    pos += TEXT.size
+    for _ in range(count):
+        key = str(uuid.UUID(bytes=bytes(view[pos:pos + 16])))
+        size, = DATA.unpack_from(view, pos + 16)
+        pos += 16 + DATA.size
+        service_data[key] = bytes(view[pos:pos + size])
+        pos += size
+    tx_power = None if tx_power == NO_TX_POWER else tx_power
+    dev = blk.BLEDevice(address, local_name, None, rssi)
+    adv = blk.AdvertisementData(local_name, manufacturer_data, service_data,
+                                list(service_data.keys()), tx_power, rssi, tuple())
+    return timestamp, (dev, adv)
+
+
+def iter_records(fp: typ.BinaryIO) -> typ.Iterator[bytes]:
+    """read record bodies. a truncated record at the end is ignored.
+
+    Args:
+        fp (typ.BinaryIO): capture file
+
+    Yields:
+        bytes: record body
+    """
+    while True:
+        head = fp.read(LENGTH.size)
+        if len(head) < LENGTH.size:
+            return
+        size, = LENGTH.unpack(head)
+        body = fp.read(size)
+        if len(body) < size:
+            return
+        yield body
+
+
+def read_capture(path: str) -> typ.Iterator[typ.Tuple[float, Advertisement]]:
+    """read a capture file
+
+    Args:
+        path (str): capture file path
+
+    Yields:
+        typ.Tuple[float, Advertisement]: received unix time and advertising data
+    """
+    with open(path, 'rb') as fp:
+        for body in iter_records(fp):
+            yield decode(body)
+
+
+def rotated_path(path: str) -> str:
+    """path a full capture file is renamed to. rotated files sort in written order.
+
+    Args:
+        path (str): capture file path
+
+    Returns:
+        str: "{path}.YYYYmmddHHMMSS" which does not exist
+    """
+    base = f'{path}.{time.strftime("%Y%m%d%H%M%S")}'
+    rotated, n = base, 0
+    while os.path.exists(rotated):
+        n += 1
+        rotated = f'{base}-{n:03d}'
+    return rotated
+
+
+class CaptureWriter:
+    """Append advertising data to a capture file.
+
+    When the file exceeds max_bytes, it is renamed by rotated_path()
+    and a new file is started at path.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, path: str, max_bytes: typ.Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.written = 0
+        self.rotated = 0
+        self._open()
+
+    def _open(self):
+        self._fp = open(self.path, 'ab')
+        self.size = self._fp.seek(0, os.SEEK_END)
+
+    def rotate(self):
+        self._fp.close()
+        os.rename(self.path, rotated_path(self.path))
+        self.rotated += 1
+        self._open()
+
+    def write(self, timestamp: float, data: Advertisement):
+        record = encode(timestamp, data)
+        if self.max_bytes and self.size and self.size + len(record) > self.max_bytes:
+            self.rotate()
+        self._fp.write(record)
+        self.size += len(record)
+        self.written += 1
+
+    def flush(self):
+        self._fp.flush()
+
+    def close(self):
+        self._fp.close()
+
+    def __enter__(self) -> 'CaptureWriter':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
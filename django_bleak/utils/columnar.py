@@ -0,0 +1,201 @@
+
+import datetime
+import json
+import math
+import struct
+import typing as typ
+import uuid
+import zlib
+
+# packed := zlib(header | dictionary | ids | offsets | indexes | rssi | rssi_smoothed)
+# header := count(u32) dictionary length(u32)
+# dictionary := json list of [local_name, company_code, manufacturer_data, service_uuid, service_data, tx_power].
+#               bytes are hex string.
+# ids, offsets := zigzag varints of deltas from the previous value. offsets are microseconds from the base time.
+# indexes := zigzag varints of dictionary entries
+# rssi, rssi_smoothed := typecode(u8) values. b is int8, d is float64 with nan as null and n is all null.
+HEADER = struct.Struct('!II')
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# columns of BleScanResult in a row, except device.
+COLUMNS = ('id', 'received_at', 'local_name', 'company_code', 'manufacturer_data',
+           'service_uuid', 'service_data', 'tx_power', 'rssi', 'rssi_smoothed')
+
+Row = typ.Tuple[typ.Any, ...]
+Entry = typ.Tuple[typ.Optional[str], typ.Optional[int], typ.Optional[bytes],
+                  typ.Optional[uuid.UUID], typ.Optional[bytes], typ.Optional[float]]
+
+
+def encode_varints(values: typ.Iterable[int]) -> bytes:
+    """encode integers to zigzag varints
+
+    Args:
+        values (typ.Iterable[int]): integers
+
+    Returns:
+        bytes: varints, 1 byte for -64 to 63
+    """
+    out = bytearray()
+    for n in values:
+        n = n << 1 if n >= 0 else (-n << 1) - 1
+        while n >= 0x80:
+            out.append(n & 0x7f | 0x80)
+            n >>= 7
+        out.append(n)
+    return bytes(out)
+
+
+def decode_varints(view: memoryview, count: int, pos: int = 0) -> typ.Tuple[typ.List[int], int]:
+    """decode zigzag varints
+
+    Args:
+        view (memoryview): encoded bytes
+        count (int): count of integers
+        pos (int): start position
+
+    Returns:
+        typ.Tuple[typ.List[int], int]: integers and the next position
+    """
+    values = []
+    for _ in range(count):
+        n = shift = 0
+        while True:
+            b = view[pos]
+            pos += 1
+            n |= (b & 0x7f) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        values.append(n >> 1 if not n & 1 else -((n + 1) >> 1))
+    return values, pos
+
+
+def _deltas(values: typ.Sequence[int]) -> typ.List[int]:
+    return [b - a for a, b in zip((0, *values), values)]
+
+
+def _accumulate(deltas: typ.Sequence[int]) -> typ.List[int]:
+    values, total = [], 0
+    for d in deltas:
+        total += d
+        values.append(total)
+    return values
+
+
+def encode_floats(values: typ.Sequence[typ.Optional[float]]) -> bytes:
+    """encode floats in the smallest type keeping values
+
+    Args:
+        values (typ.Sequence[typ.Optional[float]]): floats or None
+
+    Returns:
+        bytes: typecode and values
+    """
+    if all(v is None for v in values):
+        return b'n'
+    if all(v is not None and float(v).is_integer() and -128 <= v <= 127 for v in values):
+        # rssi and tx_power are int8 in HCI.
+        return b'b' + struct.pack(f'!{len(values)}b', *(int(v) for v in values))
+    return b'd' + struct.pack(f'!{len(values)}d', *(math.nan if v is None else v for v in values))
+
+
+def decode_floats(view: memoryview, count: int, pos: int = 0) -> typ.Tuple[typ.List[typ.Optional[float]], int]:
+    """decode floats encoded by encode_floats
+
+    Args:
+        view (memoryview): encoded bytes
+        count (int): count of floats
+        pos (int): start position
+
+    Returns:
+        typ.Tuple[typ.List[typ.Optional[float]], int]: floats and the next position
+    """
+    typecode = chr(view[pos])
+    pos += 1
+    if typecode == 'n':
+        return [None] * count, pos
+    fmt = struct.Struct(f'!{count}{typecode}')
+    values = fmt.unpack_from(view, pos)
+    if typecode == 'b':
+        return [float(v) for v in values], pos + fmt.size
+    return [None if math.isnan(v) else v for v in values], pos + fmt.size
+
+
+def _bytes(value: typ.Any) -> typ.Optional[bytes]:
+    # BinaryField is memoryview on some databases.
+    return None if value is None else bytes(value)
+
+
+def _to_json(entry: Entry) -> list:
+    local_name, company_code, manufacturer_data, service_uuid, service_data, tx_power = entry
+    return [local_name, company_code,
+            None if manufacturer_data is None else manufacturer_data.hex(),
+            None if service_uuid is None else str(service_uuid),
+            None if service_data is None else service_data.hex(),
+            tx_power]
+
+
+def _from_json(item: list) -> Entry:
+    local_name, company_code, manufacturer_data, service_uuid, service_data, tx_power = item
+    return (local_name, company_code,
+            None if manufacturer_data is None else bytes.fromhex(manufacturer_data),
+            None if service_uuid is None else uuid.UUID(service_uuid),
+            None if service_data is None else bytes.fromhex(service_data),
+            tx_power)
+
+
+def pack(rows: typ.Iterable[Row], base_time: datetime.datetime) -> bytes:
+    """pack rows of one device into columns
+
+    Repeated local name, payloads and tx power are saved once in the dictionary,
+    and ids and received datetimes are saved as deltas.
+
+    Args:
+        rows (typ.Iterable[Row]): rows in COLUMNS order
+        base_time (datetime.datetime): received datetimes are saved as offsets from this, ex. bucket start
+
+    Returns:
+        bytes: packed rows
+    """
+    rows = sorted(rows, key=lambda row: (row[1], row[0]))
+    entries: typ.Dict[Entry, int] = {}
+    indexes = []
+    for row in rows:
+        local_name, company_code, manufacturer_data, service_uuid, service_data, tx_power = row[2:8]
+        entry = (local_name, company_code, _bytes(manufacturer_data), service_uuid, _bytes(service_data), tx_power)
+        indexes.append(entries.setdefault(entry, len(entries)))
+    dictionary = json.dumps([_to_json(entry) for entry in entries], separators=(',', ':')).encode()
+    body = b''.join([
+        HEADER.pack(len(rows), len(dictionary)),
+        dictionary,
+        encode_varints(_deltas([row[0] for row in rows])),
+        encode_varints(_deltas([(row[1] - base_time) // MICROSECOND for row in rows])),
+        encode_varints(indexes),
+        encode_floats([row[8] for row in rows]),
+        encode_floats([row[9] for row in rows]),
+    ])
+    return zlib.compress(body)
+
+
+def unpack(data: bytes, base_time: datetime.datetime) -> typ.List[Row]:
+    """unpack rows packed by pack
+
+    Args:
+        data (bytes): packed rows
+        base_time (datetime.datetime): base time given to pack
+
+    Returns:
+        typ.List[Row]: rows in COLUMNS order, ordered by received datetime and id
+    """
+    view = memoryview(zlib.decompress(data))
+    count, size = HEADER.unpack_from(view)
+    pos = HEADER.size
+    entries = [_from_json(item) for item in json.loads(bytes(view[pos:pos + size]))]
+    pos += size
+    ids, pos = decode_varints(view, count, pos)
+    offsets, pos = decode_varints(view, count, pos)
+    indexes, pos = decode_varints(view, count, pos)
+    rssi, pos = decode_floats(view, count, pos)
+    rssi_smoothed, pos = decode_floats(view, count, pos)
+    return [(id, base_time + offset * MICROSECOND, *entries[index], r, s)
+            for id, offset, index, r, s in zip(_accumulate(ids), _accumulate(offsets), indexes, rssi, rssi_smoothed)]
@@ -0,0 +1,151 @@
+
+import struct
+import typing as typ
+from collections import defaultdict
+
+Fields = typ.Dict[str, typ.Union[int, float, str]]
+# (company_code, service_uuid, payload) of a result
+Entry = typ.Tuple[typ.Optional[int], typ.Optional[str], bytes]
+
+
+class Decoder:
+    """Decode payloads of one format into named fields.
+
+    Payloads of a format share one struct layout, so a batch is
+    unpacked at once by struct.iter_unpack over the joined payloads.
+    """
+
+    # format name saved with decoded fields
+    name: str = ''
+    company_code: typ.Optional[int] = None
+    service_uuid: typ.Optional[str] = None
+    prefix: bytes = b''
+    layout: struct.Struct = struct.Struct('')
+
+    def convert(self, values: tuple) -> Fields:
+        raise NotImplementedError
+
+    def decode_batch(self, payloads: typ.Sequence[bytes]) -> typ.List[typ.Optional[Fields]]:
+        """decode payloads
+
+        Args:
+            payloads (typ.Sequence[bytes]): payloads
+
+        Returns:
+            typ.List[typ.Optional[Fields]]: fields, None if the payload is not this format
+        """
+        size = self.layout.size
+        valid = [i for i, payload in enumerate(payloads)
+                 if len(payload) >= size and payload.startswith(self.prefix)]
+        ret: typ.List[typ.Optional[Fields]] = [None] * len(payloads)
+        joined = b''.join(bytes(payloads[i][:size]) for i in valid)
+        for i, values in zip(valid, self.layout.iter_unpack(joined)):
+            ret[i] = {k: v for k, v in self.convert(values).items() if v is not None}
+        return ret
+
+
+class IBeacon(Decoder):
+    name = 'ibeacon'
+    company_code = 0x004c
+    prefix = b'\x02\x15'
+    layout = struct.Struct('!2s16sHHb')
+
+    def convert(self, values: tuple) -> Fields:
+        _, uuid, major, minor, tx_power = values
+        return {'uuid': uuid.hex(), 'major': major, 'minor': minor, 'tx_power': tx_power}
+
+
+EDDYSTONE_UUID = '0000feaa-0000-1000-8000-00805f9b34fb'
+
+
+class EddystoneUid(Decoder):
+    name = 'eddystone_uid'
+    service_uuid = EDDYSTONE_UUID
+    prefix = b'\x00'
+    layout = struct.Struct('!Bb10s6s')
+
+    def convert(self, values: tuple) -> Fields:
+        _, tx_power, namespace, instance = values
+        return {'namespace': namespace.hex(), 'instance': instance.hex(), 'tx_power': tx_power}
+
+
+class EddystoneTlm(Decoder):
+    name = 'eddystone_tlm'
+    service_uuid = EDDYSTONE_UUID
+    # unencrypted TLM only
+    prefix = b'\x20\x00'
+    layout = struct.Struct('!BBHhII')
+
+    def convert(self, values: tuple) -> Fields:
+        _, _, battery, temperature, adv_count, sec_count = values
+        return {'battery': battery or None,
+                'temperature': None if temperature == -0x8000 else temperature / 256,
+                'adv_count': adv_count,
+                'uptime': sec_count / 10}
+
+
+class RuuviRawV2(Decoder):
+    name = 'ruuvi'
+    company_code = 0x0499
+    prefix = b'\x05'
+    layout = struct.Struct('!BhHHhhhHBH6s')
+
+    def convert(self, values: tuple) -> Fields:
+        _, temperature, humidity, pressure, acc_x, acc_y, acc_z, power, movement, seq, mac = values
+        return {'temperature': None if temperature == -0x8000 else temperature * 0.005,
+                'humidity': None if humidity == 0xffff else humidity * 0.0025,
+                'pressure': None if pressure == 0xffff else pressure + 50000,
+                'acc_x': acc_x,
+                'acc_y': acc_y,
+                'acc_z': acc_z,
+                'battery': (power >> 5) + 1600,
+                'tx_power': (power & 0x1f) * 2 - 40,
+                'movement': movement,
+                'seq': seq,
+                'mac': mac.hex()}
+
+
+class DecoderRegistry:
+    """Decoders looked up by company code or service uuid."""
+
+    def __init__(self, decoders: typ.Iterable[Decoder] = ()):
+        self._company_code: typ.Dict[int, typ.List[Decoder]] = defaultdict(list)
+        self._service_uuid: typ.Dict[str, typ.List[Decoder]] = defaultdict(list)
+        for decoder in decoders:
+            self.register(decoder)
+
+    def register(self, decoder: Decoder) -> Decoder:
+        if decoder.company_code is not None:
+            self._company_code[decoder.company_code].append(decoder)
+        if decoder.service_uuid is not None:
+            self._service_uuid[decoder.service_uuid.lower()].append(decoder)
+        return decoder
+
+    def decoders(self, company_code: typ.Optional[int], service_uuid: typ.Optional[str]) -> typ.List[Decoder]:
+        if service_uuid is not None:
+            return self._service_uuid.get(str(service_uuid).lower(), [])
+        return self._company_code.get(company_code, [])
+
+    def decode(self, entries: typ.Sequence[Entry]) -> typ.List[typ.List[typ.Tuple[str, Fields]]]:
+        """decode a batch of payloads. each decoder decodes its payloads at once.
+
+        Args:
+            entries (typ.Sequence[Entry]): company code, service uuid and payload
+
+        Returns:
+            typ.List[typ.List[typ.Tuple[str, Fields]]]: format name and fields of each entry
+        """
+        groups: typ.Dict[Decoder, typ.List[int]] = defaultdict(list)
+        for i, (company_code, service_uuid, _) in enumerate(entries):
+            for decoder in self.decoders(company_code, service_uuid):
+                groups[decoder].append(i)
+        ret: typ.List[typ.List[typ.Tuple[str, Fields]]] = [[] for _ in entries]
+        for decoder, indexes in groups.items():
+            for i, fields in zip(indexes, decoder.decode_batch([entries[i][2] for i in indexes])):
+                if fields:
+                    ret[i].append((decoder.name, fields))
+        return ret
+
+
+# built-in decoders. register() custom decoders to it.
+registry = DecoderRegistry([IBeacon(), EddystoneUid(), EddystoneTlm(), RuuviRawV2()])
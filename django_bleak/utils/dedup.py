@@ -0,0 +1,97 @@
+
+import threading
+import typing as typ
+from collections import OrderedDict
+
+# (key, payload, rssi)
+DedupEntry = typ.Tuple[typ.Hashable, typ.Optional[bytes], float]
+# key -> (payload hash, stored time, stored rssi)
+DedupState = typ.Dict[typ.Hashable, typ.Tuple[int, float, float]]
+
+
+class Deduplicator:
+    """Suppress repeated advertising data before saving.
+
+    An entry is suppressed when the same key already stored the same payload
+    within window seconds, and rssi did not change over rssi_threshold.
+    So changes are stored immediately and repeats are stored once per window
+    as keepalive.
+    """
+
+    DEFAULT_MAXSIZE = 100000
+
+    def __init__(self,
+                 window: float,
+                 rssi_threshold: typ.Optional[float] = None,
+                 maxsize: int = DEFAULT_MAXSIZE):
+        self.window = window
+        self.rssi_threshold = rssi_threshold
+        self.maxsize = maxsize
+        self._state: 'OrderedDict[typ.Hashable, typ.Tuple[int, float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # counters since last report
+        self.stored = 0
+        self.suppressed = 0
+
+    def _is_duplicate(self, last: typ.Optional[typ.Tuple[int, float, float]],
+                      digest: int, rssi: float, now: float) -> bool:
+        if last is None:
+            return False
+        last_digest, last_time, last_rssi = last
+        if last_digest != digest or now - last_time >= self.window:
+            return False
+        if self.rssi_threshold is not None and abs(rssi - last_rssi) >= self.rssi_threshold:
+            return False
+        return True
+
+    def check(self, entries: typ.Iterable[DedupEntry], now: float) -> typ.Tuple[typ.List[bool], DedupState]:
+        """check entries without updating state
+
+        Args:
+            entries (typ.Iterable[DedupEntry]): (key, payload, rssi) list
+            now (float): received timestamp[sec]
+
+        Returns:
+            typ.Tuple[typ.List[bool], DedupState]:
+                True if the entry should be stored, and state to commit when stored.
+        """
+        keeps = []
+        staged: DedupState = {}
+        with self._lock:
+            for key, payload, rssi in entries:
+                digest = hash(payload)
+                last = staged.get(key) or self._state.get(key)
+                keep = not self._is_duplicate(last, digest, rssi, now)
+                if keep:
+                    staged[key] = (digest, now, rssi)
+                keeps.append(keep)
+        return keeps, staged
+
+    def commit(self, keeps: typ.List[bool], staged: DedupState):
+        """update state after entries are stored
+
+        Args:
+            keeps (typ.List[bool]): flags returned by check
+            staged (DedupState): state returned by check
+        """
+        with self._lock:
+            for key, value in staged.items():
+                self._state[key] = value
+                self._state.move_to_end(key)
+            while len(self._state) > self.maxsize:
+                self._state.popitem(last=False)
+            stored = sum(keeps)
+            self.stored += stored
+            self.suppressed += len(keeps) - stored
+
+    def report(self) -> typ.Tuple[int, int]:
+        """get counters since last report, and reset them
+
+        Returns:
+            typ.Tuple[int, int]: (stored, suppressed)
+        """
+        with self._lock:
+            res = (self.stored, self.suppressed)
+            self.stored = 0
+            self.suppressed = 0
+        return res
@@ -0,0 +1,113 @@
+
+import csv
+import datetime
+import json
+import typing as typ
+import uuid
+
+# exported columns of BleScanResult
+FIELDS = ('id', 'received_at', 'device_id', 'local_name', 'company_code', 'manufacturer_data',
+          'service_uuid', 'service_data', 'tx_power', 'rssi')
+
+Row = typ.Dict[str, typ.Any]
+
+
+def to_text(value: typ.Any) -> typ.Any:
+    """convert value to json/csv compatible value
+
+    Args:
+        value (typ.Any): column value
+
+    Returns:
+        typ.Any: bytes are hex string, datetime is iso format and uuid is string.
+    """
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+class ExportWriter:
+    """Write rows incrementally. Rows are given in chunks."""
+
+    def __init__(self, fp: typ.IO, fields: typ.Sequence[str] = FIELDS):
+        self.fp = fp
+        self.fields = tuple(fields)
+
+    def write(self, rows: typ.List[Row]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class CsvWriter(ExportWriter):
+
+    def __init__(self, fp: typ.TextIO, fields: typ.Sequence[str] = FIELDS):
+        super().__init__(fp, fields)
+        self._writer = csv.writer(fp)
+        # no header when appending
+        if not fp.seekable() or fp.tell() == 0:
+            self._writer.writerow(self.fields)
+
+    def write(self, rows: typ.List[Row]):
+        self._writer.writerows([to_text(row[f]) for f in self.fields] for row in rows)
+
+
+class JsonLinesWriter(ExportWriter):
+
+    def write(self, rows: typ.List[Row]):
+        self.fp.writelines(json.dumps({f: to_text(row[f]) for f in self.fields}) + '\n'
+                           for row in rows)
+
+
+class ParquetWriter(ExportWriter):
+    """Write each chunk as a row group. pyarrow is required."""
+
+    def __init__(self, fp: typ.BinaryIO, fields: typ.Sequence[str] = FIELDS):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError('pyarrow is required to export parquet. pip install django_bleak[parquet]') from e
+        super().__init__(fp, fields)
+        types = {
+            'id': pa.int64(),
+            'received_at': pa.timestamp('us', tz='UTC'),
+            'device_id': pa.string(),
+            'local_name': pa.string(),
+            'company_code': pa.int32(),
+            'manufacturer_data': pa.binary(),
+            'service_uuid': pa.string(),
+            'service_data': pa.binary(),
+            'tx_power': pa.float64(),
+            'rssi': pa.float64(),
+        }
+        self._pa = pa
+        self._schema = pa.schema([(f, types[f]) for f in self.fields])
+        self._writer = pq.ParquetWriter(fp, self._schema)
+
+    def write(self, rows: typ.List[Row]):
+        columns = {}
+        for f in self.fields:
+            if self._schema.field(f).type in (self._pa.binary(), self._pa.string()):
+                columns[f] = [None if row[f] is None
+                              else bytes(row[f]) if isinstance(row[f], memoryview)
+                              else row[f] if isinstance(row[f], (bytes, str))
+                              else str(row[f]) for row in rows]
+            else:
+                columns[f] = [row[f] for row in rows]
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS: typ.Dict[str, typ.Type[ExportWriter]] = {
+    'csv': CsvWriter,
+    'jsonl': JsonLinesWriter,
+    'parquet': ParquetWriter,
+}
@@ -0,0 +1,271 @@
+
+import bisect
+import logging
+import math
+import threading
+import typing as typ
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .spec import load_spec
+
+logger = logging.getLogger('ble_scanner')
+
+# seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# count of advertising data
+SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _format(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return str(value)
+
+
+class Counter:
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> typ.Iterator[typ.Tuple[str, str, float]]:
+        yield self.name, '', self.value
+
+
+class FuncMetric:
+    """counter or gauge whose value is read from func when collected,
+    so counters kept by other objects cost nothing on the hot path."""
+
+    def __init__(self, name: str, help: str, func: typ.Callable[[], float], kind: str = 'gauge'):
+        self.name = name
+        self.help = help
+        self.func = func
+        self.kind = kind
+
+    def samples(self) -> typ.Iterator[typ.Tuple[str, str, float]]:
+        yield self.name, '', self.func()
+
+
+class Histogram:
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, buckets: typ.Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self) -> typ.Iterator[typ.Tuple[str, str, float]]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = 0
+        for le, n in zip(self.buckets + (math.inf,), counts):
+            cumulative += n
+            yield f'{self.name}_bucket', f'{{le="{_format(float(le))}"}}', cumulative
+        yield f'{self.name}_sum', '', total
+        yield f'{self.name}_count', '', count
+
+
+Metric = typ.Union[Counter, FuncMetric, Histogram]
+
+
+class MetricsRegistry:
+    """Counters and histograms of the scanner.
+
+    Instrumented code checks enabled before measuring, so metrics cost
+    one attribute lookup per batch while no sink is started.
+    """
+
+    def __init__(self, prefix: str = 'django_bleak_'):
+        self.prefix = prefix
+        self.enabled = False
+        self._metrics: 'OrderedDict[str, Metric]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _register(self, metric: Metric, replace: bool = False) -> Metric:
+        with self._lock:
+            current = self._metrics.get(metric.name)
+            if current is not None and not replace:
+                return current
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(self.prefix + name, help))
+
+    def histogram(self, name: str, help: str, buckets: typ.Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self.prefix + name, help, buckets))
+
+    def func(self, name: str, help: str, func: typ.Callable[[], float], kind: str = 'gauge') -> FuncMetric:
+        """register a metric read from func. the metric of the same name is replaced."""
+        return self._register(FuncMetric(self.prefix + name, help, func, kind), replace=True)
+
+    def collect(self) -> typ.List[Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        """text exposition format of Prometheus
+
+        Returns:
+            str: metrics
+        """
+        lines = []
+        for metric in self.collect():
+            try:
+                samples = list(metric.samples())
+            except Exception:
+                logger.exception(f'failed to collect {metric.name}.')
+                continue
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines += [f'{name}{labels} {_format(value)}' for name, labels, value in samples]
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        """one line of counters, gauges and histogram means for logs
+
+        Returns:
+            str: metrics
+        """
+        items = []
+        for metric in self.collect():
+            name = metric.name[len(self.prefix):]
+            if isinstance(metric, Histogram):
+                mean = metric.sum / metric.count if metric.count else 0.0
+                items.append(f'{name}={metric.count}/{mean:.4g}')
+            else:
+                try:
+                    items.append(f'{name}={next(metric.samples())[2]:.6g}')
+                except Exception:
+                    logger.exception(f'failed to collect {metric.name}.')
+        return ' '.join(items)
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsSink:
+    """Output of metrics, started while the scanner runs.
+
+    Options are given by load_sink() like "prometheus:port=9464".
+    """
+
+    options: typ.Dict[str, typ.Any] = {}
+
+    def __init__(self, registry: MetricsRegistry = metrics, **options):
+        self.registry = registry
+        self.options = {**self.options, **options}
+
+    def start(self):
+        self.registry.enabled = True
+
+    def report(self):
+        """called every BleScanEvent.interval seconds"""
+
+    def stop(self):
+        self.registry.enabled = False
+
+
+class LogSink(MetricsSink):
+    """log metrics every BleScanEvent.interval seconds"""
+
+    def report(self):
+        logger.info(f'metrics {self.registry.summary()}')
+
+
+class PrometheusSink(MetricsSink):
+    """serve metrics in the text format of Prometheus on a local http server.
+
+    Options:
+        addr (str): listening address
+        port (int): listening port. 0 is any free port.
+    """
+
+    options = {
+        'addr': '127.0.0.1',
+        'port': 9464,
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.server: typ.Optional[ThreadingHTTPServer] = None
+        self._thread: typ.Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f'metrics {self.address_string()} {format % args}')
+
+        self.server = ThreadingHTTPServer((self.options['addr'], self.options['port']), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name='ble_metrics', daemon=True)
+        self._thread.start()
+        super().start()
+        logger.info(f'metrics are served on http://{self.options["addr"]}:{self.port}/metrics')
+
+    def stop(self):
+        super().stop()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self._thread.join()
+            self.server = None
+
+
+SINKS = {
+    'log': LogSink,
+    'prometheus': PrometheusSink,
+}
+
+
+def load_sink(spec: str, registry: MetricsRegistry = metrics) -> MetricsSink:
+    """metrics sink from sink spec
+
+    Args:
+        spec (str): "log" or "prometheus:addr=0.0.0.0,port=9464"
+        registry (MetricsRegistry): metrics
+
+    Returns:
+        MetricsSink: sink, not started
+    """
+    cls, options = load_spec(spec, SINKS, 'metrics sink')
+    return cls(registry, **options)
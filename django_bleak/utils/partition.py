@@ -0,0 +1,198 @@
+
+import datetime
+import re
+import typing as typ
+
+from django.db import models
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+# partition of table by month, ex. django_bleak_blescanresult_p202301
+PARTITION_SUFFIX = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+def month_start(dt: datetime.datetime) -> datetime.datetime:
+    """get first datetime of month in UTC
+
+    Args:
+        dt (datetime.datetime): aware datetime
+
+    Returns:
+        datetime.datetime: first datetime of month
+    """
+    dt = dt.astimezone(datetime.timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(dt: datetime.datetime) -> datetime.datetime:
+    """get first datetime of next month in UTC
+
+    Args:
+        dt (datetime.datetime): aware datetime
+
+    Returns:
+        datetime.datetime: first datetime of next month
+    """
+    dt = month_start(dt)
+    return dt.replace(year=dt.year + dt.month // 12, month=dt.month % 12 + 1)
+
+
+def partition_name(table: str, start: datetime.datetime) -> str:
+    return f'{table}_p{start:%Y%m}'
+
+
+def partition_sql(connection: BaseDatabaseWrapper, table: str, start: datetime.datetime,
+                  if_not_exists: bool = False) -> str:
+    """get DDL creating the monthly partition of received_at
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        table (str): partitioned table name
+        start (datetime.datetime): first datetime of month
+        if_not_exists (bool): do nothing if the partition exists
+
+    Returns:
+        str: CREATE TABLE statement
+    """
+    qn = connection.ops.quote_name
+    # bounds are generated here, not user input.
+    return (f"CREATE TABLE {'IF NOT EXISTS ' if if_not_exists else ''}{qn(partition_name(table, start))} "
+            f"PARTITION OF {qn(table)} FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')")
+
+
+def is_partitioned(connection: BaseDatabaseWrapper, table: str) -> bool:
+    """is table partitioned on PostgreSQL
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        table (str): table name
+
+    Returns:
+        bool: True if table is partitioned
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table pt '
+                       'JOIN pg_class c ON c.oid = pt.partrelid '
+                       'WHERE c.relname = %s', [table])
+        return cursor.fetchone() is not None
+
+
+def list_partitions(connection: BaseDatabaseWrapper, table: str) -> typ.Dict[str, datetime.datetime]:
+    """get monthly partitions of table
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        table (str): table name
+
+    Returns:
+        typ.Dict[str, datetime.datetime]: partition name and its first datetime
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT c.relname FROM pg_inherits i '
+                       'JOIN pg_class c ON c.oid = i.inhrelid '
+                       'JOIN pg_class p ON p.oid = i.inhparent '
+                       'WHERE p.relname = %s', [table])
+        names = [name for name, in cursor.fetchall()]
+    res = {}
+    for name in names:
+        m = PARTITION_SUFFIX.search(name)
+        if m and name == table + m.group(0):
+            res[name] = datetime.datetime(int(m.group(1)), int(m.group(2)), 1, tzinfo=datetime.timezone.utc)
+    return res
+
+
+def create_partitions(connection: BaseDatabaseWrapper, table: str,
+                      start: datetime.datetime, months: int) -> typ.List[str]:
+    """create monthly partitions of received_at if not exists
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        table (str): partitioned table name
+        start (datetime.datetime): datetime in the first month
+        months (int): count of months
+
+    Returns:
+        typ.List[str]: partition names
+    """
+    res = []
+    lo = month_start(start)
+    with connection.cursor() as cursor:
+        for _ in range(months):
+            cursor.execute(partition_sql(connection, table, lo, if_not_exists=True))
+            res.append(partition_name(table, lo))
+            lo = next_month(lo)
+    return res
+
+
+def drop_partitions(connection: BaseDatabaseWrapper, table: str,
+                    before: datetime.datetime) -> typ.List[str]:
+    """drop monthly partitions whose all rows are received before `before`
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        table (str): partitioned table name
+        before (datetime.datetime): cutoff datetime
+
+    Returns:
+        typ.List[str]: dropped partition names
+    """
+    qn = connection.ops.quote_name
+    res = []
+    with connection.cursor() as cursor:
+        for name, start in sorted(list_partitions(connection, table).items()):
+            if next_month(start) <= before:
+                cursor.execute(f'DROP TABLE {qn(name)}')
+                res.append(name)
+    return res
+
+
+def convert_sql(connection: BaseDatabaseWrapper, model: typ.Type[models.Model],
+                start: datetime.datetime, end: datetime.datetime) -> typ.List[str]:
+    """get DDL converting the table of model to monthly partitions of received_at on PostgreSQL
+
+    Rows are copied to the new table, and the old table is dropped.
+    The primary key becomes (id, received_at), because it must include the partition key.
+    id is an identity column continuing from the last id, even if it was a serial column.
+
+    Args:
+        connection (BaseDatabaseWrapper): database connection
+        model (typ.Type[models.Model]): model with id and received_at, ex. BleScanResult
+        start (datetime.datetime): datetime in the first month
+        end (datetime.datetime): datetime in the last month
+
+    Returns:
+        typ.List[str]: statements executed in order in a transaction
+    """
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    old = f'{table}_old'
+    res = [
+        f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}',
+        # constraints and indexes are created after copying rows and dropping the old table, which has the same names.
+        f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS) PARTITION BY RANGE ({qn("received_at")})',
+        # a serial column refers to the sequence of the old table.
+        f'ALTER TABLE {qn(table)} ALTER COLUMN {qn("id")} DROP DEFAULT',
+        f'ALTER TABLE {qn(table)} ALTER COLUMN {qn("id")} ADD GENERATED BY DEFAULT AS IDENTITY',
+    ]
+    lo = month_start(start)
+    while lo <= end:
+        res.append(partition_sql(connection, table, lo))
+        lo = next_month(lo)
+    res += [
+        f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}',
+        f"SELECT setval(pg_get_serial_sequence('{qn(table)}', 'id'), COALESCE(MAX({qn('id')}), 0) + 1, false) "
+        f'FROM {qn(table)}',
+        f'DROP TABLE {qn(old)}',
+        f'ALTER TABLE {qn(table)} ADD PRIMARY KEY ({qn("id")}, {qn("received_at")})',
+    ]
+    for field in model._meta.concrete_fields:
+        if field.remote_field is not None and field.db_constraint:
+            target = field.target_field
+            res.append(f'ALTER TABLE {qn(table)} ADD FOREIGN KEY ({qn(field.column)}) '
+                       f'REFERENCES {qn(target.model._meta.db_table)} ({qn(target.column)}) '
+                       'DEFERRABLE INITIALLY DEFERRED')
+    # statements are only built, not executed.
+    editor = connection.schema_editor(collect_sql=True)
+    res += [str(sql) for sql in editor._model_indexes_sql(model)]
+    return res
@@ -0,0 +1,184 @@
+
+import threading
+import typing as typ
+from collections import OrderedDict
+from enum import Enum
+
+K = typ.TypeVar('K', bound=typ.Hashable)
+# (key, received timestamp[sec], rssi)
+PresenceEntry = typ.Tuple[typ.Hashable, float, float]
+
+
+class PresenceState:
+    """presence of a device since it entered"""
+
+    __slots__ = ('first_seen', 'last_seen', 'rssi', 'count', 'saved_id')
+
+    def __init__(self, now: float, rssi: float):
+        self.first_seen = now
+        self.last_seen = now
+        # smoothed rssi[dBm]
+        self.rssi = rssi
+        self.count = 1
+        # id of the saved presence, set by the caller.
+        self.saved_id: typ.Optional[int] = None
+
+    def copy(self) -> 'PresenceState':
+        state = PresenceState(self.first_seen, self.rssi)
+        state.last_seen = self.last_seen
+        state.count = self.count
+        state.saved_id = self.saved_id
+        return state
+
+
+class Transition(typ.NamedTuple):
+
+    class Kind(str, Enum):
+        ENTER = 'enter'
+        LEAVE = 'leave'
+
+    kind: 'Transition.Kind'
+    key: typ.Hashable
+    state: PresenceState
+
+
+# (state copied by check or None if entered, updated state)
+StagedState = typ.Tuple[typ.Optional[PresenceState], PresenceState]
+
+
+class PresenceTracker(typ.Generic[K]):
+    """Track devices present within timeout seconds.
+
+    Each advertising data updates the state of its device in O(1),
+    and only transitions are returned: enter when a device is seen
+    after timeout seconds or never, and leave when it is not seen
+    for timeout seconds. rssi is smoothed by exponential moving average.
+    """
+
+    DEFAULT_TIMEOUT = 30.0
+    DEFAULT_ALPHA = 0.3
+
+    def __init__(self,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 alpha: float = DEFAULT_ALPHA,
+                 event: typ.Optional[str] = None):
+        if timeout <= 0 or not 0 < alpha <= 1:
+            raise ValueError('0 < timeout and 0 < alpha <= 1 are required.')
+        self.timeout = timeout
+        self.alpha = alpha
+        # scan event name saved with transitions
+        self.event = event
+        # least recently seen first
+        self._present: 'OrderedDict[K, PresenceState]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._present)
+
+    def __contains__(self, key: K):
+        return key in self._present
+
+    def get(self, key: K) -> typ.Optional[PresenceState]:
+        return self._present.get(key)
+
+    def observe(self, entries: typ.Iterable[PresenceEntry]) -> typ.List[Transition]:
+        """update states by advertising data
+
+        Args:
+            entries (typ.Iterable[PresenceEntry]): (key, received timestamp, rssi) list
+
+        Returns:
+            typ.List[Transition]: transitions in order
+        """
+        transitions, staged = self.check(entries)
+        self.commit(staged)
+        return transitions
+
+    def check(self, entries: typ.Iterable[PresenceEntry]
+              ) -> typ.Tuple[typ.List[Transition], typ.Dict[K, StagedState]]:
+        """get transitions by advertising data without updating states
+
+        Updated states are copies, so states are kept if saving transitions is rolled back.
+
+        Args:
+            entries (typ.Iterable[PresenceEntry]): (key, received timestamp, rssi) list
+
+        Returns:
+            typ.Tuple[typ.List[Transition], typ.Dict[K, StagedState]]:
+                transitions in order, and states to commit when transitions are saved.
+        """
+        res = []
+        staged: typ.Dict[K, StagedState] = {}
+        with self._lock:
+            for key, now, rssi in entries:
+                base, state = staged.get(key, (None, None))
+                if state is None:
+                    base = state = self._present.get(key)
+                if state is not None and now - state.last_seen > self.timeout:
+                    # not seen for timeout seconds, but not expired yet.
+                    res.append(Transition(Transition.Kind.LEAVE, key, state))
+                    state = None
+                if state is None:
+                    # staged in the order of last seen.
+                    staged.pop(key, None)
+                    state = PresenceState(now, rssi)
+                    staged[key] = (None, state)
+                    res.append(Transition(Transition.Kind.ENTER, key, state))
+                    continue
+                if key not in staged:
+                    state = state.copy()
+                    staged[key] = (base, state)
+                state.rssi += self.alpha * (rssi - state.rssi)
+                state.count += 1
+                if now > state.last_seen:
+                    state.last_seen = now
+                    staged[key] = staged.pop(key)
+        return res, staged
+
+    def commit(self, staged: typ.Dict[K, StagedState]):
+        """update states after transitions are saved
+
+        A state copied from a device which left after check, ex. by expire in another thread,
+        is discarded, because its leave is saved. The device enters again by next advertising data.
+
+        Args:
+            staged (typ.Dict[K, StagedState]): states returned by check
+        """
+        with self._lock:
+            for key, (base, state) in staged.items():
+                current = self._present.get(key)
+                if base is not None and current is not base:
+                    continue
+                self._present[key] = state
+                if current is not None and state.last_seen > current.last_seen:
+                    self._present.move_to_end(key)
+
+    def expire(self, now: float) -> typ.List[Transition]:
+        """leave devices not seen for timeout seconds
+
+        Args:
+            now (float): current timestamp[sec]
+
+        Returns:
+            typ.List[Transition]: leave transitions
+        """
+        res = []
+        with self._lock:
+            while self._present:
+                key, state = next(iter(self._present.items()))
+                if now - state.last_seen <= self.timeout:
+                    break
+                del self._present[key]
+                res.append(Transition(Transition.Kind.LEAVE, key, state))
+        return res
+
+    def leave_all(self) -> typ.List[Transition]:
+        """leave all devices, ex. when scanning is stopped
+
+        Returns:
+            typ.List[Transition]: leave transitions
+        """
+        with self._lock:
+            res = [Transition(Transition.Kind.LEAVE, key, state) for key, state in self._present.items()]
+            self._present.clear()
+        return res
@@ -0,0 +1,249 @@
+
+import datetime
+import threading
+import typing as typ
+from collections import OrderedDict
+
+if typ.TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_ALPHA = 0.3
+# kalman filter of a constant rssi with random walk noise.
+DEFAULT_PROCESS_NOISE = 0.008
+DEFAULT_MEASUREMENT_NOISE = 4.0
+# rssi[dBm] at 1m when tx_power is unknown. measured power of iBeacon is similar.
+DEFAULT_MEASURED_POWER = -59.0
+# path loss[dB] at 1m of 2.4GHz, so measured power is tx_power - 41.
+DEFAULT_LOSS_1M = 41.0
+DEFAULT_PATH_LOSS_EXPONENT = 2.0
+# exp(-600) does not underflow float64.
+_MIN_LOG_DECAY = -600.0
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError('numpy is required to process rssi in batch. pip install django_bleak[numpy]') from e
+    return np
+
+
+def _smooth(rssi: 'np.ndarray', gains: 'np.ndarray', initial: typ.Optional[float]) -> 'np.ndarray':
+    # y[n] = (1 - k[n]) * y[n-1] + k[n] * x[n] is unrolled as
+    # y[n] = D[n] * (y[-1] + sum(k[i] * x[i] / D[i])), D[n] = prod(1 - k[i]),
+    # in blocks where D does not underflow.
+    np = _numpy()
+    res = np.empty_like(rssi)
+    if not len(rssi):
+        return res
+    decay = 1.0 - np.minimum(gains, 1.0 - 1e-9)
+    # -log(D) from the first, increasing.
+    log_decay = -np.cumsum(np.log(decay))
+    last = rssi[0] if initial is None else initial
+    start = 0
+    while start < len(rssi):
+        base = log_decay[start - 1] if start else 0.0
+        end = max(start + 1, int(np.searchsorted(log_decay, base - _MIN_LOG_DECAY, side='right')))
+        d = np.cumprod(decay[start:end])
+        out = res[start:end]
+        out[:] = d * (last + np.cumsum((1.0 - decay[start:end]) * rssi[start:end] / d))
+        last = out[-1]
+        start = end
+    return res
+
+
+def ema(rssi: typ.Sequence[float],
+        alpha: float = DEFAULT_ALPHA,
+        initial: typ.Optional[float] = None) -> 'np.ndarray':
+    """smooth rssi by exponential moving average, vectorized
+
+    Args:
+        rssi (typ.Sequence[float]): rssi[dBm] in received order
+        alpha (float): weight of new rssi. 0 < alpha <= 1
+        initial (typ.Optional[float]): smoothed rssi before the first. None is the first rssi.
+
+    Returns:
+        np.ndarray: smoothed rssi[dBm]
+    """
+    np = _numpy()
+    if not 0 < alpha <= 1:
+        raise ValueError('0 < alpha <= 1 is required.')
+    rssi = np.asarray(rssi, dtype=float)
+    if alpha == 1:
+        return rssi.copy()
+    return _smooth(rssi, np.full(len(rssi), alpha), initial)
+
+
+def kalman_gains(count: int,
+                 process_noise: float = DEFAULT_PROCESS_NOISE,
+                 measurement_noise: float = DEFAULT_MEASUREMENT_NOISE) -> 'np.ndarray':
+    """gains of 1D kalman filter. the first estimate is the first rssi with measurement noise.
+
+    Gains do not depend on rssi, and converge in some steps,
+    so only steps until converged are computed by a loop.
+
+    Args:
+        count (int): count of rssi
+        process_noise (float): variance of rssi change per step
+        measurement_noise (float): variance of measured rssi
+
+    Returns:
+        np.ndarray: gain of each step. gain of the first is 1.
+    """
+    np = _numpy()
+    gains = np.empty(count)
+    p = measurement_noise
+    gain = 1.0
+    for i in range(count):
+        gains[i] = gain
+        p += process_noise
+        new = p / (p + measurement_noise)
+        p *= 1.0 - new
+        if abs(new - gain) < 1e-12:
+            gains[i + 1:] = new
+            break
+        gain = new
+    return gains
+
+
+def kalman(rssi: typ.Sequence[float],
+           process_noise: float = DEFAULT_PROCESS_NOISE,
+           measurement_noise: float = DEFAULT_MEASUREMENT_NOISE,
+           initial: typ.Optional[float] = None) -> 'np.ndarray':
+    """smooth rssi by 1D kalman filter, vectorized
+
+    Args:
+        rssi (typ.Sequence[float]): rssi[dBm] in received order
+        process_noise (float): variance of rssi change per step
+        measurement_noise (float): variance of measured rssi
+        initial (typ.Optional[float]): smoothed rssi before the first. None is the first rssi.
+
+    Returns:
+        np.ndarray: smoothed rssi[dBm]
+    """
+    np = _numpy()
+    rssi = np.asarray(rssi, dtype=float)
+    gains = kalman_gains(len(rssi) + 1, process_noise, measurement_noise)
+    # with initial, the first rssi is the second step.
+    return _smooth(rssi, gains[:-1] if initial is None else gains[1:], initial)
+
+
+def distance(rssi: typ.Sequence[float],
+             tx_power: typ.Optional[typ.Sequence[typ.Optional[float]]] = None,
+             measured_power: float = DEFAULT_MEASURED_POWER,
+             path_loss_exponent: float = DEFAULT_PATH_LOSS_EXPONENT) -> 'np.ndarray':
+    """estimate distance by log-distance path loss model, vectorized
+
+    Args:
+        rssi (typ.Sequence[float]): rssi[dBm], usually smoothed
+        tx_power (typ.Optional[typ.Sequence[typ.Optional[float]]]):
+            tx power[dBm] of each rssi. None or nan uses measured_power.
+        measured_power (float): rssi[dBm] at 1m
+        path_loss_exponent (float): 2 in free space, 2.7 to 4 indoors
+
+    Returns:
+        np.ndarray: distance[m]
+    """
+    np = _numpy()
+    rssi = np.asarray(rssi, dtype=float)
+    ref = np.full_like(rssi, measured_power)
+    if tx_power is not None:
+        tx_power = np.asarray(tx_power, dtype=float)
+        ref = np.where(np.isnan(tx_power), ref, tx_power - DEFAULT_LOSS_1M)
+    return np.power(10.0, (ref - rssi) / (10.0 * path_loss_exponent))
+
+
+def rssi_arrays(rows: typ.Iterable[typ.Tuple[datetime.datetime, float, typ.Optional[float]]]
+                ) -> typ.Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """convert rows of results to arrays
+
+    Args:
+        rows (typ.Iterable[typ.Tuple[datetime.datetime, float, typ.Optional[float]]]):
+            received datetime, rssi and tx_power
+
+    Returns:
+        typ.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            received unix time, rssi[dBm] and tx power[dBm] (nan if None)
+    """
+    np = _numpy()
+    received_at, rssi, tx_power = [], [], []
+    for at, value, power in rows:
+        received_at.append(at.timestamp())
+        rssi.append(value)
+        tx_power.append(power)
+    return (np.array(received_at, dtype=float), np.array(rssi, dtype=float),
+            np.array(tx_power, dtype=float))
+
+
+class RssiSmoother:
+    """Smooth rssi per device by exponential moving average on ingest.
+
+    Each rssi is smoothed in O(1) without numpy, and
+    the least recently updated devices are evicted over maxsize.
+    """
+
+    DEFAULT_MAXSIZE = 100000
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA, maxsize: int = DEFAULT_MAXSIZE):
+        if not 0 < alpha <= 1:
+            raise ValueError('0 < alpha <= 1 is required.')
+        self.alpha = alpha
+        self.maxsize = maxsize
+        self._last: 'OrderedDict[typ.Hashable, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._last)
+
+    def update(self, entries: typ.Iterable[typ.Tuple[typ.Hashable, float]]) -> typ.List[float]:
+        """smooth rssi in received order
+
+        Args:
+            entries (typ.Iterable[typ.Tuple[typ.Hashable, float]]): (key, rssi) list
+
+        Returns:
+            typ.List[float]: smoothed rssi
+        """
+        res, staged = self.check(entries)
+        self.commit(staged)
+        return res
+
+    def check(self, entries: typ.Iterable[typ.Tuple[typ.Hashable, float]]
+              ) -> typ.Tuple[typ.List[float], typ.Dict[typ.Hashable, float]]:
+        """smooth rssi in received order without updating state
+
+        Args:
+            entries (typ.Iterable[typ.Tuple[typ.Hashable, float]]): (key, rssi) list
+
+        Returns:
+            typ.Tuple[typ.List[float], typ.Dict[typ.Hashable, float]]:
+                smoothed rssi, and state to commit when they are saved.
+        """
+        res = []
+        staged: typ.Dict[typ.Hashable, float] = {}
+        alpha = self.alpha
+        with self._lock:
+            last = self._last
+            for key, rssi in entries:
+                value = staged.pop(key, None)
+                if value is None:
+                    value = last.get(key)
+                value = rssi if value is None else value + alpha * (rssi - value)
+                # staged in the order of last update.
+                staged[key] = value
+                res.append(value)
+        return res, staged
+
+    def commit(self, staged: typ.Dict[typ.Hashable, float]):
+        """update state after smoothed rssi are saved
+
+        Args:
+            staged (typ.Dict[typ.Hashable, float]): state returned by check
+        """
+        with self._lock:
+            last = self._last
+            for key, value in staged.items():
+                last[key] = value
+                last.move_to_end(key)
+            while len(last) > self.maxsize:
+                last.popitem(last=False)
@@ -0,0 +1,34 @@
+
+import ast
+import typing as typ
+
+T = typ.TypeVar('T')
+
+
+def load_spec(spec: str, classes: typ.Mapping[str, T], kind: str) -> typ.Tuple[T, typ.Dict[str, typ.Any]]:
+    """class and options from spec like "name:key=value,key=value"
+
+    Values are python literals, or strings if not, ex. rate=10000 is int and path=capture.bin is str.
+
+    Args:
+        spec (str): spec, ex. "synthetic:devices=1000,rate=10000"
+        classes (typ.Mapping[str, T]): class by name. options of a class are the keys of its `options`.
+        kind (str): name of classes in errors, ex. "backend"
+
+    Returns:
+        typ.Tuple[T, typ.Dict[str, typ.Any]]: class and options
+    """
+    name, _, args = spec.partition(':')
+    if name not in classes:
+        raise ValueError(f'unknown {kind} {name}. choose from {", ".join(classes)}.')
+    cls = classes[name]
+    options = {}
+    for arg in filter(None, args.split(',')):
+        key, _, value = arg.partition('=')
+        if key not in getattr(cls, 'options', ()):
+            raise ValueError(f'unknown option {key} of {name} {kind}.')
+        try:
+            options[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            options[key] = value
+    return cls, options
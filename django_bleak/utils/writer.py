@@ -0,0 +1,160 @@
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+import typing as typ
+
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger('ble_scanner')
+
+T = typ.TypeVar('T')
+
+
+class WriterReport(typ.NamedTuple):
+    # batches waiting in the queue or being written
+    depth: int
+    # advertising data in those batches
+    pending: int
+    written: int
+    failed: int
+    # seconds from submit to written
+    latency_mean: float
+    latency_max: float
+    # seconds of write only
+    write_mean: float
+
+
+class BatchWriter(typ.Generic[T]):
+    """Write batches in a dedicated thread fed through a queue.
+
+    The thread keeps its own database connection while running, so
+    saving does not go through the thread sensitive executor of asgiref.
+    submit() returns without waiting for the write, and waits only when
+    max_pending batches are not written yet, so a slow database fills
+    the buffer in front of it instead of blocking the event loop.
+    """
+
+    DEFAULT_MAX_PENDING = 4
+
+    def __init__(self,
+                 write: typ.Callable[[typ.List[T]], typ.Any],
+                 max_pending: int = DEFAULT_MAX_PENDING,
+                 name: str = 'ble_writer'):
+        if max_pending < 1:
+            raise ValueError('1 <= max_pending is required.')
+        self._write = write
+        self.max_pending = max_pending
+        self.name = name
+        self._queue: 'queue.SimpleQueue[typ.Optional[typ.Tuple[float, typ.List[T]]]]' = queue.SimpleQueue()
+        self._thread: typ.Optional[threading.Thread] = None
+        self._loop: typ.Optional[asyncio.AbstractEventLoop] = None
+        self._slots: typ.Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        # counters. submitted are updated by the event loop, the others by the thread.
+        self.submitted_batches = 0
+        self.submitted = 0
+        self.written_batches = 0
+        self.written = 0
+        self.failed = 0
+        self._written = 0
+        self._failed = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._write_sum = 0.0
+        self._batches = 0
+
+    @property
+    def depth(self) -> int:
+        return self.submitted_batches - self.written_batches
+
+    @property
+    def pending(self) -> int:
+        return self.submitted - self.written - self.failed
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """start the thread. call it in the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f'{self.name} started.')
+
+    async def submit(self, batch: typ.List[T]):
+        """hand a batch to the thread without waiting for the write
+
+        Args:
+            batch (typ.List[T]): advertising data
+        """
+        if self._slots is None:
+            raise RuntimeError('start() is required before submit().')
+        await self._slots.acquire()
+        self.submitted_batches += 1
+        self.submitted += len(batch)
+        self._queue.put((time.monotonic(), batch))
+
+    async def stop(self):
+        """write all submitted batches and stop the thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        await self._loop.run_in_executor(None, self._thread.join)
+        self._thread = None
+        logger.info(f'{self.name} finish. submitted={self.submitted} written={self.written} failed={self.failed}')
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                submitted_at, batch = item
+                started = time.monotonic()
+                try:
+                    self._write(batch)
+                    ok = True
+                except Exception:
+                    ok = False
+                    logger.exception(f'write failed. {len(batch)} data discarded.')
+                    # reconnect next time if the connection is broken.
+                    close_old_connections()
+                finished = time.monotonic()
+                self._done(len(batch), ok, finished - submitted_at, finished - started)
+                self._loop.call_soon_threadsafe(self._slots.release)
+        finally:
+            # the connection belongs to this thread.
+            connections.close_all()
+
+    def _done(self, size: int, ok: bool, latency: float, elapsed: float):
+        with self._lock:
+            if ok:
+                self.written += size
+                self._written += size
+            else:
+                self.failed += size
+                self._failed += size
+            self.written_batches += 1
+            self._batches += 1
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+            self._write_sum += elapsed
+
+    def report(self) -> WriterReport:
+        """get queue depth and write latency since last report, and reset them
+
+        Returns:
+            WriterReport: report
+        """
+        with self._lock:
+            batches = self._batches or 1
+            ret = WriterReport(self.depth, self.pending, self._written, self._failed,
+                               self._latency_sum / batches, self._latency_max, self._write_sum / batches)
+            self._written = self._failed = self._batches = 0
+            self._latency_sum = self._latency_max = self._write_sum = 0.0
+        return ret